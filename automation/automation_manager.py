@@ -6,12 +6,15 @@ import sys
 import json
 import datetime
 import subprocess
+import threading
 import time
+import argparse
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import traceback
+from concurrent.futures import CancelledError, ThreadPoolExecutor, as_completed
 
 # Ana proje dizinini sys.path'e ekle
 project_root = Path(__file__).parent.parent
@@ -27,6 +30,17 @@ if venv_path.exists():
 
 # Scrapers'ları import et
 from predictz_scraper import PredictzScraper
+from http_transport import HttpTransport
+from rate_limiter import AdaptiveRateLimiter
+from html_parsers import resolve_backend
+from parse_pool import ParsePool
+from records import League
+from match_diff import MatchSnapshot
+from upload_worker import UploadWorkerClient
+from upload_outbox import OutboxBatch, UploadOutbox
+from upload_report import DateUploadReport, RESULT_FD_ENV, last_result_line, parse_legacy_output, parse_result_text
+from combined_store import combined_date_files, load_combined, write_combined_manifest
+import json_codec
 
 
 @dataclass
@@ -41,6 +55,9 @@ class ScrapingResult:
     successful_dates: int = 0
     partial: bool = False
     required_dates: int = 0
+    unchanged_dates: int = 0
+    retry_rounds: int = 0
+    pipeline: Optional[Dict[str, Any]] = None  # pipeline modunda aşama gecikmeleri (StagePipeline.summary)
 
 
 @dataclass
@@ -50,6 +67,40 @@ class UploadResult:
     uploaded_matches: int = 0
     skipped_matches: int = 0
     error_message: Optional[str] = None
+    deleted_matches: int = 0
+    documents_written: int = 0
+    bytes_written: int = 0
+    failed_matches: int = 0  # tekrar denemeden sonra hâlâ yüklenemeyen maçlar
+    batches: int = 0
+    # Tarih → DateUploadReport.to_dict() (sayılar, başarısız match_id → hata, süreler)
+    dates: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    failed_dates: List[str] = field(default_factory=list)  # hata veya zaman aşımıyla biten tarihler
+    cancelled_dates: List[str] = field(default_factory=list)  # ilk hatadan sonra hiç başlatılmayan tarihler
+    upload_seconds: float = 0.0
+    enqueued: bool = False  # veri upload kuyruğuna yazıldı (upload yarıda kalsa da kaybolmaz)
+    queued_batches: int = 0
+    pending_matches: int = 0  # çalışma sonunda kuyrukta bekleyen (sonraki çalışmada gönderilecek) maçlar
+
+
+@dataclass
+class PipelinedUploads:
+    """Scraping hattının upload aşamasında (tarih kaydedilir kaydedilmez) gönderilen tarihler"""
+    ack: Optional[MatchSnapshot]
+    reports: Dict[str, DateUploadReport] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)  # tarih → hata (kalemleri kuyrukta kaldı)
+    enqueued: List[str] = field(default_factory=list)
+    queued_batches: int = 0
+    # İlk gönderimin başladığı ve son gönderimin bittiği an (time.perf_counter)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    @property
+    def upload_seconds(self) -> float:
+        """Upload aşamasının duvar saati süresi (paralel gönderimler çakışır, toplanmaz)"""
+        if self.started is None or self.finished is None:
+            return 0.0
+        return self.finished - self.started
 
 
 class AutomationManager:
@@ -57,17 +108,45 @@ class AutomationManager:
     Scrapers ve Firebase upload otomasyonu yöneten ana sınıf
     """
     
-    def __init__(self, config_file: str = "automation_config.json"):
+    def __init__(self, config_file: str = "automation_config.json", replay: bool = False):
         self.config_file = config_file
         self.config = self.load_config()
+        # Replay: sayfalar arşivden okunur, ağa (site veya Firebase) çıkılmaz
+        self.replay = replay
         
         # Logging kurulumu
         self.setup_logging()
         
+        # Tüm denemeler aynı bağlantı havuzunu paylaşsın (keep-alive)
+        # AIMD hız sınırlayıcı da paylaşılır: öğrenilen hız denemeler arasında korunur
+        self.transport = HttpTransport.from_config(
+            self.config.get("http", {}),
+            rate_limiter=AdaptiveRateLimiter.from_config(self.config.get("rate_limit", {})),
+        )
+        # parse_workers != 1 ise tüm çalışmaların paylaştığı ayrıştırma süreç havuzu (ilk kullanımda açılır)
+        self.parse_pool: Optional[ParsePool] = None
+        # Upload başarılı olunca önbellek durumu commit edilecek scraper
+        self.pending_scraper: Optional[PredictzScraper] = None
+        # Pipeline modunda scraping sırasında upload edilen tarihler (upload_to_firebase tekrar göndermez)
+        self.pipelined_uploads: Optional[PipelinedUploads] = None
+        
         # Paths
         self.scrapers_dir = Path(__file__).parent.parent
         self.predictor_dir = self.scrapers_dir.parent / "Predictor"
         self.upload_script = self.predictor_dir / "scripts" / "upload-predictz-matches.js"
+        # Kalıcı upload kuyruğu: veri önce buraya yazılır, yarıda kalan upload sonraki çalışmada tamamlanır
+        self.outbox = UploadOutbox(str(self.scrapers_dir / "data" / "upload_outbox.sqlite"))
+        
+        # Kalıcı upload worker: süreç ilk upload'da açılır, çalışmalar arasında açık kalır
+        self.upload_worker: Optional[UploadWorkerClient] = None
+        firebase_config = self.config.get("firebase", {})
+        if firebase_config.get("upload_worker", False):
+            self.upload_worker = UploadWorkerClient(
+                firebase_config.get("upload_worker_command", ["node", "scripts/upload-predictz-worker.js"]),
+                cwd=str(self.predictor_dir),
+                request_timeout=firebase_config.get("upload_timeout_seconds", 300),
+                logger=self.logger,
+            )
         
         self.logger.info("AutomationManager başlatıldı")
     
@@ -82,17 +161,55 @@ class AutomationManager:
                     "predictz": {
                         "enabled": True,
                         "class_name": "PredictzScraper",
-                        "schedule": ["08:00", "20:00"]  # Günde 2 kez
+                        "schedule": ["08:00", "20:00"],  # Günde 2 kez
+                        # "pipeline": indirme/ayrıştırma/kayıt/upload aşamaları çakışır; "serial": eski sıralı yol
+                        "fetch_mode": "pipeline",
+                        "pipeline_queue_size": 2,
+                        "max_workers": 4,
+                        "http_cache": True,
+                        "content_manifest": True,
+                        "archive_pages": True,
+                        "parser_backend": "lxml",  # "selectolax" (kuruluysa) veya "html5lib"
+                        "restricted_parse": True,  # yalnızca div.pttable ayrıştırılır
+                        "parse_workers": 1,  # 0: CPU sayısı kadar süreçte toplu ayrıştırma
+                        "stream_output": False,  # True: maçları işlendikçe NDJSON akışına da yaz
+                        "history_store": True,  # data/history.sqlite geçmiş deposu
+                        # True: combined dosya manifest yerine eski biçimde (data_by_date satır içinde) yazılır
+                        "inline_combined": False
                     }
                 },
                 "firebase": {
                     "auto_upload": True,
-                    "delete_after_upload": False
+                    "delete_after_upload": False,
+                    "upload_mode": "full",  # "delta": yalnızca yeni/değişen maçlar + silme işaretleri
+                    "upload_odds_changes": False,  # delta modunda yalnızca oranı/formu değişen maçları da gönder
+                    # True: her tarih için yeni node süreci yerine tek kalıcı worker (JSON-lines protokolü)
+                    "upload_worker": False,
+                    "upload_worker_command": ["node", "scripts/upload-predictz-worker.js"],
+                    "failed_match_retries": 1,  # sonuç raporunda başarısız görünen maçlar bu kadar kez tekrar gönderilir
+                    "upload_concurrency": 3  # aynı anda upload edilen tarih sayısı
+                },
+                "http": {
+                    "connect_timeout_seconds": 5,
+                    "read_timeout_seconds": 20,
+                    "max_retries": 3,
+                    "backoff_base_seconds": 1.0,
+                    "backoff_max_seconds": 30,
+                    "pool_size": 8
+                },
+                "rate_limit": {
+                    "initial_rate": 1.0,  # istek/saniye, sunucu yanıtlarına göre uyarlanır
+                    "min_rate": 0.1,
+                    "max_rate": 4.0,
+                    "increase_step": 0.25,
+                    "decrease_factor": 0.5,
+                    "latency_spike_factor": 3.0,
+                    "max_latency_seconds": 8
                 },
                 "scraping_rules": {
                     "min_successful_dates": 2,
                     "retry_delay_seconds": 1,
-                    "max_retries_if_needed": 0  # 0: sınırsız deneme
+                    "max_date_retries": 6  # çalışma başına eksik tarih tekrar turu bütçesi
                 },
                 "logging": {
                     "level": "INFO",
@@ -111,13 +228,13 @@ class AutomationManager:
                 }
             }
             
+            # Config elle düzenlenir: kompakt değil, okunabilir yazılır
             with open(config_path, "w", encoding="utf-8") as f:
                 json.dump(default_config, f, indent=4, ensure_ascii=False)
             
             print(f"Default config oluşturuldu: {config_path}")
         
-        with open(config_path, "r", encoding="utf-8") as f:
-            config = json.load(f)
+        config = json_codec.load_file(str(config_path))
 
         # Eksik yeni ayarları varsayılanlarla tamamla
         config.setdefault(
@@ -125,12 +242,54 @@ class AutomationManager:
             {
                 "min_successful_dates": 2,
                 "retry_delay_seconds": 1,
-                "max_retries_if_needed": 0,
+                "max_date_retries": 6,
             },
         )
 
         return config
     
+    def build_predictz_scraper(self) -> PredictzScraper:
+        """Config'deki indirme ayarlarıyla PredictzScraper oluştur"""
+        options = self.config.get("scrapers", {}).get("predictz", {})
+        parse_workers = options.get("parse_workers", 1)
+        if self.parse_pool is None and parse_workers != 1:
+            self.parse_pool = ParsePool(
+                resolve_backend(options.get("parser_backend", "lxml")),
+                options.get("restricted_parse", True),
+                parse_workers,
+            )
+        return PredictzScraper(
+            fetch_mode=options.get("fetch_mode", "concurrent"),
+            max_workers=options.get("max_workers", 4),
+            transport=self.transport,
+            use_http_cache=options.get("http_cache", True),
+            use_content_manifest=options.get("content_manifest", True),
+            auto_commit=False,
+            archive_pages=options.get("archive_pages", True),
+            replay=self.replay,
+            parser_backend=options.get("parser_backend", "lxml"),
+            restricted_parse=options.get("restricted_parse", True),
+            parse_pool=self.parse_pool,
+            stream_output=options.get("stream_output", False),
+            use_history_store=options.get("history_store", True),
+            pipeline_queue_size=options.get("pipeline_queue_size", 2),
+            inline_combined=options.get("inline_combined", False),
+        )
+    
+    def close(self):
+        """Upload worker'ı, upload kuyruğunu ve ayrıştırma süreç havuzunu kapat"""
+        if self.upload_worker is not None:
+            self.upload_worker.close()
+        self.outbox.close()
+        if self.parse_pool is not None:
+            self.parse_pool.close()
+    
+    def commit_scraper_state(self):
+        """Son scraper'ın önbellek durumunu kalıcı yap (veri güvenle işlendikten sonra)"""
+        if self.pending_scraper is not None:
+            self.pending_scraper.commit_state()
+            self.pending_scraper = None
+    
     def setup_logging(self):
         """Logging sistemini kur"""
         log_dir = Path(__file__).parent / "logs"
@@ -158,52 +317,124 @@ class AutomationManager:
                 rules = self.config.get("scraping_rules", {})
                 min_successful_dates = rules.get("min_successful_dates", 2)
                 retry_delay = rules.get("retry_delay_seconds", 1)
-                max_retries = rules.get("max_retries_if_needed", 0)  # 0: sınırsız
+                # Çalışma başına tek ve sınırlı bütçe: her tekrar turu yalnızca eksik tarihleri çeker
+                if "max_date_retries" in rules:
+                    retry_budget = max(0, int(rules["max_date_retries"]))
+                else:
+                    # Eski anahtar: max_retries_if_needed (0 "sınırsız" demekti, varsayılan bütçe kullanılır)
+                    retry_budget = max(0, int(rules.get("max_retries_if_needed", 0))) or 6
                 partial_ok_threshold = 1  # En az 1 gün varsa upload etmeyi dene
 
-                attempt = 0
+                scraper = self.build_predictz_scraper()
+                on_date = None
+                self.pipelined_uploads = None
+                if scraper.fetch_mode == "pipeline" and self.config["firebase"]["auto_upload"]:
+                    # Kaydedilen her tarih diğerleri inerken upload edilir (hattın son aşaması)
+                    upload_mode = self.config["firebase"].get("upload_mode", "full")
+                    self.pipelined_uploads = PipelinedUploads(
+                        ack=MatchSnapshot(str(self.scrapers_dir / "data" / "upload_ack.json")) if upload_mode == "delta" else None
+                    )
+                    on_date = self.upload_in_pipeline
+                sink_workers = max(1, self.config["firebase"].get("upload_concurrency", 3))
                 scraper_run_info: Dict[str, Any] = {}
                 partial_success = False
+                retry_rounds = 0
+                dates = None  # İlk tur: tüm tarihler
 
                 while True:
-                    attempt += 1
-                    scraper = PredictzScraper()
-                    self.logger.info(f"{scraper_name} çalıştırma denemesi #{attempt}")
-
                     try:
-                        scraper_run_info = scraper.run() or {}
+                        scraper_run_info = scraper.run(dates, on_date=on_date, sink_workers=sink_workers) or {}
                     except Exception as exc:
                         self.logger.error(f"{scraper_name} çalıştırma hatası: {exc}", exc_info=True)
                         scraper_run_info = {}
 
-                    successful_dates = scraper_run_info.get("successful_dates", 0)
+                    # Değişmemiş (304 / aynı özet) tarihler zaten işlenmiş veridir, başarılı sayılır
+                    unchanged_count = len(scraper.unchanged_dates)
+                    successful_dates = len(scraper.completed_data) + unchanged_count
                     total_matches = scraper_run_info.get("total_matches", 0)
+                    if "wall_clock_seconds" in scraper_run_info:
+                        self.logger.info(
+                            f"{scraper_name} indirme süresi ({scraper_run_info.get('fetch_mode')}): "
+                            f"{scraper_run_info['wall_clock_seconds']:.1f} saniye"
+                        )
+                    http_stats = scraper_run_info.get("http")
+                    if http_stats:
+                        self.logger.info(
+                            f"{scraper_name} HTTP: {http_stats['requests']} istek, "
+                            f"{http_stats['bytes_on_wire']} byte, "
+                            f"{http_stats['connections_opened']} yeni / {http_stats['connections_reused']} yeniden kullanılan bağlantı"
+                        )
+                    pipeline_stats = scraper_run_info.get("pipeline")
+                    if pipeline_stats:
+                        self.logger.info(
+                            f"{scraper_name} aşamalı hat: {pipeline_stats['wall_ms']:.0f} ms "
+                            f"(aşamalar toplamı {pipeline_stats['stage_busy_sum_ms']:.0f} ms, "
+                            f"darboğaz: {pipeline_stats['bottleneck']})"
+                        )
+                        for stage_name, stage in pipeline_stats["stages"].items():
+                            self.logger.info(
+                                f"  {stage_name}: {stage['items']} tarih, ort. {stage['mean_ms']:.0f} ms, "
+                                f"en fazla {stage['max_ms']:.0f} ms, kuyrukta {stage['queue_wait_ms']:.0f} ms, "
+                                f"dolu kuyruk beklemesi {stage['blocked_ms']:.0f} ms ({stage['workers']} thread)"
+                            )
+                    rate_limit = scraper_run_info.get("rate_limit")
+                    if rate_limit:
+                        self.logger.info(
+                            f"{scraper_name} istek hızı: {rate_limit['current_rate']:.2f} istek/sn "
+                            f"(en düşük {rate_limit['lowest_rate']:.2f}, throttle: {rate_limit['throttled']})"
+                        )
 
-                    if successful_dates >= min_successful_dates and total_matches > 0:
-                        break
-
-                    # Kısmi başarı: en az 1 gün veri varsa upload et ama log'da eksik olduğunu belirt
-                    if successful_dates >= partial_ok_threshold and total_matches > 0:
-                        partial_success = True
+                    match_changes = scraper_run_info.get("match_changes")
+                    if match_changes:
                         self.logger.info(
-                            f"{scraper_name}: {successful_dates}/{min_successful_dates} gün bulundu "
-                            f"(toplam maç: {total_matches}). Kısmi veri upload edilecek."
+                            f"{scraper_name} maç değişiklikleri: {match_changes['added']} yeni, "
+                            f"{match_changes['prediction_changed']} değişen, "
+                            f"{match_changes.get('odds_changed', 0)} oranı değişen, {match_changes['removed']} silinen, "
+                            f"{match_changes['unchanged']} aynı"
                         )
-                        break
 
-                    if max_retries and attempt >= max_retries:
-                        self.logger.error(
-                            f"{scraper_name} yeterli gün sayısına ulaşamadı "
-                            f"({successful_dates}/{min_successful_dates}) ve maksimum deneme ({max_retries}) aşıldı."
+                    missing = scraper.missing_dates()
+                    if not missing or self.replay:
+                        # Arşiv değişmeyeceği için replay'de tekrar denemenin anlamı yok
+                        break
+                    if retry_rounds >= retry_budget:
+                        self.logger.warning(
+                            f"{scraper_name} tekrar deneme bütçesi ({retry_budget}) bitti, "
+                            f"eksik tarihler: {', '.join(missing)}"
                         )
                         break
 
+                    retry_rounds += 1
                     self.logger.warning(
-                        f"{scraper_name} yeterli gün çekemedi "
-                        f"({successful_dates}/{min_successful_dates}, toplam maç: {total_matches}). "
-                        f"{retry_delay} saniye sonra yeniden başlatılıyor..."
+                        f"{scraper_name} {len(missing)} tarih eksik ({', '.join(missing)}). "
+                        f"{retry_delay} saniye sonra yalnızca bu tarihler yeniden çekilecek "
+                        f"(tur {retry_rounds}/{retry_budget})..."
                     )
                     time.sleep(retry_delay)
+                    dates = missing
+
+                if successful_dates < min_successful_dates and successful_dates >= partial_ok_threshold and total_matches > 0:
+                    # Kısmi başarı: en az 1 gün veri varsa upload et ama log'da eksik olduğunu belirt
+                    partial_success = True
+                    self.logger.info(
+                        f"{scraper_name}: {successful_dates}/{min_successful_dates} gün bulundu "
+                        f"(toplam maç: {total_matches}). Kısmi veri upload edilecek."
+                    )
+
+                self.pending_scraper = scraper
+
+                if scraper_run_info.get("total_matches", 0) == 0 and unchanged_count and successful_dates >= min_successful_dates:
+                    self.logger.info(
+                        f"{scraper_name}: {unchanged_count} tarih değişmemiş, ayrıştırma ve upload atlanıyor."
+                    )
+                    return ScrapingResult(
+                        scraper_name=scraper_name,
+                        success=True,
+                        successful_dates=successful_dates,
+                        required_dates=min_successful_dates,
+                        unchanged_dates=unchanged_count,
+                        retry_rounds=retry_rounds,
+                    )
 
                 if scraper_run_info.get("total_matches", 0) == 0:
                     return ScrapingResult(
@@ -216,6 +447,7 @@ class AutomationManager:
                         ),
                         successful_dates=scraper_run_info.get("successful_dates", 0),
                         required_dates=min_successful_dates,
+                        retry_rounds=retry_rounds,
                     )
 
                 combined_path_raw = scraper_run_info.get("combined_file")
@@ -227,15 +459,14 @@ class AutomationManager:
                         error_message="Scraper çalıştı fakat yeni combined dosya bulunamadı; eski dosya kullanılmadı.",
                         successful_dates=scraper_run_info.get("successful_dates", 0),
                         required_dates=min_successful_dates,
+                        retry_rounds=retry_rounds,
                     )
 
-                with open(combined_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-
                 total_matches = scraper_run_info.get("total_matches", 0)
                 leagues_count = scraper_run_info.get("total_leagues", 0)
 
-                # Eğer kayıtlı lig sayısı yoksa dosyadan hesapla
+                # Eğer kayıtlı sayılar yoksa dosyadan hesapla
+                data = load_combined(str(combined_path)) if not (leagues_count and total_matches) else {}
                 if not leagues_count:
                     leagues_count = sum(len(date_data) for date_data in data.get("data_by_date", {}).values())
 
@@ -252,9 +483,12 @@ class AutomationManager:
                     data_file=str(combined_path),
                     total_matches=total_matches,
                     leagues_count=leagues_count,
-                    successful_dates=scraper_run_info.get("successful_dates", 0),
+                    successful_dates=successful_dates,
                     partial=partial_success,
                     required_dates=min_successful_dates,
+                    unchanged_dates=unchanged_count,
+                    retry_rounds=retry_rounds,
+                    pipeline=scraper_run_info.get("pipeline"),
                 )
             
             else:
@@ -273,145 +507,503 @@ class AutomationManager:
             )
     
     def convert_single_to_combined(self, single_file: Path) -> Path:
-        """Tek tarih dosyasını combined formatına dönüştür"""
-        with open(single_file, "r", encoding="utf-8") as f:
-            single_data = json.load(f)
+        """Tek tarih dosyasını gösteren combined manifest oluştur"""
+        single_data = json_codec.load_file(str(single_file))
         
         # Dosya adından tarihi çıkar (predictz_data_2025-08-29.json -> 2025-08-29)
         date_str = single_file.stem.split("_")[-1]
         
         # Veri formatını kontrol et ve doğru formata çevir
         if isinstance(single_data, list):
-            # Eğer veri doğrudan list ise (yeni format)
-            leagues_data = single_data
+            # Eğer veri doğrudan list ise (yeni format): dosya olduğu gibi gösterilir
             generated_at = datetime.datetime.now().isoformat()
         elif isinstance(single_data, dict):
-            # Eğer veri dict ise (eski format)
-            leagues_data = single_data.get("leagues", [])
+            # Eğer veri dict ise (eski format): lig listesi yeni bir tarih dosyasına yazılır,
+            # kaynak dosyaya dokunulmaz
             generated_at = single_data.get("generated_at", datetime.datetime.now().isoformat())
+            leagues_file = single_file.parent / f"{single_file.stem}_leagues.json"
+            json_codec.dump_file(str(leagues_file), single_data.get("leagues", []))
+            single_file = leagues_file
         else:
             # Beklenmeyen format
             self.logger.error(f"Beklenmeyen dosya formatı: {single_file}")
             raise ValueError(f"Desteklenmeyen veri formatı: {type(single_data)}")
         
-        # Combined format oluştur
-        combined_data = {
-            "scraper": "predictz",
-            "generated_at": generated_at,
-            "data_by_date": {
-                date_str: leagues_data
-            }
-        }
-        
         # Combined dosya adı
         combined_file = single_file.parent / f"predictz_combined_{date_str}.json"
         
-        # Combined dosyayı kaydet
-        with open(combined_file, "w", encoding="utf-8") as f:
-            json.dump(combined_data, f, ensure_ascii=False, indent=2)
+        # Combined manifest'i kaydet
+        write_combined_manifest(str(combined_file), generated_at, [date_str.replace("-", "")], {date_str: str(single_file)})
         
         self.logger.info(f"Tek dosya combined formatına dönüştürüldü: {combined_file}")
         return combined_file
     
-    def convert_combined_to_upload_format(self, combined_file: str) -> str:
-        """Combined JSON formatını upload script'inin beklediği formata dönüştür"""
-        combined_path = Path(combined_file).resolve()
-
-        with open(combined_path, "r", encoding="utf-8") as f:
-            combined_data = json.load(f)
-        
-        # Her tarih için ayrı dosya oluştur ve upload et
-        upload_results = []
-        
-        for date_str, leagues_data in combined_data.get("data_by_date", {}).items():
-            # Upload formatına dönüştür (sadece leagues array'i)
-            upload_data = leagues_data  # Bu zaten doğru format
-            
-            # Geçici upload dosyası oluştur
-            temp_file = combined_path.parent / f"temp_upload_{date_str}.json"
-            with open(temp_file, "w", encoding="utf-8") as f:
-                json.dump(upload_data, f, ensure_ascii=False, indent=2)
-            
-            upload_results.append((str(temp_file.resolve()), date_str))
-        
-        return upload_results
+    def delete_uploaded_files(self, data_file: str):
+        """Upload edilen combined dosyayı ve gösterdiği tarih dosyalarını sil"""
+        try:
+            paths = list(combined_date_files(data_file).values()) + [data_file]
+        except Exception as e:
+            self.logger.warning(f"Combined dosya okunamadı, yalnızca kendisi silinecek: {e}")
+            paths = [data_file]
+        for path in paths:
+            try:
+                os.remove(path)
+                self.logger.info(f"Upload sonrası dosya silindi: {path}")
+            except Exception as e:
+                self.logger.warning(f"Dosya silinemedi: {e}")
     
-    def upload_to_firebase(self, data_file: str) -> UploadResult:
-        """Veriyi Firebase'e upload et"""
-        self.logger.info(f"Firebase upload başlatılıyor: {data_file}")
-        
+    def write_upload_file(self, payload: Any, name: str) -> Path:
+        """Delta / silme payload'ını upload script'i için geçici dosyaya yaz"""
+        temp_file = self.scrapers_dir / "data" / f"temp_upload_{name}.json"
+        json_codec.dump_file(str(temp_file), payload)
+        return temp_file
+
+    def run_upload_script(self, upload_file: Path, date_str: str, extra_args: Optional[List[str]] = None) -> DateUploadReport:
+        """
+        Node.js upload script'ini dosya üzerinde çalıştır.
+
+        Sonuç stdout'tan metin olarak ayıklanmaz: script'e PREDICTZ_RESULT_FD ortam
+        değişkeniyle ayrı bir dosya tanımlayıcısı verilir ve sonuç JSON'u oradan okunur.
+        Tanımlayıcıya bir şey yazılmamışsa stdout'un son {"type": "result"} satırı, o da
+        yoksa (eski script) "Başarılı:" / "Atlanan:" satırları kullanılır.
+
+        Returns:
+            DateUploadReport: Tarihin sayıları, maç bazında hatalar, batch sayısı ve süreler
+
+        Raises:
+            Exception: Script hata koduyla biterse
+            subprocess.TimeoutExpired: Script 5 dakikada bitmezse
+        """
+        cmd = ["node", str(self.upload_script), *(extra_args or []), str(Path(upload_file).resolve())]
+        started = time.perf_counter()
+
+        env = dict(os.environ)
+        pass_fds: Tuple[int, ...] = ()
+        read_fd = write_fd = None
+        if os.name == "posix":
+            read_fd, write_fd = os.pipe()
+            env[RESULT_FD_ENV] = str(write_fd)
+            pass_fds = (write_fd,)
+
+        # Sonuç kanalı ayrı thread'de okunur: büyük bir sonuç pipe'ı doldurup script'i kilitlemesin
+        result_chunks: List[bytes] = []
+        reader = None
         try:
-            # Combined dosyayı upload formatına dönüştür
-            upload_files = self.convert_combined_to_upload_format(data_file)
-            
-            total_uploaded = 0
-            total_skipped = 0
-            
-            # Her tarihi ayrı ayrı upload et
-            for temp_file, date_str in upload_files:
-                self.logger.info(f"Tarih {date_str} için upload başlatılıyor...")
-                
-                try:
-                    # Node.js script'ini çalıştır
-                    cmd = ["node", str(self.upload_script), temp_file]
-                    
-                    result = subprocess.run(
-                        cmd,
-                        cwd=str(self.predictor_dir),
-                        capture_output=True,
-                        text=True,
-                        timeout=300  # 5 dakika timeout
-                    )
-                    
-                    if result.returncode == 0:
-                        # Output'tan başarı bilgilerini çıkar
-                        output_lines = result.stdout.strip().split('\n')
-                        
-                        for line in output_lines:
-                            if "Başarılı:" in line:
-                                try:
-                                    uploaded = int(line.split("Başarılı:")[-1].strip())
-                                    total_uploaded += uploaded
-                                except:
-                                    pass
-                            elif "Atlanan:" in line:
-                                try:
-                                    skipped = int(line.split("Atlanan:")[-1].strip())
-                                    total_skipped += skipped
-                                except:
-                                    pass
-                        
-                        self.logger.info(f"Tarih {date_str} upload tamamlandı")
-                    else:
-                        error_msg = result.stderr or result.stdout
-                        self.logger.error(f"Tarih {date_str} upload hatası: {error_msg}")
-                        raise Exception(f"Upload failed for {date_str}: {error_msg}")
-                    
-                finally:
-                    # Geçici dosyayı temizle
-                    try:
-                        os.remove(temp_file)
-                    except:
-                        pass
-            
-            self.logger.info(f"Tüm tarihler için Firebase upload başarılı: {total_uploaded} yüklendi, {total_skipped} atlandı")
-            
-            return UploadResult(
-                success=True,
-                uploaded_matches=total_uploaded,
-                skipped_matches=total_skipped
+            process = subprocess.Popen(
+                cmd,
+                cwd=str(self.predictor_dir),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                text=True,
+                env=env,
+                pass_fds=pass_fds,
             )
-                
+        except Exception:
+            # Süreç açılamadı (ör. node yok): okuma ucu da kapatılmalı, yoksa her denemede sızar
+            if read_fd is not None:
+                os.close(read_fd)
+            raise
+        finally:
+            if write_fd is not None:
+                os.close(write_fd)
+        if read_fd is not None:
+            def read_result():
+                with os.fdopen(read_fd, "rb") as channel:
+                    result_chunks.append(channel.read())
+            reader = threading.Thread(target=read_result, daemon=True)
+            reader.start()
+
+        try:
+            stdout, stderr = process.communicate(timeout=300)  # 5 dakika timeout
         except subprocess.TimeoutExpired:
-            error_msg = "Firebase upload timeout (5 dakika)"
-            self.logger.error(error_msg)
-            return UploadResult(success=False, error_message=error_msg)
-            
+            process.kill()
+            process.communicate()
+            raise
+        finally:
+            if reader is not None:
+                reader.join(timeout=5)
+
+        if process.returncode != 0:
+            error_msg = stderr or stdout
+            self.logger.error(f"Tarih {date_str} upload hatası: {error_msg}")
+            raise Exception(f"Upload failed for {date_str}: {error_msg}")
+
+        result = parse_result_text(b"".join(result_chunks).decode("utf-8", "replace"))
+        if result is not None:
+            report = DateUploadReport.from_dict(date_str, result, "fd")
+        else:
+            result = last_result_line(stdout)
+            if result is not None:
+                report = DateUploadReport.from_dict(date_str, result, "stdout")
+            else:
+                self.logger.warning(f"Tarih {date_str}: upload script'i sonuç JSON'u vermedi, metin çıktısı kullanılıyor")
+                report = parse_legacy_output(date_str, stdout)
+        report.wall_ms = (time.perf_counter() - started) * 1000
+        return report
+
+    def upload_payload(self, payload: Any, name: str, date_str: str, extra_args: Optional[List[str]] = None) -> DateUploadReport:
+        """Payload'ı geçici dosyaya yazıp upload et, dosyayı sonra sil"""
+        temp_file = self.write_upload_file(payload, name)
+        try:
+            payload_bytes = temp_file.stat().st_size
+            report = self.run_upload_script(temp_file, date_str, extra_args)
+        finally:
+            # Geçici dosyayı temizle
+            try:
+                os.remove(temp_file)
+            except OSError as e:
+                self.logger.warning(f"Geçici upload dosyası silinemedi: {temp_file} ({e})")
+        report.bytes_written = payload_bytes
+        return report
+
+    def send_upload(self, date_str: str, payload: Any = None, upload_file: Optional[str] = None,
+                    delete: bool = False) -> DateUploadReport:
+        """
+        Tarihin batch'ini upload et: firebase.upload_worker açıksa kalıcı worker'a gönderilir,
+        değilse her batch için upload script'i ayrı süreçte çalıştırılır.
+
+        Returns:
+            DateUploadReport: Tarihin upload sonucu (yazılan byte dahil)
+        """
+        if self.upload_worker is not None:
+            started = time.perf_counter()
+            reply = self.upload_worker.upload(date_str, data=payload, upload_file=upload_file, delete=delete)
+            report = DateUploadReport.from_dict(date_str, reply, "worker")
+            report.wall_ms = (time.perf_counter() - started) * 1000
+            report.bytes_written = reply["request_bytes"]
+            if upload_file is not None:
+                report.bytes_written += os.path.getsize(upload_file)
+            return report
+
+        if upload_file is not None:
+            report = self.run_upload_script(Path(upload_file), date_str)
+            report.bytes_written = os.path.getsize(upload_file)
+            return report
+        name = f"{date_str}_delete" if delete else date_str
+        return self.upload_payload(payload, name, date_str, ["--delete"] if delete else None)
+
+    def retry_failed_matches(self, report: DateUploadReport, batch: OutboxBatch) -> None:
+        """
+        Raporda başarısız görünen maçları (tarihin tamamını değil) firebase.failed_match_retries
+        kez tekrar gönder; sonuç rapora işlenir
+        """
+        for _ in range(self.config["firebase"].get("failed_match_retries", 1)):
+            if not report.failed:
+                return
+            failed_ids = set(report.failed)
+            self.logger.warning(f"Tarih {report.date}: {len(failed_ids)} maç yüklenemedi, yalnızca bu maçlar tekrar gönderiliyor")
+
+            retry_leagues = batch.upsert_payload(only=failed_ids)
+            retry_markers = batch.delete_payload(only=failed_ids)
+
+            if retry_leagues:
+                retried = {match["match_id"] for league in retry_leagues for match in league["matches"]}
+                report.merge(self.send_upload(report.date, retry_leagues), retried)
+            if retry_markers:
+                retried = {marker["match_id"] for marker in retry_markers}
+                report.merge(self.send_upload(report.date, retry_markers, delete=True), retried)
+            if not retry_leagues and not retry_markers:
+                # Script'in bildirdiği ID'ler bu batch'in maçlarıyla eşleşmiyor: tekrar denenemez
+                return
+
+    def enqueue_date(self, date_str: str, leagues: List[League], ack: Optional[MatchSnapshot],
+                     date_file: Optional[str]) -> Optional[int]:
+        """
+        Tarihin gönderilecek maçlarını outbox'a ekle (delta modunda yalnızca onaydan beri
+        yeni/değişen maçlar ve silme işaretleri)
+
+        Returns:
+            Optional[int]: Batch ID'si (delta modunda değişiklik yoksa None)
+        """
+        ack_key = date_str.replace("-", "")
+        upsert_leagues = leagues
+        deleted_ids: List[str] = []
+
+        # match_id'siz eski dosyalarda fark hesaplanamaz: tarih tamamen gönderilir
+        delta = ack is not None and all(match.match_id for league in leagues for match in league.matches)
+        if delta:
+            diff = ack.diff(ack_key, leagues)
+            # Yalnızca oran/form değişimi her çalışmada neredeyse tüm maçları kapsar: varsayılan olarak gönderilmez
+            upload_odds = self.config["firebase"].get("upload_odds_changes", False)
+            changed_matches = diff.changed_matches + (diff.odds_changed if upload_odds else [])
+            if not changed_matches and not diff.removed:
+                self.logger.info(f"Tarih {date_str}: onaylanan upload'dan beri değişiklik yok, atlanıyor")
+                return None
+            changed_ids = {match.match_id for match in changed_matches}
+            upsert_leagues = [
+                League(league.league_name, [m for m in league.matches if m.match_id in changed_ids], league.league_id)
+                for league in leagues
+            ]
+            upsert_leagues = [league for league in upsert_leagues if league.matches]
+            deleted_ids = diff.removed
+            self.logger.info(
+                f"Tarih {date_str} için delta upload: {len(diff.added)} yeni, "
+                f"{len(diff.prediction_changed)} değişen, {len(diff.odds_changed)} oranı değişen"
+                f"{'' if upload_odds else ' (gönderilmiyor)'}, {len(deleted_ids)} silinen maç"
+            )
+
+        markers = [{"match_id": match_id, "match_date": ack_key, "deleted": True} for match_id in deleted_ids]
+        # Tam tarih: scraper'ın tek kez yazdığı dosya, kalemlerin hiçbiri gönderilmemişse olduğu gibi gönderilir
+        source_file = date_file if upsert_leagues is leagues else None
+        batch_id = self.outbox.enqueue(date_str, upsert_leagues, markers, source_file)
+
+        if delta:
+            # Kuyruğa giren maçlar onaylanmış sayılır: teslimi artık outbox'ın sorumluluğunda
+            ack.record(ack_key, leagues)
+        return batch_id
+
+    def send_batch(self, batch: OutboxBatch) -> DateUploadReport:
+        """Outbox batch'ini gönder; onaylanan kalemler "sent" olur, yüklenemeyenler kuyrukta kalır"""
+        report = DateUploadReport(batch.date)
+        try:
+            if batch.upserts:
+                complete_file = batch.complete_file
+                if complete_file is not None:
+                    report.merge(self.send_upload(batch.date, upload_file=complete_file))
+                else:
+                    report.merge(self.send_upload(batch.date, batch.upsert_payload()))
+            if batch.deletes:
+                report.merge(self.send_upload(batch.date, batch.delete_payload(), delete=True))
+            self.retry_failed_matches(report, batch)
+        except Exception as e:
+            self.outbox.fail(batch, str(e))
+            raise
+
+        # Yalnızca gerçekten yazılan (sent işaretlenen) dokümanlar sayılır; yüklenemeyenler kuyrukta kalır
+        report.documents = self.outbox.complete(batch, report.failed)
+        return report
+
+    def drain_date(self, date_str: str) -> DateUploadReport:
+        """Tarihin bekleyen outbox batch'lerini kuyruk sırasıyla gönder (drain_outbox tarafından paralel çağrılır)"""
+        batches = self.outbox.pending_batches(date_str)
+        self.logger.info(f"Tarih {date_str} için upload başlatılıyor ({len(batches)} batch)...")
+
+        report = DateUploadReport(date_str)
+        for batch in batches:
+            if batch.attempts:
+                self.logger.info(f"Tarih {date_str}: önceki denemeden kalan batch {batch.batch_id} tekrar gönderiliyor")
+            report.merge(self.send_batch(batch))
+
+        if report.failed:
+            self.logger.warning(
+                f"Tarih {date_str} upload tamamlandı, {len(report.failed)} maç yüklenemedi (kuyrukta kaldı): "
+                f"{', '.join(sorted(report.failed)[:10])}"
+            )
+        else:
+            self.logger.info(
+                f"Tarih {date_str} upload tamamlandı: {report.uploaded} yüklendi, {report.skipped} atlandı "
+                f"({report.batches} batch, {report.wall_ms:.0f} ms)"
+            )
+        return report
+
+    def upload_in_pipeline(self, date_str: str, leagues: List[League], date_file: str) -> Optional[DateUploadReport]:
+        """
+        Pipeline'ın upload aşaması: kaydedilen tarihi outbox'a ekleyip hemen gönder (sonraki
+        tarihler bu sırada inmeye/ayrışmaya devam eder). Bir tarih başarısız olursa sonraki
+        tarihler yalnızca kuyruğa eklenir; gönderim upload_to_firebase'deki drain'e kalır.
+        """
+        pipelined = self.pipelined_uploads
+        with pipelined.lock:
+            batch_id = self.enqueue_date(date_str, leagues, pipelined.ack, date_file)
+            if pipelined.ack is not None:
+                pipelined.ack.commit()
+            pipelined.enqueued.append(date_str)
+            if batch_id is None:
+                return None
+            pipelined.queued_batches += 1
+            if pipelined.errors:
+                return None
+
+        started = time.perf_counter()
+        with pipelined.lock:
+            if pipelined.started is None:
+                pipelined.started = started
+        try:
+            report = self.drain_date(date_str)
+        except Exception as e:
+            self.logger.error(f"Tarih {date_str} upload hatası (pipeline): {e}")
+            with pipelined.lock:
+                pipelined.errors[date_str] = (
+                    f"Firebase upload timeout (5 dakika): {date_str}"
+                    if isinstance(e, subprocess.TimeoutExpired) else f"Firebase upload exception: {str(e)}"
+                )
+            raise
+        finally:
+            with pipelined.lock:
+                pipelined.finished = max(pipelined.finished or 0.0, time.perf_counter())
+        with pipelined.lock:
+            pipelined.reports[date_str] = report
+        return report
+
+    def upload_to_firebase(self, data_file: str, data_by_date: Optional[Dict[str, List[League]]] = None) -> UploadResult:
+        """
+        Veriyi Firebase'e upload et.
+
+        Tarih verisi diskten tekrar okunmaz: ``data_by_date`` (scraper'ın bellekteki sonucu)
+        verilmişse o kullanılır, yoksa combined dosya load_combined ile okunur. Tam upload'da
+        script'e scraper'ın yazdığı tarih dosyası doğrudan verilir; geçici dosya yazılmaz.
+
+        firebase.upload_mode "delta" ise her tarih için yalnızca son onaylanan (ack) upload'dan
+        bu yana yeni veya değişen maçlar gönderilir; sayfadan kalkan maçlar için silme
+        işaretleri ``--delete`` ile ayrıca gönderilir. Onaylar tarih bazında
+        data/upload_ack.json dosyasına yazılır. "full" modunda her tarih tamamen gönderilir.
+
+        Veri önce kalıcı upload kuyruğuna (data/upload_outbox.sqlite) yazılır, sonra kuyruk
+        drain_outbox ile boşaltılır. Upload yarıda kalırsa veri kuyrukta durur ve sonraki
+        çalışmada yeniden scrape edilmeden gönderilir (``UploadResult.enqueued``).
+
+        Pipeline modunda scraping sırasında upload edilmiş tarihler (upload_in_pipeline) tekrar
+        kuyruğa eklenmez; sonuçları bu çağrının UploadResult'ına eklenir.
+        """
+        upload_mode = self.config["firebase"].get("upload_mode", "full")
+        self.logger.info(f"Firebase upload başlatılıyor ({upload_mode}): {data_file}")
+
+        ack = MatchSnapshot(str(self.scrapers_dir / "data" / "upload_ack.json")) if upload_mode == "delta" else None
+        pipelined, self.pipelined_uploads = self.pipelined_uploads, None
+        queued_batches = pipelined.queued_batches if pipelined else 0
+
+        try:
+            if data_by_date is None:
+                data_by_date = load_combined(data_file, as_records=True).get("data_by_date", {})
+            date_files = combined_date_files(data_file)
+
+            for date_str, leagues in data_by_date.items():
+                if pipelined and date_str in pipelined.enqueued:
+                    continue
+                if self.enqueue_date(date_str, leagues, ack, date_files.get(date_str)) is not None:
+                    queued_batches += 1
+            if ack is not None:
+                ack.commit()
         except Exception as e:
             error_msg = f"Firebase upload exception: {str(e)}"
             self.logger.error(error_msg)
+            return UploadResult(success=False, error_message=error_msg, queued_batches=queued_batches)
+
+        if pipelined:
+            result = self.drain_outbox(pipelined.reports, pipelined.errors)
+            # Gönderimlerin çoğu pipeline'ın upload aşamasında yapıldı: süresi sonuca eklenir
+            result.upload_seconds = round(result.upload_seconds + pipelined.upload_seconds, 3)
+        else:
+            result = self.drain_outbox()
+        result.enqueued = True
+        result.queued_batches = queued_batches
+        return result
+
+    def drain_outbox(self, reports: Optional[Dict[str, DateUploadReport]] = None,
+                     errors: Optional[Dict[str, str]] = None) -> UploadResult:
+        """
+        Upload kuyruğundaki bekleyen tüm batch'leri (önceki çalışmalardan kalanlar dahil) gönder.
+
+        Tarihler firebase.upload_concurrency kadar paralel gönderilir; bir tarihin batch'leri
+        kuyruk sırasıyla gider. Bir tarih başarısız olursa (hata veya zaman aşımı) henüz
+        başlamamış tarihler iptal edilir, başlamış olanların bitmesi beklenir; sonuç başarısız
+        olsa da tamamlanan tarihlerin sayıları korunur, gönderilemeyenler kuyrukta kalır.
+
+        ``reports`` / ``errors``: pipeline'ın upload aşamasında gönderilen / başarısız olan
+        tarihler. Sonuca eklenirler; başarısız tarih varsa kuyruk bu çalışmada tekrar
+        boşaltılmaz (bekleyen tarihler iptal sayılır).
+        """
+        concurrency = max(1, self.config["firebase"].get("upload_concurrency", 3))
+        reports = dict(reports or {})
+        failed_dates: List[str] = list(errors or {})
+        cancelled_dates: List[str] = []
+        error_msg = next(iter(errors.values())) if errors else None
+
+        try:
+            pending_dates = self.outbox.pending_dates()
+        except Exception as e:
+            error_msg = f"Upload kuyruğu okunamadı: {str(e)}"
+            self.logger.error(error_msg)
             return UploadResult(success=False, error_message=error_msg)
-    
+
+        if error_msg is not None:
+            cancelled_dates = [date_str for date_str in pending_dates if date_str not in failed_dates]
+            pending_dates = []
+
+        workers = min(concurrency, len(pending_dates)) or 1
+        self.logger.info(f"Upload kuyruğu boşaltılıyor: {len(pending_dates)} tarih, {workers} paralel")
+        started = time.perf_counter()
+        stop = threading.Event()
+
+        def drain_one(date_str: str) -> DateUploadReport:
+            # İlk hatadan sonra sıradaki tarihler başlatılmaz
+            if stop.is_set():
+                raise CancelledError()
+            return self.drain_date(date_str)
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="firebase-upload") as executor:
+            futures = {executor.submit(drain_one, date_str): date_str for date_str in pending_dates}
+            for future in as_completed(futures):
+                date_str = futures[future]
+                if future.cancelled():
+                    continue
+                try:
+                    reports[date_str] = future.result()
+                    continue
+                except CancelledError:
+                    cancelled_dates.append(date_str)
+                    continue
+                except subprocess.TimeoutExpired:
+                    error_msg = error_msg or f"Firebase upload timeout (5 dakika): {date_str}"
+                    self.logger.error(f"Tarih {date_str} upload zaman aşımı")
+                except Exception as e:
+                    error_msg = error_msg or f"Firebase upload exception: {str(e)}"
+                    self.logger.error(f"Tarih {date_str} upload hatası: {e}")
+
+                failed_dates.append(date_str)
+
+                # İlk hatada başlamamış tarihleri iptal et; çalışanlar bitince hesaba katılır
+                stop.set()
+                for other, other_date in futures.items():
+                    if not other.done() and other.cancel():
+                        cancelled_dates.append(other_date)
+
+        elapsed = time.perf_counter() - started
+        try:
+            pending_matches = self.outbox.pending_count()
+            self.outbox.prune()
+        except Exception as e:
+            self.logger.warning(f"Upload kuyruğu durumu okunamadı: {e}")
+            pending_matches = 0
+
+        total_uploaded = sum(report.uploaded for report in reports.values())
+        total_skipped = sum(report.skipped for report in reports.values())
+        total_deleted = sum(report.deleted for report in reports.values())
+        total_failed = sum(len(report.failed) for report in reports.values())
+        bytes_written = sum(report.bytes_written for report in reports.values())
+        documents_written = sum(report.documents for report in reports.values())
+
+        if error_msg is None:
+            self.logger.info(
+                f"Tüm tarihler için Firebase upload başarılı: {total_uploaded} yüklendi, {total_skipped} atlandı, "
+                f"{total_deleted} silindi, {total_failed} yüklenemedi ({documents_written} doküman, "
+                f"{bytes_written} byte, {elapsed:.1f} sn)"
+            )
+        else:
+            self.logger.error(
+                f"Firebase upload yarıda kaldı: {len(reports)} tarih tamamlandı ({total_uploaded} maç yüklendi), "
+                f"başarısız: {', '.join(sorted(failed_dates)) or '-'}, iptal: {', '.join(sorted(cancelled_dates)) or '-'}"
+            )
+        if pending_matches:
+            self.logger.warning(f"Upload kuyruğunda {pending_matches} maç bekliyor, sonraki çalışmada tekrar gönderilecek")
+
+        return UploadResult(
+            success=error_msg is None,
+            uploaded_matches=total_uploaded,
+            skipped_matches=total_skipped,
+            error_message=error_msg,
+            deleted_matches=total_deleted,
+            documents_written=documents_written,
+            bytes_written=bytes_written,
+            failed_matches=total_failed,
+            batches=sum(report.batches for report in reports.values()),
+            dates={date_str: reports[date_str].to_dict() for date_str in sorted(reports)},
+            failed_dates=sorted(failed_dates),
+            cancelled_dates=sorted(cancelled_dates),
+            upload_seconds=round(elapsed, 3),
+            pending_matches=pending_matches,
+        )
+
     def send_notification(self, subject: str, message: str):
         """Bildirim gönder"""
         if not self.config["notifications"]["enabled"]:
@@ -443,117 +1035,102 @@ class AutomationManager:
                 "failed_scrapers": 0,
                 "total_matches_scraped": 0,
                 "total_matches_uploaded": 0,
-                "total_matches_skipped": 0
+                "total_matches_skipped": 0,
+                "total_matches_failed": 0
             }
         }
         
         # Her scraper'ı çalıştır
         for scraper_name in scraper_names:
-            rules = self.config.get("scraping_rules", {})
-            min_successful_dates = rules.get("min_successful_dates", 2)
-            retry_delay = rules.get("retry_delay_seconds", 1)
-            max_retries = rules.get("max_retries_if_needed", 0)  # 0: sınırsız
-
-            attempt = 0
-            scraping_result: Optional[ScrapingResult] = None
-            last_upload_result: Optional[UploadResult] = None
-            total_uploaded_acc = 0
-            total_skipped_acc = 0
-
-            while True:
-                attempt += 1
-                self.logger.info(f"=== {scraper_name.upper()} SCRAPER (deneme {attempt}) ===")
-
-                # Scraping yap
-                scraping_result = self.run_scraper(scraper_name)
-
-                if scraping_result.success:
-                    if scraping_result.required_dates:
-                        self.logger.info(
-                            f"{scraper_name}: {scraping_result.successful_dates}/{scraping_result.required_dates} gün, "
-                            f"{scraping_result.total_matches} maç, {scraping_result.leagues_count} lig"
-                        )
-                    else:
-                        self.logger.info(f"{scraper_name}: {scraping_result.total_matches} maç, {scraping_result.leagues_count} lig")
-
-                    # Firebase upload
-                    if self.config["firebase"]["auto_upload"] and scraping_result.data_file:
-                        self.logger.info(f"=== {scraper_name.upper()} FIREBASE UPLOAD ===")
-
-                        upload_result = self.upload_to_firebase(scraping_result.data_file)
-                        last_upload_result = upload_result
-
-                        if upload_result.success:
-                            total_uploaded_acc += upload_result.uploaded_matches
-                            total_skipped_acc += upload_result.skipped_matches
-
-                            # Başarılı upload sonrası dosyayı sil (opsiyonel)
-                            if self.config["firebase"]["delete_after_upload"]:
-                                try:
-                                    os.remove(scraping_result.data_file)
-                                    self.logger.info(f"Upload sonrası dosya silindi: {scraping_result.data_file}")
-                                except Exception as e:
-                                    self.logger.warning(f"Dosya silinemedi: {e}")
-                        else:
-                            self.send_notification(
-                                f"{scraper_name} Upload Hatası",
-                                f"Firebase upload başarısız: {upload_result.error_message}"
-                            )
+            upload_result: Optional[UploadResult] = None
+            self.logger.info(f"=== {scraper_name.upper()} SCRAPER ===")
 
-                else:
-                    self.logger.warning(
-                        f"{scraper_name} denemesi başarısız: {scraping_result.error_message}"
+            # Scraping yap (eksik tarihlerin tekrar denemesi run_scraper içinde, tarih bazında)
+            scraping_result = self.run_scraper(scraper_name)
+            attempts = 1 + scraping_result.retry_rounds
+
+            if scraping_result.success:
+                if scraping_result.required_dates:
+                    self.logger.info(
+                        f"{scraper_name}: {scraping_result.successful_dates}/{scraping_result.required_dates} gün, "
+                        f"{scraping_result.total_matches} maç, {scraping_result.leagues_count} lig"
                     )
+                else:
+                    self.logger.info(f"{scraper_name}: {scraping_result.total_matches} maç, {scraping_result.leagues_count} lig")
 
-                # Döngüden çıkma koşulları
-                if scraping_result.success and scraping_result.successful_dates >= min_successful_dates:
-                    break
-                if max_retries and attempt >= max_retries:
-                    self.logger.warning(
-                        f"{scraper_name} maksimum deneme sayısına ulaştı ({max_retries}), döngü sonlandırılıyor."
+                # Firebase upload
+                if self.replay and scraping_result.data_file:
+                    self.logger.info(f"{scraper_name}: replay modunda Firebase upload atlandı")
+                elif self.config["firebase"]["auto_upload"] and scraping_result.data_file:
+                    self.logger.info(f"=== {scraper_name.upper()} FIREBASE UPLOAD ===")
+
+                    # Scraper'ın bellekteki verisi yeniden kullanılır (combined dosya tekrar okunmaz)
+                    upload_result = self.upload_to_firebase(
+                        scraping_result.data_file,
+                        self.pending_scraper.completed_data if self.pending_scraper else None,
                     )
-                    break
 
-                self.logger.info(
-                    f"{scraper_name} yeterli gün değil ({scraping_result.successful_dates}/{min_successful_dates}). "
-                    f"{retry_delay} saniye sonra yeniden denenecek..."
-                )
-                time.sleep(retry_delay)
+                    if upload_result.success:
+                        self.commit_scraper_state()
 
-            # Döngü sonrası sonuçları kaydet
-            if scraping_result:
-                results["scrapers"][scraper_name] = {**scraping_result.__dict__, "attempts": attempt}
+                        if upload_result.failed_matches:
+                            self.send_notification(
+                                f"{scraper_name} Upload Uyarısı",
+                                f"{upload_result.failed_matches} maç tekrar denemeye rağmen yüklenemedi"
+                            )
 
-                if scraping_result.success:
-                    results["summary"]["successful_scrapers"] += 1
-                    results["summary"]["total_matches_scraped"] += scraping_result.total_matches
+                        # Başarılı upload sonrası dosyaları sil (opsiyonel)
+                        if self.config["firebase"]["delete_after_upload"]:
+                            self.delete_uploaded_files(scraping_result.data_file)
+                    else:
+                        if upload_result.enqueued:
+                            # Veri kalıcı kuyrukta: sonraki çalışma yeniden scrape etmeden yalnızca kalanları gönderir
+                            self.commit_scraper_state()
+                        self.send_notification(
+                            f"{scraper_name} Upload Hatası",
+                            f"Firebase upload başarısız: {upload_result.error_message}"
+                        )
                 else:
-                    results["summary"]["failed_scrapers"] += 1
-                    self.send_notification(
-                        f"{scraper_name} Scraper Hatası", 
-                        f"Scraping başarısız: {scraping_result.error_message}"
-                    )
+                    # Upload edilecek yeni veri yok veya upload kapalı
+                    self.commit_scraper_state()
+
+                    # Önceki çalışmalardan kuyrukta kalan batch'ler yeni veri beklemeden gönderilir
+                    if self.config["firebase"]["auto_upload"] and not self.replay and self.outbox.pending_count():
+                        self.logger.info(f"=== {scraper_name.upper()} UPLOAD KUYRUĞU ===")
+                        upload_result = self.drain_outbox()
+
+                results["summary"]["successful_scrapers"] += 1
+                results["summary"]["total_matches_scraped"] += scraping_result.total_matches
+            else:
+                results["summary"]["failed_scrapers"] += 1
+                self.send_notification(
+                    f"{scraper_name} Scraper Hatası", 
+                    f"Scraping başarısız: {scraping_result.error_message}"
+                )
+
+            results["scrapers"][scraper_name] = {**scraping_result.__dict__, "attempts": attempts}
 
             # Upload özetini kaydet
-            if last_upload_result:
+            if upload_result:
+                # Yarıda kalan upload'da da tamamlanan tarihlerin sayıları gerçektir
                 results["uploads"][scraper_name] = {
-                    **last_upload_result.__dict__,
-                    "total_uploaded_matches": total_uploaded_acc,
-                    "total_skipped_matches": total_skipped_acc,
-                    "attempts": attempt,
+                    **upload_result.__dict__,
+                    "total_uploaded_matches": upload_result.uploaded_matches,
+                    "total_skipped_matches": upload_result.skipped_matches,
+                    "attempts": attempts,
                 }
-                if last_upload_result.success:
-                    results["summary"]["total_matches_uploaded"] += total_uploaded_acc
-                    results["summary"]["total_matches_skipped"] += total_skipped_acc
+                results["summary"]["total_matches_uploaded"] += upload_result.uploaded_matches
+                results["summary"]["total_matches_skipped"] += upload_result.skipped_matches
+                results["summary"]["total_matches_failed"] += upload_result.failed_matches
             else:
                 results["uploads"][scraper_name] = {
                     "success": False,
                     "uploaded_matches": 0,
                     "skipped_matches": 0,
                     "error_message": "Upload çalıştırılmadı veya başarısız oldu",
-                    "attempts": attempt,
-                    "total_uploaded_matches": total_uploaded_acc,
-                    "total_skipped_matches": total_skipped_acc,
+                    "attempts": attempts,
+                    "total_uploaded_matches": 0,
+                    "total_skipped_matches": 0,
                 }
         
         # Sonuçları kaydet
@@ -568,8 +1145,7 @@ class AutomationManager:
         results_dir.mkdir(exist_ok=True)
         
         results_file = results_dir / f"automation_result_{start_time.strftime('%Y%m%d_%H%M%S')}.json"
-        with open(results_file, "w", encoding="utf-8") as f:
-            json.dump(results, f, indent=4, ensure_ascii=False)
+        json_codec.dump_file(str(results_file), results)
         
         # Özet log
         summary = results["summary"]
@@ -579,6 +1155,7 @@ class AutomationManager:
         self.logger.info(f"Toplam scrape edilen maç: {summary['total_matches_scraped']}")
         self.logger.info(f"Firebase'e yüklenen maç: {summary['total_matches_uploaded']}")
         self.logger.info(f"Atlanan maç: {summary['total_matches_skipped']}")
+        self.logger.info(f"Yüklenemeyen maç: {summary['total_matches_failed']}")
         self.logger.info(f"Sonuç dosyası: {results_file}")
         
         return results
@@ -586,16 +1163,30 @@ class AutomationManager:
 
 def main():
     """Ana fonksiyon - komut satırından çalıştırmak için"""
-    if len(sys.argv) > 1:
-        # Belirli scrapers çalıştır
-        scrapers = sys.argv[1].split(',')
-    else:
-        # Tüm aktif scrapers'ları çalıştır
-        scrapers = None
+    parser = argparse.ArgumentParser(description="Scraper + Firebase upload otomasyonu")
+    parser.add_argument("scrapers", nargs="?", help="Virgülle ayrılmış scraper adları (boş ise tümü)")
+    parser.add_argument("--replay", action="store_true",
+                        help="Sayfaları arşivden oku; siteye ve Firebase'e bağlanma")
+    parser.add_argument("--pretty-json", action="store_true",
+                        help="JSON çıktılarını girintili yaz (hata ayıklama için; varsayılan kompakt)")
+    parser.add_argument("--drain-outbox", action="store_true",
+                        help="Scrape etmeden yalnızca upload kuyruğunda bekleyen batch'leri gönder")
+    args = parser.parse_args()
+    if args.pretty_json:
+        json_codec.set_pretty(True)
+    
+    # Belirli scrapers veya (None ise) tüm aktif scrapers
+    scrapers = args.scrapers.split(',') if args.scrapers else None
     
     try:
-        manager = AutomationManager()
-        results = manager.run_automation(scrapers)
+        manager = AutomationManager(replay=args.replay)
+        try:
+            if args.drain_outbox:
+                upload_result = manager.drain_outbox()
+                sys.exit(0 if upload_result.success and not upload_result.pending_matches else 1)
+            results = manager.run_automation(scrapers)
+        finally:
+            manager.close()
         
         # Exit code
         if results["summary"]["failed_scrapers"] == 0:
@@ -2,22 +2,30 @@
 # -*- coding: utf-8 -*-
 
 import os
-import json
+import sys
 import datetime
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple
 import http.server
 import socketserver
 from urllib.parse import parse_qs, urlparse
 import webbrowser
 import argparse
 
+# Ana proje dizinini sys.path'e ekle
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import json_codec
+
 
 class MonitoringDashboard:
     """
     Basit web-based monitoring dashboard
     """
     
+    # Her istekte yeni dashboard oluşur; çözülmüş sonuç dosyaları (mtime, boyut) ile süreç boyunca tutulur
+    _result_cache: Dict[str, Tuple[float, int, Dict[str, Any]]] = {}
+    
     def __init__(self):
         self.automation_dir = Path(__file__).parent
         self.results_dir = self.automation_dir / "results"
@@ -34,10 +42,15 @@ class MonitoringDashboard:
         results = []
         for file_path in result_files[:limit]:
             try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
+                stat = file_path.stat()
+                cached = self._result_cache.get(str(file_path))
+                if cached and cached[:2] == (stat.st_mtime, stat.st_size):
+                    data = cached[2]
+                else:
+                    data = json_codec.load_file(str(file_path))
                     data["file_name"] = file_path.name
-                    results.append(data)
+                    self._result_cache[str(file_path)] = (stat.st_mtime, stat.st_size, data)
+                results.append(data)
             except Exception as e:
                 print(f"Dosya okuma hatası {file_path}: {e}")
         
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import datetime
+import json
+import sys
+import time
+
+import json_codec
+from html_parsers import parse_leagues
+from name_registry import NameRegistry
+from records import json_default
+
+
+def build_combined(html_file: str, days: int) -> dict:
+    """Kayıtlı sayfadan ``days`` günlük, eski (data_by_date satır içi) biçimde combined veri üret"""
+    with open(html_file, "r", encoding="utf-8") as f:
+        html_content = f.read()
+
+    names = NameRegistry("")  # yalnızca bellekte; kaydedilmez
+    start = datetime.date.today()
+    data_by_date = {}
+    for offset in range(days):
+        day = start + datetime.timedelta(days=offset)
+        leagues_data = parse_leagues(html_content, day.strftime("%Y%m%d"), "html5lib") or []
+        data_by_date[day.isoformat()] = names.annotate(leagues_data)
+
+    return {
+        "scrape_timestamp": datetime.datetime.now().isoformat(),
+        "dates_scraped": [day.replace("-", "") for day in data_by_date],
+        "data_by_date": data_by_date,
+    }
+
+
+def timed(func, repeat: int) -> float:
+    """Ortalama süre (ms)"""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def bench(html_file: str, days: int, repeat: int) -> None:
+    combined = build_combined(html_file, days)
+    matches = sum(len(league.matches) for leagues in combined["data_by_date"].values() for league in leagues)
+    print(f"Combined veri: {days} gün, {matches} maç (JSON backend: {json_codec.BACKEND})")
+
+    stdlib_pretty = json.dumps(combined, ensure_ascii=False, indent=4, default=json_default).encode("utf-8")
+    codec_compact = json_codec.dumps(combined, pretty=False)
+    codec_pretty = json_codec.dumps(combined, pretty=True)
+
+    cases = [
+        ("stdlib indent=4 (eski)", stdlib_pretty,
+         lambda: json.dumps(combined, ensure_ascii=False, indent=4, default=json_default).encode("utf-8"),
+         lambda: json.loads(stdlib_pretty)),
+        (f"{json_codec.BACKEND} kompakt", codec_compact,
+         lambda: json_codec.dumps(combined, pretty=False),
+         lambda: json_codec.loads(codec_compact)),
+        (f"{json_codec.BACKEND} girintili (debug)", codec_pretty,
+         lambda: json_codec.dumps(combined, pretty=True),
+         lambda: json_codec.loads(codec_pretty)),
+    ]
+
+    baseline = None
+    for label, payload, encode, decode in cases:
+        encode_ms = timed(encode, repeat)
+        decode_ms = timed(decode, repeat)
+        if baseline is None:
+            baseline = (encode_ms, decode_ms)
+        print(f"{label:<26} {len(payload) / 1024:8.1f} KB  "
+              f"yazma {encode_ms:7.2f} ms ({baseline[0] / encode_ms:4.1f}x)  "
+              f"okuma {decode_ms:7.2f} ms ({baseline[1] / decode_ms:4.1f}x)")
+
+    # Kodlayıcılar aynı veriyi üretmeli
+    if json.loads(stdlib_pretty) != json_codec.loads(codec_compact):
+        print("❌ Kompakt çıktı eski çıktı ile aynı veriyi içermiyor")
+        sys.exit(1)
+    print("✅ Çözülen veriler aynı")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="JSON codec yazma/okuma karşılaştırması")
+    parser.add_argument("html_file", nargs="?", default="debug/page.html",
+                        help="Veri üretmek için kayıtlı sayfa (varsayılan: debug/page.html)")
+    parser.add_argument("--days", type=int, default=7, help="Combined veri gün sayısı")
+    parser.add_argument("--repeat", type=int, default=20, help="Ölçüm tekrar sayısı")
+    args = parser.parse_args()
+
+    bench(args.html_file, max(1, args.days), max(1, args.repeat))
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import json
+import sys
+import time
+from itertools import product
+from typing import Any, Dict, List, Optional
+
+from html_parsers import PARSER_BACKENDS, available_backends, parse_leagues, slice_prediction_table
+
+
+# Orijinal (html5lib + BeautifulSoup) parse_page'in ürettiği alanlar; beklenen çıktı bunlarla sınırlı
+BASELINE_MATCH_FIELDS = ("home_team", "away_team", "prediction", "match_date")
+
+
+def baseline_view(leagues_data: Optional[List[Any]]) -> List[Dict[str, Any]]:
+    """Ayrıştırma sonucunu orijinal parser'ın çıktı biçimine indir (sonradan eklenen alanlar hariç)"""
+    return [
+        {
+            "league_name": league["league_name"],
+            "matches": [{name: match[name] for name in BASELINE_MATCH_FIELDS} for match in league["matches"]],
+        }
+        for league in leagues_data or []
+    ]
+
+
+def check_parsers(html_file: str, expected_file: str, date_str: str, repeat: int) -> bool:
+    """
+    Her parser backend'inin (tam ve div.pttable ile sınırlı ayrıştırmada) orijinal parser'ın
+    kayıtlı çıktısıyla (expected_file) aynı ligleri ve maçları ürettiğini doğrula ve sayfa
+    başına süreleri karşılaştır. Kurulu olmayan backend'ler açıkça atlanır.
+    """
+    with open(html_file, "r", encoding="utf-8") as f:
+        html_content = f.read()
+    with open(expected_file, "r", encoding="utf-8") as f:
+        expected = json.load(f)
+
+    matches = sum(len(league["matches"]) for league in expected)
+    table_html = slice_prediction_table(html_content)
+    print(f"Beklenen çıktı ({expected_file}): {len(expected)} lig, {matches} maç")
+    if table_html:
+        print(f"div.pttable bloğu: {len(table_html)}/{len(html_content)} karakter")
+
+    installed = available_backends()
+    all_equal = True
+    for backend, restricted in product(PARSER_BACKENDS, (False, True)):
+        mode = "sınırlı" if restricted else "tam"
+        if backend not in installed:
+            print(f"⏭️  {backend:<10} {mode:<8} kurulu değil, atlandı")
+            continue
+
+        started = time.perf_counter()
+        for _ in range(repeat):
+            leagues_data = parse_leagues(html_content, date_str, backend, restricted)
+        per_page_ms = (time.perf_counter() - started) / repeat * 1000
+
+        actual = baseline_view(leagues_data)
+        equal = actual == expected
+        all_equal = all_equal and equal
+        print(f"{'✅' if equal else '❌'} {backend:<10} {mode:<8} {per_page_ms:8.1f} ms/sayfa")
+        if not equal:
+            for league, expected_league in zip(actual, expected):
+                if league != expected_league:
+                    print(f"   İlk fark: {league['league_name']} ↔ {expected_league['league_name']}")
+                    break
+            else:
+                print(f"   Lig sayısı farklı: {len(actual)} ↔ {len(expected)}")
+
+    return all_equal
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parser backend'lerinin çıktı eşdeğerliği kontrolü")
+    parser.add_argument("html_file", nargs="?", default="debug/page.html",
+                        help="Kontrol edilecek kayıtlı sayfa (varsayılan: debug/page.html)")
+    parser.add_argument("--expected", default="debug/page_expected.json",
+                        help="Orijinal parser'ın bu sayfa için çıktısı (varsayılan: debug/page_expected.json)")
+    parser.add_argument("--date", default="20250821", help="match_date alanı için YYYYMMDD tarih")
+    parser.add_argument("--repeat", type=int, default=5, help="Süre ölçümü için tekrar sayısı")
+    args = parser.parse_args()
+
+    sys.exit(0 if check_parsers(args.html_file, args.expected, args.date, max(1, args.repeat)) else 1)
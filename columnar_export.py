@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import os
+import re
+import time
+from typing import Dict, Any, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # numpy yoksa sütun dışa aktarımı kullanılamaz
+    np = None
+
+from history_store import HistoryStore
+from name_registry import NameRegistry
+
+
+# Tahmin metnindeki skor ("Home 2-1" → 2, 1)
+_SCORE_RE = re.compile(r"(\d+)\s*-\s*(\d+)")
+
+# tip_1x2 → sayısal kod (-1: bilinmiyor)
+TIP_CODES = {"1": 1, "X": 0, "2": 2}
+
+# Sütunlu maç kaydı: sabit genişlikli alanlar, böylece dosya mmap ile açılabilir
+# (ID'ler NameRegistry ID'leri, tarih YYYYMMDD tamsayı, bilinmeyen gol -1, bilinmeyen oran NaN)
+COLUMN_DTYPE = [
+    ("match_date", "<i4"),
+    ("league_id", "<i4"),
+    ("home_id", "<i4"),
+    ("away_id", "<i4"),
+    ("home_goals", "i1"),
+    ("away_goals", "i1"),
+    ("tip_1x2", "i1"),
+    ("odds_home", "<f4"),
+    ("odds_draw", "<f4"),
+    ("odds_away", "<f4"),
+    ("match_id", "S16"),
+]
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise RuntimeError("Sütun dışa aktarımı için numpy gerekli: pip install numpy")
+
+
+def parse_score(prediction: Optional[str]) -> Tuple[int, int]:
+    """Tahminin ev/deplasman gol sayısı (skor yoksa -1, -1)"""
+    found = _SCORE_RE.search(prediction or "")
+    if not found:
+        return -1, -1
+    return int(found.group(1)), int(found.group(2))
+
+
+def export_history(db_path: str, out_path: str) -> int:
+    """
+    Geçmiş deposundaki tüm maçları yapılandırılmış NumPy dizisi olarak .npy dosyasına yaz
+
+    Returns:
+        int: Yazılan maç sayısı
+    """
+    _require_numpy()
+    store = HistoryStore(db_path)
+    rows = store.all_matches()
+    store.close()
+
+    columns = np.empty(len(rows), dtype=COLUMN_DTYPE)
+    nan = float("nan")
+    for index, row in enumerate(rows):
+        home_goals, away_goals = parse_score(row["prediction"])
+        columns[index] = (
+            int(row["match_date"]),
+            row["league_id"] if row["league_id"] is not None else -1,
+            row["home_id"] if row["home_id"] is not None else -1,
+            row["away_id"] if row["away_id"] is not None else -1,
+            home_goals,
+            away_goals,
+            TIP_CODES.get(row["tip_1x2"], -1),
+            row["odds_home"] if row["odds_home"] is not None else nan,
+            row["odds_draw"] if row["odds_draw"] is not None else nan,
+            row["odds_away"] if row["odds_away"] is not None else nan,
+            row["match_id"].encode("ascii"),
+        )
+
+    # np.save hedefe doğrudan yazar; okuyucu yarım dosya görmesin diye geçici dosya + replace
+    temp_path = f"{out_path}.tmp.npy"
+    np.save(temp_path, columns)
+    os.replace(temp_path, out_path)
+    return len(columns)
+
+
+def load_columns(path: str, mmap: bool = True):
+    """Sütun dosyasını aç (mmap=True: veri diskten sayfa sayfa okunur, kopyalanmaz)"""
+    _require_numpy()
+    return np.load(path, mmap_mode="r" if mmap else None)
+
+
+def score_distribution(columns) -> Dict[str, int]:
+    """Tahmin edilen skorların dağılımı ("2-1" → maç sayısı), en sık görülenden başlayarak"""
+    known = columns[columns["home_goals"] >= 0]
+    codes = known["home_goals"].astype(np.int32) * 100 + known["away_goals"].astype(np.int32)
+    values, counts = np.unique(codes, return_counts=True)
+    order = np.argsort(-counts, kind="stable")
+    return {f"{values[i] // 100}-{values[i] % 100}": int(counts[i]) for i in order}
+
+
+def home_bias_by_league(columns) -> Dict[int, Dict[str, float]]:
+    """
+    Lig ID'si başına tahminlerdeki ev sahibi eğilimi: ortalama (ev - deplasman) gol farkı
+    ve 1/X/2 tahmin oranları
+    """
+    known = columns[(columns["home_goals"] >= 0) & (columns["league_id"] >= 0)]
+    league_ids = known["league_id"]
+    size = int(league_ids.max()) + 1 if len(known) else 0
+    matches = np.bincount(league_ids, minlength=size)
+    goal_diff = np.bincount(
+        league_ids,
+        weights=known["home_goals"].astype(np.float64) - known["away_goals"],
+        minlength=size,
+    )
+    tips = {
+        label: np.bincount(league_ids[known["tip_1x2"] == code], minlength=size)
+        for label, code in (("home", 1), ("draw", 0), ("away", 2))
+    }
+    return {
+        league_id: {
+            "matches": int(matches[league_id]),
+            "mean_goal_diff": float(goal_diff[league_id] / matches[league_id]),
+            **{f"{label}_share": float(counts[league_id] / matches[league_id]) for label, counts in tips.items()},
+        }
+        for league_id in np.nonzero(matches)[0].tolist()
+    }
+
+
+def summarize(path: str) -> Dict[str, Any]:
+    """Sütun dosyasını mmap ile açıp özet istatistikleri ve süreyi döndür"""
+    started = time.perf_counter()
+    columns = load_columns(path)
+    distribution = score_distribution(columns)
+    bias = home_bias_by_league(columns)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    return {
+        "matches": len(columns),
+        "top_scores": dict(list(distribution.items())[:5]),
+        "leagues": len(bias),
+        "home_bias_by_league": bias,
+        "elapsed_ms": round(elapsed_ms, 2),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Geçmiş deposunun NumPy sütun dışa aktarımı")
+    parser.add_argument("--db", default="data/history.sqlite", help="Geçmiş deposu")
+    parser.add_argument("--out", default="data/history_columns.npy", help="Sütun dosyası")
+    parser.add_argument("--registry", default="data/name_registry.json", help="Lig adları için isim sözlüğü")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("export", help="Depoyu .npy sütun dosyasına yaz")
+    commands.add_parser("summary", help="Skor dağılımı ve lig bazında ev sahibi eğilimi")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        exported = export_history(args.db, args.out)
+        print(f"✅ {exported} maç {args.out} dosyasına yazıldı")
+    else:
+        summary = summarize(args.out)
+        names = NameRegistry(args.registry)
+        print(f"📊 {summary['matches']} maç, {summary['leagues']} lig ({summary['elapsed_ms']} ms, mmap)")
+        print(f"   • En sık tahmin edilen skorlar: "
+              f"{', '.join(f'{score} ({count})' for score, count in summary['top_scores'].items())}")
+        for league_id, stats in sorted(summary["home_bias_by_league"].items(),
+                                       key=lambda item: -item[1]["mean_goal_diff"])[:10]:
+            print(f"   • {names.name('league', league_id)[:28]:<28} {stats['matches']:5d} maç, gol farkı {stats['mean_goal_diff']:+.2f}, "
+                  f"1/X/2 %{stats['home_share'] * 100:.0f}/%{stats['draw_share'] * 100:.0f}/%{stats['away_share'] * 100:.0f}")
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+from typing import Dict, Any, List, Optional
+
+import json_codec
+from records import League
+
+
+# Combined dosyanın manifest biçimi: veri tarih dosyalarında, combined yalnızca onları gösterir
+COMBINED_FORMAT = "manifest"
+
+
+def encode_leagues(leagues_data: List[League]) -> bytes:
+    """Tarihin lig listesini tek seferde JSON byte'larına çevir (debug dışında kompakt)"""
+    return json_codec.dumps(leagues_data)
+
+
+def write_leagues(path: str, leagues_data: List[League]) -> None:
+    """Tarihin lig listesini tarih dosyasına atomik olarak yaz"""
+    json_codec.write_atomic(path, encode_leagues(leagues_data))
+
+
+def write_combined_manifest(
+    path: str,
+    scrape_timestamp: str,
+    dates_scraped: List[str],
+    files_by_date: Dict[str, str],
+    data_by_date: Optional[Dict[str, List[League]]] = None,
+) -> None:
+    """
+    Combined dosyayı manifest olarak yaz: her tarih (YYYY-MM-DD) için veri tek kez yazılmış
+    tarih dosyasının adı (manifest ile aynı klasörde) tutulur, veri tekrar serileştirilmez.
+
+    ``data_by_date`` verilirse dosya eski biçimde (veri satır içinde) yazılır; combined
+    dosyayı doğrudan okuyan eski okuyucular içindir. ``files_by_date`` yine eklenir ki
+    upload sonrası temizlik tarih dosyalarını bulabilsin.
+    """
+    folder = os.path.dirname(path)
+    manifest: Dict[str, Any] = {
+        "scrape_timestamp": scrape_timestamp,
+        "dates_scraped": dates_scraped,
+        "files_by_date": {
+            date_key: os.path.relpath(file_path, folder or ".")
+            for date_key, file_path in files_by_date.items()
+        },
+    }
+    if data_by_date is None:
+        manifest = {"format": COMBINED_FORMAT, **manifest}
+    else:
+        manifest["data_by_date"] = data_by_date
+    json_codec.dump_file(path, manifest)
+
+
+def combined_date_files(path: str) -> Dict[str, str]:
+    """
+    Combined dosyanın gösterdiği tarih dosyaları (YYYY-MM-DD → mutlak yol).
+    files_by_date'i olmayan eski combined dosyalarda boş döner.
+    """
+    combined = json_codec.load_file(path)
+    folder = os.path.dirname(os.path.abspath(path))
+    return {
+        date_key: os.path.join(folder, file_name)
+        for date_key, file_name in combined.get("files_by_date", {}).items()
+    }
+
+
+def load_combined(path: str, as_records: bool = False) -> Dict[str, Any]:
+    """
+    Combined dosyayı eski biçimdeki gibi ``data_by_date`` ile birlikte oku.
+
+    Manifest biçiminde tarih verileri gösterilen dosyalardan yüklenir; eski (veriyi satır
+    içinde tutan) combined dosyalar olduğu gibi döner.
+
+    Args:
+        path (str): Combined dosya
+        as_records (bool): Ligleri sözlük yerine League kayıtları olarak döndür
+    """
+    combined = json_codec.load_file(path)
+
+    if combined.get("format") == COMBINED_FORMAT:
+        data_by_date: Dict[str, Any] = {}
+        for date_key, file_path in combined_date_files(path).items():
+            data_by_date[date_key] = json_codec.load_file(file_path)
+        combined = {
+            "scrape_timestamp": combined.get("scrape_timestamp"),
+            "dates_scraped": combined.get("dates_scraped", []),
+            "data_by_date": data_by_date,
+        }
+
+    if as_records:
+        combined["data_by_date"] = {
+            date_key: [League.from_dict(league) for league in leagues_data]
+            for date_key, leagues_data in combined.get("data_by_date", {}).items()
+        }
+    return combined
+
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import datetime
+import hashlib
+import json
+import os
+import re
+import threading
+from typing import Dict, Any, List, Optional
+
+import json_codec
+from records import json_default
+
+
+# Sayfadan sayfaya değişen ama tahmin verisini etkilemeyen kısımlar
+_SCRIPT_RE = re.compile(r"<script\b[^>]*>.*?</script>", re.IGNORECASE | re.DOTALL)
+_COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_html(html_content: str) -> str:
+    """Script, yorum ve boşluk farklarını eleyerek karşılaştırılabilir HTML üret"""
+    text = _SCRIPT_RE.sub("", html_content)
+    text = _COMMENT_RE.sub("", text)
+    return _WHITESPACE_RE.sub(" ", text).strip()
+
+
+def html_hash(html_content: str) -> str:
+    """Normalize edilmiş HTML'in SHA-256 özeti"""
+    return hashlib.sha256(normalize_html(html_content).encode("utf-8")).hexdigest()
+
+
+def data_hash(leagues_data: List[Any]) -> str:
+    """Ayrıştırılmış lig verisinin (anahtar sırasından bağımsız) SHA-256 özeti"""
+    payload = json.dumps(
+        leagues_data, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=json_default
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ContentManifest:
+    """
+    Tarih → (normalize HTML özeti, ayrıştırılmış veri özeti) eşlemesini tutan kalıcı manifest.
+
+    HttpCache gibi yeni kayıtlar önce bekleyen durumdadır ve ``commit()`` ile kalıcı olur;
+    böylece upload başarısız olan bir tarih sonraki çalışmada atlanmaz.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self.entries: Dict[str, Dict[str, Any]] = self._load()
+        self._pending: Dict[str, Dict[str, Any]] = {}
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            return json_codec.load_file(self.path)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  İçerik manifesti okunamadı, sıfırlanıyor: {e}")
+            return {}
+
+    def _get(self, date_str: str, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self.entries.get(date_str)
+        return entry.get(key) if entry else None
+
+    def html_unchanged(self, date_str: str, digest: str) -> bool:
+        """Tarihin HTML özeti son commit edilen ile aynı mı?"""
+        return self._get(date_str, "html_hash") == digest
+
+    def data_unchanged(self, date_str: str, digest: str) -> bool:
+        """Tarihin veri özeti son commit edilen ile aynı mı?"""
+        return self._get(date_str, "data_hash") == digest
+
+    def record(self, date_str: str, html_digest: str, data_digest: str) -> None:
+        """Tarih için yeni özetleri bekleyen kayıt olarak ekle"""
+        with self._lock:
+            self._pending[date_str] = {
+                "html_hash": html_digest,
+                "data_hash": data_digest,
+                "updated_at": datetime.datetime.now().isoformat(),
+            }
+
+    def forget(self, date_str: str) -> None:
+        """Tarih kaydını sil (bir sonraki çalışmada tam işlenir)"""
+        with self._lock:
+            self._pending.pop(date_str, None)
+            self.entries.pop(date_str, None)
+
+    def commit(self, keep_days: int = 30) -> None:
+        """Bekleyen kayıtları kalıcı yap; keep_days'den eski tarihleri manifestten at"""
+        cutoff = (datetime.datetime.now() - datetime.timedelta(days=keep_days)).strftime("%Y%m%d")
+        with self._lock:
+            self.entries.update(self._pending)
+            self._pending = {}
+            self.entries = {
+                date_str: entry for date_str, entry in self.entries.items()
+                if date_str >= cutoff
+            }
+
+            json_codec.dump_file(self.path, self.entries, sort_keys=True)
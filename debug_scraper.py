@@ -6,17 +6,17 @@ from bs4 import BeautifulSoup
 import json
 import os
 
+from http_transport import HttpTransport
+
 def download_and_save_html():
     """
     Web sayfasını indir ve debug için kaydet
     """
     url = "https://www.predictz.com/predictions/tomorrow/"
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-    }
+    transport = HttpTransport()
     
     try:
-        response = requests.get(url, headers=headers)
+        response = transport.get(url)
         response.raise_for_status()
         
         # Debug klasörünü oluştur
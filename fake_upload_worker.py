@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+import json_codec
+
+
+def document_ids(data) -> list:
+    """Batch'teki dokümanların match_id'leri: lig listesinde maçlar, silme listesinde işaretler"""
+    if not isinstance(data, list):
+        return []
+    if data and isinstance(data[0], dict) and "matches" in data[0]:
+        return [match.get("match_id") for league in data for match in league.get("matches", [])]
+    return [marker.get("match_id") for marker in data]
+
+
+def main() -> int:
+    """
+    upload_worker protokolünü konuşan sahte worker: Firebase'e bağlanmaz, gelen batch'leri
+    sayıp başarılı yanıt verir. Protokol ve verim testleri için (çevrimdışı).
+    İstekler gerçek worker gibi paralel işlenir; yanıtlar tamamlanma sırasıyla yazılır.
+    """
+    parser = argparse.ArgumentParser(description="Sahte upload worker")
+    parser.add_argument("--startup-delay", type=float, default=0.0, help="Açılış gecikmesi (saniye)")
+    parser.add_argument("--batch-delay", type=float, default=0.0, help="Batch başına gecikme (saniye)")
+    parser.add_argument("--crash-after", type=int, default=0, help="Bu kadar istekten sonra çök (0: çökme)")
+    parser.add_argument("--fail-date", default=None, help="Bu tarih için hata yanıtı ver")
+    parser.add_argument("--fail-match", action="append", default=[],
+                        help="Bu match_id'yi yüklenemedi olarak raporla (ilk N deneme, --fail-times)")
+    parser.add_argument("--fail-times", type=int, default=1, help="--fail-match maçlarının kaç deneme başarısız olacağı")
+    args = parser.parse_args()
+
+    time.sleep(args.startup_delay)
+    out = sys.stdout.buffer
+    out_lock = threading.Lock()
+    failures_lock = threading.Lock()
+
+    def write(line: bytes) -> None:
+        with out_lock:
+            out.write(line)
+            out.flush()
+
+    write(json_codec.dumps({"type": "ready", "protocol": 1}, pretty=False) + b"\n")
+
+    failures = {match_id: args.fail_times for match_id in args.fail_match}
+
+    def handle(message) -> None:
+        op = message.get("op")
+        reply = {"id": message.get("id"), "ok": True}
+        if op in ("upload", "delete"):
+            started = time.perf_counter()
+            data = message.get("data")
+            if data is None and message.get("file"):
+                data = json_codec.load_file(message["file"])
+            time.sleep(args.batch_delay)
+            if message.get("date") == args.fail_date:
+                reply = {"id": message.get("id"), "ok": False, "error": f"{args.fail_date} yüklenemedi"}
+            else:
+                ids = document_ids(data)
+                failed = []
+                with failures_lock:
+                    for match_id in ids:
+                        if failures.get(match_id, 0) > 0:
+                            failures[match_id] -= 1
+                            failed.append({"match_id": match_id, "error": "DEADLINE_EXCEEDED (benzetim)"})
+                done = len(ids) - len(failed)
+                # Log satırı: istemci protokol dışı satırları log olarak geçmeli
+                write(f"Tarih {message.get('date')}: {len(ids)} doküman\n".encode("utf-8"))
+                reply.update({
+                    "uploaded": 0 if op == "delete" else done,
+                    "skipped": 0,
+                    "deleted": done if op == "delete" else 0,
+                    "failed": failed,
+                    "batches": (len(ids) + 499) // 500,  # Firestore batch sınırı: 500 yazma
+                    "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+                })
+        elif op != "ping":
+            reply = {"id": message.get("id"), "ok": False, "error": f"Bilinmeyen işlem: {op}"}
+        write(json_codec.dumps(reply, pretty=False) + b"\n")
+
+    handled = 0
+    threads = []
+    for line in sys.stdin.buffer:
+        if not line.strip():
+            continue
+        message = json_codec.loads(line)
+        if message.get("op") == "shutdown":
+            break
+
+        handled += 1
+        if args.crash_after and handled > args.crash_after:
+            sys.stderr.write("sahte worker: çökme benzetimi\n")
+            sys.stderr.flush()
+            os._exit(3)
+
+        thread = threading.Thread(target=handle, args=(message,), daemon=True)
+        thread.start()
+        threads.append(thread)
+
+    # Kapanmadan önce işlenmekte olan istekleri bitir
+    for thread in threads:
+        thread.join()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
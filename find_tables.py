@@ -4,18 +4,18 @@
 import requests
 from bs4 import BeautifulSoup
 
+from http_transport import HttpTransport
+
 def find_league_tables():
     """
     HTML içerisindeki lig tablolarını ve yapılarını bul
     """
     url = "https://www.predictz.com/predictions/tomorrow/"
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-    }
+    transport = HttpTransport()
     
     try:
         print("Sayfa içeriği indiriliyor...")
-        response = requests.get(url, headers=headers)
+        response = transport.get(url)
         response.raise_for_status()
         html_content = response.text
         
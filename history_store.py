@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import datetime
+import glob
+import os
+import sqlite3
+import threading
+from typing import Dict, Any, Iterable, List, Optional, Union
+
+import json_codec
+from name_registry import NameRegistry, name_key
+from records import League
+
+
+SCHEMA = """
+-- Sayfada görülen her yazım ayrı satırdır; aynı NameRegistry ID'sine bağlanır
+CREATE TABLE IF NOT EXISTS leagues (
+    name_key TEXT PRIMARY KEY,
+    league_id INTEGER NOT NULL,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS teams (
+    name_key TEXT PRIMARY KEY,
+    team_id INTEGER NOT NULL,
+    name TEXT NOT NULL
+);
+-- ID → gösterilen ad (son görülen yazım); maç satırları adları değil yalnızca ID'leri tutar
+CREATE TABLE IF NOT EXISTS league_names (
+    league_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS team_names (
+    team_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS matches (
+    match_id TEXT PRIMARY KEY,
+    match_date TEXT NOT NULL,
+    league_id INTEGER NOT NULL,
+    home_id INTEGER NOT NULL,
+    away_id INTEGER NOT NULL,
+    prediction TEXT,
+    tip_1x2 TEXT,
+    odds_home REAL,
+    odds_draw REAL,
+    odds_away REAL,
+    home_form TEXT,
+    away_form TEXT,
+    stored_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_matches_date ON matches (match_date);
+CREATE INDEX IF NOT EXISTS idx_matches_league_date ON matches (league_id, match_date);
+CREATE INDEX IF NOT EXISTS idx_matches_home_date ON matches (home_id, match_date);
+CREATE INDEX IF NOT EXISTS idx_matches_away_date ON matches (away_id, match_date);
+"""
+
+# matches tablosunda saklanan sütunlar
+STORED_COLUMNS = (
+    "match_id", "match_date", "league_id", "home_id", "away_id",
+    "prediction", "tip_1x2", "odds_home", "odds_draw", "odds_away",
+    "home_form", "away_form",
+)
+
+# Sorgu sonucunun Match alanlarıyla eşleşen sütunları (adlar ID tablolarından eklenir, bu sırayla döner)
+MATCH_COLUMNS = (
+    "match_id", "match_date", "league_id", "league_name",
+    "home_id", "home_team", "away_id", "away_team",
+    "prediction", "tip_1x2", "odds_home", "odds_draw", "odds_away",
+    "home_form", "away_form",
+)
+
+_SELECT_MATCHES = (
+    "SELECT m.match_id, m.match_date, m.league_id, l.name AS league_name, "
+    "m.home_id, h.name AS home_team, m.away_id, a.name AS away_team, "
+    "m.prediction, m.tip_1x2, m.odds_home, m.odds_draw, m.odds_away, m.home_form, m.away_form "
+    "FROM matches m "
+    "JOIN league_names l ON l.league_id = m.league_id "
+    "JOIN team_names h ON h.team_id = m.home_id "
+    "JOIN team_names a ON a.team_id = m.away_id"
+)
+
+# Adları her satırda tutan eski (v1) matches tablosunu ID'li biçime taşır
+_MIGRATE_V1 = """
+CREATE TABLE IF NOT EXISTS league_names (league_id INTEGER PRIMARY KEY, name TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS team_names (team_id INTEGER PRIMARY KEY, name TEXT NOT NULL);
+INSERT OR REPLACE INTO league_names (league_id, name)
+    SELECT league_id, league_name FROM matches WHERE league_id IS NOT NULL GROUP BY league_id;
+INSERT OR REPLACE INTO team_names (team_id, name)
+    SELECT home_id, home_team FROM matches WHERE home_id IS NOT NULL GROUP BY home_id;
+INSERT OR REPLACE INTO team_names (team_id, name)
+    SELECT away_id, away_team FROM matches WHERE away_id IS NOT NULL GROUP BY away_id;
+ALTER TABLE matches RENAME TO matches_v1;
+DROP INDEX IF EXISTS idx_matches_date;
+DROP INDEX IF EXISTS idx_matches_league_date;
+DROP INDEX IF EXISTS idx_matches_home_date;
+DROP INDEX IF EXISTS idx_matches_away_date;
+"""
+
+
+def _date_value(date_str: Optional[str]) -> Optional[str]:
+    """YYYY-MM-DD veya YYYYMMDD → match_date sütunundaki YYYYMMDD biçimi"""
+    return date_str.replace("-", "") if date_str else None
+
+
+class HistoryStore:
+    """
+    Geçmiş tahminlerin gömülü SQLite deposu (WAL modu; tarih, lig ve takım indeksleri).
+
+    Her tarih tek transaction'da yazılır: tarihin eski satırları silinip güncel maç kümesi
+    toplu olarak eklenir, böylece depo her tarih için son çekilen hali tutar. Takım ve lig
+    ID'leri NameRegistry'deki kalıcı ID'lerdir; maç satırları adları tekrar etmez, adlar
+    ID tablolarında bir kez tutulur ve sorgu sonucuna eklenir.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            folder = os.path.dirname(self.path)
+            if folder and not os.path.exists(folder):
+                os.makedirs(folder)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(matches)")}
+            if "league_name" in columns:
+                self._migrate_v1(conn)
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _migrate_v1(self, conn: sqlite3.Connection) -> None:
+        """Eski depoyu tek transaction'da ID'li şemaya taşı"""
+        print(f"🗄️  Geçmiş deposu ID'li şemaya taşınıyor: {self.path}")
+        conn.executescript(
+            "BEGIN;" + _MIGRATE_V1 + SCHEMA
+            + f"INSERT INTO matches ({', '.join(STORED_COLUMNS)}, stored_at) "
+            + f"SELECT {', '.join(STORED_COLUMNS)}, stored_at FROM matches_v1 "
+            + "WHERE league_id IS NOT NULL AND home_id IS NOT NULL AND away_id IS NOT NULL;"
+            + "DROP TABLE matches_v1; COMMIT;"
+        )
+        conn.execute("VACUUM")
+
+    def close(self) -> None:
+        """Bağlantıyı kapat (sonraki çağrıda yeniden açılır)"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def store_dates(self, data_by_date: Dict[str, List[League]]) -> int:
+        """
+        Tarihlerin maçlarını tek transaction'da yaz (tarihin önceki satırlarının yerine geçer)
+
+        Args:
+            data_by_date (Dict[str, List[League]]): Tarih (YYYY-MM-DD) → ligler
+
+        Returns:
+            int: Yazılan maç sayısı
+        """
+        stored_at = datetime.datetime.now().isoformat()
+        league_rows = {}
+        team_rows = {}
+        league_names = {}
+        team_names = {}
+        match_rows = []
+        for leagues_data in data_by_date.values():
+            for league in leagues_data:
+                if league.league_id is None:
+                    continue
+                league_rows[name_key(league.league_name)] = (name_key(league.league_name), league.league_id, league.league_name)
+                league_names[league.league_id] = (league.league_id, league.league_name)
+                for match in league.matches:
+                    if not match.match_id or match.home_id is None or match.away_id is None:
+                        continue
+                    for team_id, team in ((match.home_id, match.home_team), (match.away_id, match.away_team)):
+                        team_rows[name_key(team)] = (name_key(team), team_id, team)
+                        team_names[team_id] = (team_id, team)
+                    match_rows.append((
+                        match.match_id, match.match_date, league.league_id, match.home_id, match.away_id,
+                        match.prediction, match.tip_1x2, match.odds_home, match.odds_draw, match.odds_away,
+                        match.home_form, match.away_form, stored_at,
+                    ))
+
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    "DELETE FROM matches WHERE match_date = ?",
+                    [(_date_value(date_key),) for date_key in data_by_date],
+                )
+                conn.executemany("INSERT OR REPLACE INTO leagues VALUES (?, ?, ?)", league_rows.values())
+                conn.executemany("INSERT OR REPLACE INTO teams VALUES (?, ?, ?)", team_rows.values())
+                conn.executemany("INSERT OR REPLACE INTO league_names VALUES (?, ?)", league_names.values())
+                conn.executemany("INSERT OR REPLACE INTO team_names VALUES (?, ?)", team_names.values())
+                conn.executemany(
+                    f"INSERT OR REPLACE INTO matches ({', '.join(STORED_COLUMNS)}, stored_at) "
+                    f"VALUES ({', '.join('?' * (len(STORED_COLUMNS) + 1))})",
+                    match_rows,
+                )
+        return len(match_rows)
+
+    def _query(self, where: str, params: Iterable[Any], start: Optional[str], end: Optional[str]) -> List[Dict[str, Any]]:
+        clauses = [where] if where else []
+        params = list(params)
+        if start:
+            clauses.append("m.match_date >= ?")
+            params.append(_date_value(start))
+        if end:
+            clauses.append("m.match_date <= ?")
+            params.append(_date_value(end))
+        sql = _SELECT_MATCHES
+        if clauses:
+            sql += " WHERE " + " AND ".join(f"({clause})" for clause in clauses)
+        sql += " ORDER BY match_date, league_name, home_team"
+        with self._lock:
+            rows = self._connect().execute(sql, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def _resolve_id(self, table: str, id_column: str, name_or_id: Union[str, int]) -> Optional[int]:
+        if isinstance(name_or_id, int):
+            return name_or_id
+        with self._lock:
+            row = self._connect().execute(
+                f"SELECT {id_column} FROM {table} WHERE name_key = ?", (name_key(name_or_id),)
+            ).fetchone()
+        return row[0] if row else None
+
+    def team_matches(self, team: Union[str, int], start: Optional[str] = None, end: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Takımın (ad veya ID) ev sahibi ya da deplasman olduğu maçlar"""
+        team_id = self._resolve_id("teams", "team_id", team)
+        if team_id is None:
+            return []
+        return self._query("m.home_id = ? OR m.away_id = ?", (team_id, team_id), start, end)
+
+    def league_matches(self, league: Union[str, int], start: Optional[str] = None, end: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Ligin (ad veya ID) maçları"""
+        league_id = self._resolve_id("leagues", "league_id", league)
+        if league_id is None:
+            return []
+        return self._query("m.league_id = ?", (league_id,), start, end)
+
+    def date_matches(self, start: str, end: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Tarihin (veya tarih aralığının) tüm maçları"""
+        return self._query("", (), start, end or start)
+
+    def all_matches(self, start: Optional[str] = None, end: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Depodaki tüm maçlar (isteğe bağlı tarih aralığıyla), tarih sırasıyla"""
+        return self._query("", (), start, end)
+
+    def stats(self) -> Dict[str, Any]:
+        """Depodaki maç / tarih / takım / lig sayıları ve tarih aralığı"""
+        with self._lock:
+            conn = self._connect()
+            matches, dates, first_date, last_date = conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT match_date), MIN(match_date), MAX(match_date) FROM matches"
+            ).fetchone()
+            teams = conn.execute("SELECT COUNT(*) FROM team_names").fetchone()[0]
+            leagues = conn.execute("SELECT COUNT(*) FROM league_names").fetchone()[0]
+        return {
+            "matches": matches,
+            "dates": dates,
+            "first_date": first_date,
+            "last_date": last_date,
+            "teams": teams,
+            "leagues": leagues,
+        }
+
+    def import_files(self, paths: List[str], names: NameRegistry) -> int:
+        """
+        Eski predictz_data_*.json dosyalarını depoya aktar (ID'si olmayan kayıtlar
+        NameRegistry ile etiketlenir). Her dosya kendi transaction'ında yazılır.
+
+        Returns:
+            int: Aktarılan maç sayısı
+        """
+        imported = 0
+        for path in sorted(paths):
+            data = json_codec.load_file(path)
+            if isinstance(data, dict):
+                data = data.get("leagues", [])
+            date_key = os.path.basename(path).rsplit("_", 1)[-1].split(".")[0]
+            leagues_data = [League.from_dict(league) for league in data]
+            for league in leagues_data:
+                for match in league.matches:
+                    match.match_date = match.match_date or date_key.replace("-", "")
+            names.annotate(leagues_data)
+            imported += self.store_dates({date_key: leagues_data})
+        names.save()
+        return imported
+
+
+def _print_matches(rows: List[Dict[str, Any]]) -> None:
+    for row in rows:
+        print(f"{row['match_date']}  {row['league_name'][:28]:<28}  "
+              f"{row['home_team']} - {row['away_team']}: {row['prediction']}")
+    print(f"({len(rows)} maç)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Geçmiş tahmin deposu (SQLite)")
+    parser.add_argument("--db", default="data/history.sqlite", help="Depo dosyası")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import", help="Eski tarih dosyalarını depoya aktar")
+    import_parser.add_argument("files", nargs="*", help="Dosyalar (varsayılan: data/predictz_data_*.json)")
+    import_parser.add_argument("--registry", default="data/name_registry.json", help="İsim sözlüğü")
+
+    for command, help_text in (("team", "Takımın maçları"), ("league", "Ligin maçları")):
+        query_parser = commands.add_parser(command, help=help_text)
+        query_parser.add_argument("name", help="Ad veya ID")
+        query_parser.add_argument("--from", dest="start", help="Başlangıç tarihi (YYYY-MM-DD)")
+        query_parser.add_argument("--to", dest="end", help="Bitiş tarihi (YYYY-MM-DD)")
+
+    date_parser = commands.add_parser("date", help="Tarihin (veya aralığın) maçları")
+    date_parser.add_argument("start", help="Tarih (YYYY-MM-DD)")
+    date_parser.add_argument("end", nargs="?", help="Aralık sonu (YYYY-MM-DD)")
+
+    commands.add_parser("stats", help="Depo özeti")
+
+    args = parser.parse_args()
+    store = HistoryStore(args.db)
+
+    if args.command == "import":
+        files = args.files or glob.glob("data/predictz_data_*.json")
+        imported = store.import_files(files, NameRegistry(args.registry))
+        print(f"✅ {len(files)} dosyadan {imported} maç aktarıldı")
+    elif args.command in ("team", "league"):
+        key = int(args.name) if args.name.isdigit() else args.name
+        query = store.team_matches if args.command == "team" else store.league_matches
+        _print_matches(query(key, args.start, args.end))
+    elif args.command == "date":
+        _print_matches(store.date_matches(args.start, args.end))
+    else:
+        for key, value in store.stats().items():
+            print(f"{key:<12} {value}")
+    store.close()
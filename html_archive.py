@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import datetime
+import gzip
+import hashlib
+import json
+import os
+import threading
+import uuid
+from typing import Dict, Any, List, Optional, Iterator
+
+
+class HtmlArchive:
+    """
+    İndirilen ham HTML sayfaları için sıkıştırılmış, yalnızca-ekleme (append-only) arşiv.
+
+    Kayıtlar WARC benzeri bir kapta tutulur: her kayıt ``predictz-YYYYMM.warc.gz``
+    dosyasına ayrı bir gzip üyesi olarak eklenir (WARC başlık bloğu + HTML gövdesi).
+    ``index.jsonl`` her kaydın tarihini, çekilme zamanını, dosyasını ve byte aralığını
+    tutar; böylece tek bir kayıt dosyanın tamamı açılmadan okunabilir.
+    """
+
+    INDEX_FILE = "index.jsonl"
+
+    def __init__(self, archive_dir: str):
+        self.archive_dir = archive_dir
+        if not os.path.exists(self.archive_dir):
+            os.makedirs(self.archive_dir)
+
+        self.index_path = os.path.join(self.archive_dir, self.INDEX_FILE)
+        self._lock = threading.Lock()
+        self._index: List[Dict[str, Any]] = self._load_index()
+
+    def _load_index(self) -> List[Dict[str, Any]]:
+        if not os.path.exists(self.index_path):
+            return []
+
+        entries = []
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    # Yarım yazılmış son satır (ör. çökme) arşivi bozmasın
+                    print(f"⚠️  Arşiv indeksinde bozuk satır atlandı: {self.index_path}:{line_no}")
+        return entries
+
+    @staticmethod
+    def _build_record(date_str: str, url: str, body: bytes, fetched_at: str) -> bytes:
+        headers = [
+            "WARC/1.1",
+            "WARC-Type: resource",
+            f"WARC-Record-ID: <urn:uuid:{uuid.uuid4()}>",
+            f"WARC-Date: {fetched_at}",
+            f"WARC-Target-URI: {url}",
+            f"X-Predictz-Date: {date_str}",
+            "Content-Type: text/html; charset=utf-8",
+            f"Content-Length: {len(body)}",
+        ]
+        return ("\r\n".join(headers) + "\r\n\r\n").encode("utf-8") + body + b"\r\n\r\n"
+
+    def latest(self, date_str: str) -> Optional[Dict[str, Any]]:
+        """Tarih için en son arşivlenen kaydın indeks girdisi"""
+        with self._lock:
+            candidates = [entry for entry in self._index if entry["date"] == date_str]
+        return max(candidates, key=lambda entry: entry["fetched_at"]) if candidates else None
+
+    def append(self, date_str: str, url: str, html_content: str) -> Optional[Dict[str, Any]]:
+        """
+        Sayfayı arşive ekle. Tarihin son kaydıyla aynı içerik tekrar yazılmaz.
+
+        Returns:
+            Optional[Dict[str, Any]]: Yeni indeks girdisi veya (tekrar ise) None
+        """
+        body = html_content.encode("utf-8")
+        digest = hashlib.sha256(body).hexdigest()
+
+        previous = self.latest(date_str)
+        if previous and previous["sha256"] == digest:
+            return None
+
+        now = datetime.datetime.now(datetime.timezone.utc)
+        fetched_at = now.strftime("%Y-%m-%dT%H:%M:%SZ")
+        archive_file = f"predictz-{now.strftime('%Y%m')}.warc.gz"
+        record = gzip.compress(self._build_record(date_str, url, body, fetched_at))
+
+        with self._lock:
+            with open(os.path.join(self.archive_dir, archive_file), "ab") as f:
+                offset = f.tell()
+                f.write(record)
+
+            entry = {
+                "date": date_str,
+                "fetched_at": fetched_at,
+                "url": url,
+                "file": archive_file,
+                "offset": offset,
+                "length": len(record),
+                "sha256": digest,
+            }
+            with open(self.index_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self._index.append(entry)
+
+        return entry
+
+    def read(self, entry: Dict[str, Any]) -> str:
+        """İndeks girdisinin gösterdiği kaydın HTML gövdesini döndür"""
+        with open(os.path.join(self.archive_dir, entry["file"]), "rb") as f:
+            f.seek(entry["offset"])
+            record = gzip.decompress(f.read(entry["length"]))
+
+        header_block, _, rest = record.partition(b"\r\n\r\n")
+        content_length = None
+        for line in header_block.decode("utf-8").split("\r\n"):
+            name, _, value = line.partition(":")
+            if name.strip().lower() == "content-length":
+                content_length = int(value.strip())
+                break
+        body = rest[:content_length] if content_length is not None else rest
+        return body.decode("utf-8")
+
+    def dates(self) -> List[str]:
+        """Arşivde bulunan tüm tarihler (YYYYMMDD, sıralı)"""
+        with self._lock:
+            return sorted({entry["date"] for entry in self._index})
+
+    def iter_latest(self, dates: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        """Her tarih için en son kaydın indeks girdisini sırayla üret"""
+        for date_str in dates if dates is not None else self.dates():
+            entry = self.latest(date_str)
+            if entry:
+                yield entry
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import re
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+from records import League, Match
+
+try:
+    import lxml.html as lxml_html
+except ImportError:  # lxml kurulu değilse html5lib'e düşülür
+    lxml_html = None
+
+try:
+    # selectolax >= 1.0 yalnızca lexbor backend'ini içerir (Modest kaldırıldı)
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxParser
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser as SelectolaxParser
+    except ImportError:  # selectolax isteğe bağlıdır
+        SelectolaxParser = None
+
+
+# Tercih sırasına göre ayrıştırıcı backend'leri; html5lib uyumluluk için her zaman mevcut
+PARSER_BACKENDS = ("lxml", "selectolax", "html5lib")
+DEFAULT_PARSER_BACKEND = "lxml"
+
+LEAGUE_ROW_CLASS = "pttrnh ptttl"
+MATCH_ROW_CLASS = "pttr ptcnt"
+
+# Tahmin tablosunun açılış etiketi (sınıf listesinde tam kelime olarak pttable)
+_TABLE_OPEN_RE = re.compile(
+    r"<div\b[^>]*\bclass\s*=\s*[\"'][^\"']*(?<![\w-])pttable(?![\w-])", re.IGNORECASE
+)
+
+
+# Maç satırında okunan hücreler ("pttd" sınıfıyla birlikte) → alan adı
+_CELL_FIELDS = {
+    "ptgame": "game",
+    "ptprd": "prediction",
+    "ptlast5h": "home_form",
+    "ptlast5a": "away_form",
+    "ptodds": "odds",
+}
+# Tahmin metninin ilk kelimesi → 1X2 işareti ("Home 2-0" → "1")
+_TIP_1X2 = {"home": "1", "draw": "X", "away": "2"}
+
+
+def _class_list(value: Optional[str]) -> List[str]:
+    return value.split() if value else []
+
+
+def _cell_field(classes: List[str]) -> Optional[str]:
+    """Hücrenin sınıf listesinden okunacak alanı bul (okunmayacaksa None)"""
+    if "pttd" not in classes:
+        return None
+    for token in classes:
+        field = _CELL_FIELDS.get(token)
+        if field:
+            return field
+    return None
+
+
+def _parse_odds(text: str) -> Optional[float]:
+    try:
+        return float(text.strip())
+    except ValueError:
+        return None
+
+
+def _match_record(cells: Iterable[Tuple[str, Optional[str]]], date_str: str) -> Optional[Match]:
+    """
+    Satır hücrelerinden tek geçişte maç kaydı oluştur
+
+    Args:
+        cells: Satırdaki sırasıyla (alan, metin) çiftleri; tahmin hücresi için metin,
+            hücredeki ilk div'in (tahmin kutusu) metnidir
+        date_str (str): YYYYMMDD formatında tarih
+
+    Returns:
+        Optional[Match]: Maç kaydı; maç hücresi yoksa veya "Ev v Deplasman" değilse None
+    """
+    teams_text = prediction = home_form = away_form = None
+    odds = []
+    for field, text in cells:
+        if field == "odds":
+            odds.append(_parse_odds(text))
+        elif field == "game":
+            if teams_text is None:
+                teams_text = text
+        elif field == "prediction":
+            if prediction is None and text is not None:
+                prediction = text.strip()
+        elif field == "home_form":
+            home_form = "".join(text.split()) or None
+        elif field == "away_form":
+            away_form = "".join(text.split()) or None
+
+    if teams_text is None or " v " not in teams_text:
+        return None
+    # Tek satırdaki bozukluk tarihin (veya havuzdaki batch'in) tamamını düşürmesin: satır atlanır
+    home_team, _, away_team = teams_text.strip().partition(" v ")
+    if not home_team.strip() or not away_team.strip():
+        print(f"⚠️  Tarih {date_str}: takımlar ayrılamadı, satır atlanıyor: {teams_text.strip()!r}")
+        return None
+    if len(odds) != 3:
+        odds = [None, None, None]
+
+    return Match(
+        home_team.strip(),
+        away_team.strip(),
+        prediction,
+        date_str,
+        _TIP_1X2.get(prediction.split()[0].lower()) if prediction else None,
+        odds[0],
+        odds[1],
+        odds[2],
+        home_form,
+        away_form,
+    )
+
+
+def _bs4_cells(row) -> Iterator[Tuple[str, Optional[str]]]:
+    for cell in row.find_all(True, recursive=False):
+        field = _cell_field(cell.get("class", []))
+        if field == "prediction":
+            box = cell.find("div")
+            yield field, box.get_text() if box else None
+        elif field:
+            yield field, cell.get_text()
+
+
+def parse_html5lib(html_content: str, date_str: str) -> Optional[List[League]]:
+    """Saf Python html5lib + BeautifulSoup ile ayrıştır (en yavaş, tarayıcı uyumlu yol)"""
+    soup = BeautifulSoup(html_content, "html5lib")
+
+    table_div = soup.select_one("div.pttable")
+    if not table_div:
+        return None
+
+    leagues_data = []
+    current_league_data = None
+
+    for row in table_div.find_all(class_=[LEAGUE_ROW_CLASS, MATCH_ROW_CLASS]):
+        classes = row.get("class", [])
+        if "pttrnh" in classes and "ptttl" in classes:
+            league_header = row.find("h2")
+            if league_header:
+                current_league_data = League(league_header.get_text().strip())
+                leagues_data.append(current_league_data)
+
+        elif current_league_data:
+            match_data = _match_record(_bs4_cells(row), date_str)
+            if match_data:
+                current_league_data.matches.append(match_data)
+
+    return leagues_data
+
+
+def _lxml_cells(row) -> Iterator[Tuple[str, Optional[str]]]:
+    for cell in row.iterchildren(tag="*"):
+        field = _cell_field(_class_list(cell.get("class")))
+        if field == "prediction":
+            box = cell.find(".//div")
+            yield field, box.text_content() if box is not None else None
+        elif field:
+            yield field, cell.text_content()
+
+
+def parse_lxml(html_content: str, date_str: str) -> Optional[List[League]]:
+    """libxml2 tabanlı lxml ağacı ile ayrıştır"""
+    root = lxml_html.document_fromstring(html_content)
+
+    tables = root.xpath("//div[contains(concat(' ', normalize-space(@class), ' '), ' pttable ')]")
+    if not tables:
+        return None
+
+    leagues_data = []
+    current_league_data = None
+
+    # bs4'teki find_all(class_=[...]) ile aynı: sınıf özniteliği tam olarak bu değerlerden biri
+    for row in tables[0].iter("*"):
+        row_class = row.get("class")
+        if not row_class or "ptt" not in row_class:
+            continue
+        row_class = " ".join(row_class.split())
+        if row_class == LEAGUE_ROW_CLASS:
+            league_header = row.find(".//h2")
+            if league_header is not None:
+                current_league_data = League(league_header.text_content().strip())
+                leagues_data.append(current_league_data)
+
+        elif row_class == MATCH_ROW_CLASS and current_league_data:
+            match_data = _match_record(_lxml_cells(row), date_str)
+            if match_data:
+                current_league_data.matches.append(match_data)
+
+    return leagues_data
+
+
+def _selectolax_cells(row) -> Iterator[Tuple[str, Optional[str]]]:
+    for cell in row.iter():
+        field = _cell_field(_class_list(cell.attributes.get("class")))
+        if field == "prediction":
+            # İlk alt div; lexbor'da css_first düğümün kendisini de eşler, o yüzden traverse
+            descendants = cell.traverse()
+            next(descendants, None)
+            box = next((node for node in descendants if node.tag == "div"), None)
+            yield field, box.text() if box is not None else None
+        elif field:
+            yield field, cell.text()
+
+
+def parse_selectolax(html_content: str, date_str: str) -> Optional[List[League]]:
+    """selectolax (lexbor veya eski sürümlerde Modest, C) ile ayrıştır"""
+    tree = SelectolaxParser(html_content)
+
+    table_div = tree.css_first("div.pttable")
+    if table_div is None:
+        return None
+
+    leagues_data = []
+    current_league_data = None
+
+    for row in table_div.css("[class]"):
+        row_class = " ".join(_class_list(row.attributes.get("class")))
+        if row_class == LEAGUE_ROW_CLASS:
+            league_header = row.css_first("h2")
+            if league_header is not None:
+                current_league_data = League(league_header.text().strip())
+                leagues_data.append(current_league_data)
+
+        elif row_class == MATCH_ROW_CLASS and current_league_data:
+            match_data = _match_record(_selectolax_cells(row), date_str)
+            if match_data:
+                current_league_data.matches.append(match_data)
+
+    return leagues_data
+
+
+_PARSERS: Dict[str, Callable[[str, str], Optional[List[League]]]] = {
+    "lxml": parse_lxml,
+    "selectolax": parse_selectolax,
+    "html5lib": parse_html5lib,
+}
+
+
+def available_backends() -> List[str]:
+    """Bu ortamda kullanılabilen backend'ler (tercih sırasıyla)"""
+    installed = {
+        "lxml": lxml_html is not None,
+        "selectolax": SelectolaxParser is not None,
+        "html5lib": True,
+    }
+    return [name for name in PARSER_BACKENDS if installed[name]]
+
+
+def resolve_backend(name: Optional[str]) -> str:
+    """
+    İstenen backend'i doğrula; kurulu değilse html5lib'e düş.
+
+    Raises:
+        ValueError: Bilinmeyen backend adı
+    """
+    name = name or DEFAULT_PARSER_BACKEND
+    if name not in PARSER_BACKENDS:
+        raise ValueError(f"Geçersiz parser backend: {name} (seçenekler: {', '.join(PARSER_BACKENDS)})")
+    if name not in available_backends():
+        print(f"⚠️  {name} kurulu değil, html5lib parser backend'i kullanılıyor")
+        return "html5lib"
+    return name
+
+
+def slice_prediction_table(html_content: str) -> Optional[str]:
+    """
+    Sayfadan yalnızca ilk div.pttable bloğunu (açılış etiketinden eşleşen kapanışa kadar) kes.
+
+    Menü, reklam, takvim ve footer gibi tablo dışı kısımlar için ağaç kurulmaz. Kazanç
+    sınırlıdır: debug/page.html'de blok sayfanın ~%73'ü (130002/177470 karakter); html5lib
+    süresi ölçümden ölçüme değişiyor (aynı ile ~%20-30 daha kısa arası), lxml'de fark yok.
+    Ölçmek için: ``python check_parsers.py``. Kesim, ``<div`` / ``</div`` etiketleri
+    sayılarak (derinlik taraması) yapılır; predictz etiketleri küçük harf kullanır.
+
+    Returns:
+        Optional[str]: Tablo HTML'i; işaret yoksa veya tablo kapanmıyorsa None
+    """
+    opening = _TABLE_OPEN_RE.search(html_content)
+    if not opening:
+        return None
+
+    # Etiket başına regex eşleşmesi yerine kapanışlardan bölüp açılışları C düzeyinde say:
+    # her parça bir "</div" ile biter, derinlik 0'a indiği parça tablonun sonudur
+    depth = 0
+    offset = opening.start()
+    for chunk in html_content[opening.start():].split("</div"):
+        depth += chunk.count("<div") - 1
+        offset += len(chunk)
+        if depth <= 0:
+            end = html_content.find(">", offset)
+            return html_content[opening.start():end + 1] if end != -1 else None
+        offset += len("</div")
+    return None
+
+
+def parse_leagues(
+    html_content: str,
+    date_str: str,
+    backend: str = DEFAULT_PARSER_BACKEND,
+    restricted: bool = True,
+) -> Optional[List[League]]:
+    """
+    Tahmin sayfasından lig ve maç verilerini çıkar
+
+    Args:
+        html_content (str): HTML içeriği
+        date_str (str): YYYYMMDD formatında tarih
+        backend (str): PARSER_BACKENDS içinden ayrıştırıcı
+        restricted (bool): Ağacı yalnızca div.pttable için kur (bkz. slice_prediction_table);
+            tablo işareti bulunamazsa uyarı verip tam sayfa ayrıştırılır
+
+    Returns:
+        Optional[List[League]]: Lig listesi; maç tablosu yoksa None
+    """
+    if restricted:
+        table_html = slice_prediction_table(html_content)
+        if table_html is not None:
+            return _PARSERS[backend](table_html, date_str)
+        print(f"⚠️  Tarih {date_str}: div.pttable işareti bulunamadı, tam sayfa ayrıştırılıyor")
+    return _PARSERS[backend](html_content, date_str)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import gzip
+import hashlib
+import os
+import threading
+from typing import Dict, Any, Optional
+
+import requests
+
+import json_codec
+
+
+class HttpCache:
+    """
+    Koşullu GET (ETag / Last-Modified) için disk önbelleği.
+
+    Her URL için doğrulayıcılar (validators) ``index.json`` içinde, sayfa gövdesi ise
+    gzip'li ayrı bir dosyada tutulur. Yeni yanıtlar önce "bekleyen" olarak işaretlenir;
+    ``commit()`` çağrılana kadar sonraki isteklerde doğrulayıcı olarak gönderilmez.
+    Böylece upload başarısız olursa bir sonraki çalışma 304 alıp veriyi kaybetmez.
+    """
+
+    INDEX_FILE = "index.json"
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        if not os.path.exists(self.cache_dir):
+            os.makedirs(self.cache_dir)
+
+        self.index_path = os.path.join(self.cache_dir, self.INDEX_FILE)
+        self._lock = threading.Lock()
+        self.entries: Dict[str, Dict[str, Any]] = self._load_index()
+        self._pending: Dict[str, Dict[str, Any]] = {}
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        if not os.path.exists(self.index_path):
+            return {}
+        try:
+            return json_codec.load_file(self.index_path)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  HTTP önbellek indeksi okunamadı, sıfırlanıyor: {e}")
+            return {}
+
+    def _body_path(self, body_file: str) -> str:
+        return os.path.join(self.cache_dir, body_file)
+
+    def validators(self, url: str) -> Dict[str, str]:
+        """URL için koşullu istek başlıklarını döndür (kayıt yoksa boş)"""
+        with self._lock:
+            entry = self.entries.get(url)
+        if not entry or not os.path.exists(self._body_path(entry["body_file"])):
+            return {}
+
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def get_body(self, url: str) -> Optional[str]:
+        """Önbellekteki (commit edilmiş) gövdeyi döndür"""
+        with self._lock:
+            entry = self.entries.get(url)
+        if not entry:
+            return None
+        try:
+            with gzip.open(self._body_path(entry["body_file"]), "rt", encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def store(self, url: str, response: requests.Response) -> None:
+        """200 yanıtını gövdesiyle birlikte bekleyen kayıt olarak sakla"""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            # Sunucu doğrulayıcı göndermiyorsa koşullu GET mümkün değil
+            return
+
+        body = response.text
+        body_hash = hashlib.sha1(body.encode("utf-8")).hexdigest()
+        url_hash = hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
+        body_file = f"{url_hash}-{body_hash[:16]}.html.gz"
+
+        body_path = self._body_path(body_file)
+        if not os.path.exists(body_path):
+            with gzip.open(body_path, "wt", encoding="utf-8") as f:
+                f.write(body)
+
+        with self._lock:
+            self._pending[url] = {
+                "etag": etag,
+                "last_modified": last_modified,
+                "body_file": body_file,
+            }
+
+    def invalidate(self, url: str) -> None:
+        """URL kaydını tamamen unut (bir sonraki istek koşulsuz gider)"""
+        with self._lock:
+            self._pending.pop(url, None)
+            self.entries.pop(url, None)
+
+    def commit(self) -> None:
+        """Bekleyen kayıtları kalıcı hale getir ve eski gövde dosyalarını temizle"""
+        with self._lock:
+            stale_files = []
+            for url, entry in self._pending.items():
+                previous = self.entries.get(url)
+                if previous and previous["body_file"] != entry["body_file"]:
+                    stale_files.append(previous["body_file"])
+                self.entries[url] = entry
+            self._pending = {}
+
+            json_codec.dump_file(self.index_path, self.entries)
+
+        for body_file in stale_files:
+            try:
+                os.remove(self._body_path(body_file))
+            except OSError:
+                pass
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import datetime
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+
+from rate_limiter import AdaptiveRateLimiter
+
+
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+# Bu durum kodlarında istek geri çekilme (backoff) ile tekrar denenir
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Sunucunun "yavaşla" dediği durum kodları (hız sınırlayıcıya throttle olarak bildirilir)
+THROTTLE_STATUSES = (429, 503)
+
+
+class HttpTransport:
+    """
+    Scraper ve debug araçlarının ortak kullandığı HTTP katmanı.
+
+    - Tek bir havuzlu (pooled) ``requests.Session`` ile keep-alive
+    - Ayarlanabilir connect/read timeout'ları
+    - gzip/deflate (kuruluysa brotli/zstd) sıkıştırılmış transfer
+    - Üstel geri çekilme + jitter ile tekrar deneme
+    - İsteğe bağlı AdaptiveRateLimiter ile sunucu geri bildirimine göre hız ayarı
+    - Çalışma başına ağ üzerindeki byte ve bağlantı yeniden kullanım istatistikleri
+    """
+
+    def __init__(
+        self,
+        headers: Optional[Dict[str, str]] = None,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 20.0,
+        max_retries: int = 3,
+        backoff_base: float = 1.0,
+        backoff_max: float = 30.0,
+        pool_size: int = 8,
+        rate_limiter: Optional[AdaptiveRateLimiter] = None,
+    ):
+        self.rate_limiter = rate_limiter
+        self.timeout = (float(connect_timeout), float(read_timeout))
+        self.max_retries = max(0, int(max_retries))
+        self.backoff_base = max(0.0, float(backoff_base))
+        self.backoff_max = max(0.0, float(backoff_max))
+
+        self.session = requests.Session()
+        # Tekrar denemeyi kendimiz yapıyoruz (jitter ve istatistik için), adapter denemesin
+        self._adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", self._adapter)
+        self.session.mount("http://", self._adapter)
+        self.session.headers.update({
+            "User-Agent": DEFAULT_USER_AGENT,
+            "Accept-Encoding": ACCEPT_ENCODING,
+            "Connection": "keep-alive",
+        })
+        if headers:
+            self.session.headers.update(headers)
+
+        self._stats_lock = threading.Lock()
+        self._counters = self._empty_counters()
+        self._connections_baseline = 0
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], rate_limiter: Optional[AdaptiveRateLimiter] = None) -> "HttpTransport":
+        """automation_config.json içindeki "http" bölümünden oluştur"""
+        return cls(
+            rate_limiter=rate_limiter,
+            connect_timeout=config.get("connect_timeout_seconds", 5.0),
+            read_timeout=config.get("read_timeout_seconds", 20.0),
+            max_retries=config.get("max_retries", 3),
+            backoff_base=config.get("backoff_base_seconds", 1.0),
+            backoff_max=config.get("backoff_max_seconds", 30.0),
+            pool_size=config.get("pool_size", 8),
+        )
+
+    @staticmethod
+    def _empty_counters() -> Dict[str, int]:
+        return {
+            "requests": 0,
+            "retries": 0,
+            "bytes_on_wire": 0,
+            "bytes_decoded": 0,
+        }
+
+    def _connections_opened_total(self) -> int:
+        """Havuzların şimdiye kadar açtığı (TCP+TLS el sıkışması yapılan) bağlantı sayısı"""
+        pools = self._adapter.poolmanager.pools
+        total = 0
+        for key in list(pools.keys()):
+            try:
+                total += pools[key].num_connections
+            except KeyError:
+                continue
+        return total
+
+    def begin_run(self) -> None:
+        """Çalışma başına istatistikleri sıfırla (bağlantı havuzu korunur)"""
+        with self._stats_lock:
+            self._counters = self._empty_counters()
+            self._connections_baseline = self._connections_opened_total()
+        if self.rate_limiter:
+            self.rate_limiter.reset_counters()
+
+    def stats(self) -> Dict[str, Any]:
+        """Son begin_run() çağrısından bu yana transfer istatistikleri"""
+        with self._stats_lock:
+            counters = dict(self._counters)
+
+        opened = self._connections_opened_total() - self._connections_baseline
+        counters["connections_opened"] = opened
+        counters["connections_reused"] = max(0, counters["requests"] - opened)
+        if counters["bytes_decoded"]:
+            counters["compression_ratio"] = round(counters["bytes_on_wire"] / counters["bytes_decoded"], 3)
+        if self.rate_limiter:
+            counters["rate_limit"] = self.rate_limiter.snapshot()
+        return counters
+
+    def _record(self, **increments: int) -> None:
+        with self._stats_lock:
+            for key, value in increments.items():
+                self._counters[key] += value
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Üstel geri çekilme süresi (equal jitter: yarısı sabit, yarısı rastgele)"""
+        delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    @staticmethod
+    def retry_after_seconds(response: requests.Response) -> Optional[float]:
+        """Retry-After başlığını (saniye veya HTTP tarihi) saniye cinsinden oku"""
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=datetime.timezone.utc)
+        return max(0.0, (retry_at - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        """
+        GET isteği gönder; bağlantı hataları, timeout'lar ve RETRY_STATUSES için tekrar dene
+
+        Args:
+            url (str): İstenecek adres
+            headers (Optional[Dict[str, str]]): İsteğe özel ek başlıklar
+
+        Returns:
+            requests.Response: Son yanıt (durum kodu kontrolü çağırana aittir)
+
+        Raises:
+            requests.RequestException: Tüm denemeler bağlantı hatasıyla biterse
+        """
+        attempt = 0
+        while True:
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+            started = time.monotonic()
+            try:
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self._record(requests=1)
+                if self.rate_limiter:
+                    self.rate_limiter.on_error()
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.backoff_delay(attempt)
+                print(f"⚠️  {url} isteği başarısız ({e.__class__.__name__}), {delay:.1f} sn sonra tekrar denenecek...")
+            else:
+                latency = time.monotonic() - started
+                self._record(
+                    requests=1,
+                    bytes_on_wire=response.raw.tell() or len(response.content),
+                    bytes_decoded=len(response.content),
+                )
+                retry_after = self.retry_after_seconds(response)
+                self._report_to_limiter(response.status_code, latency, retry_after)
+
+                if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    return response
+                if retry_after is not None:
+                    retry_after = min(self.backoff_max, retry_after)
+                    # Sınırlayıcı varsa Retry-After süresini acquire() bekletir
+                    delay = 0.0 if self.rate_limiter else retry_after
+                    print(f"⚠️  {url} için HTTP {response.status_code}, Retry-After {retry_after:.1f} sn...")
+                else:
+                    delay = self.backoff_delay(attempt)
+                    print(f"⚠️  {url} için HTTP {response.status_code}, {delay:.1f} sn sonra tekrar denenecek...")
+
+            attempt += 1
+            self._record(retries=1)
+            if delay > 0:
+                time.sleep(delay)
+
+    def _report_to_limiter(self, status_code: int, latency: float, retry_after: Optional[float]) -> None:
+        """Yanıtı hız sınırlayıcıya geri bildirim olarak ilet"""
+        if not self.rate_limiter:
+            return
+        if status_code in THROTTLE_STATUSES:
+            self.rate_limiter.on_throttle(min(self.backoff_max, retry_after) if retry_after is not None else None)
+        elif status_code >= 500:
+            self.rate_limiter.on_error()
+        elif status_code < 400:
+            self.rate_limiter.on_success(latency)
+
+    def close(self) -> None:
+        """Bağlantı havuzunu kapat"""
+        self.session.close()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import os
+import threading
+from typing import Any, Callable, Optional
+
+try:
+    import orjson
+except ImportError:  # orjson yoksa standart json kullanılır
+    orjson = None
+
+from records import json_default
+
+
+# Kullanılan kodlayıcı: "orjson" veya "json"
+BACKEND = "orjson" if orjson is not None else "json"
+
+# Girintili (okunabilir) çıktı yalnızca hata ayıklama için: PREDICTZ_JSON_PRETTY=1 veya set_pretty(True)
+_pretty = os.environ.get("PREDICTZ_JSON_PRETTY", "").lower() in ("1", "true", "yes")
+
+
+def set_pretty(enabled: bool) -> None:
+    """Varsayılan çıktıyı girintili (debug) ya da kompakt yap"""
+    global _pretty
+    _pretty = enabled
+
+
+def dumps(obj: Any, pretty: Optional[bool] = None, sort_keys: bool = False,
+          default: Callable[[Any], Any] = json_default) -> bytes:
+    """
+    Nesneyi UTF-8 JSON byte'larına çevir (ensure_ascii=False karşılığı).
+
+    Match/League kayıtları ``default`` ile sözlüğe çevrilir; orjson'un yerel dataclass
+    desteği kullanılmaz ki iki backend aynı alan sırasını üretsin.
+
+    Args:
+        obj (Any): Serileştirilecek nesne
+        pretty (Optional[bool]): Girintili çıktı (None: modül ayarı)
+        sort_keys (bool): Anahtarları sırala
+        default (Callable): Bilinmeyen tipler için dönüştürücü
+    """
+    pretty = _pretty if pretty is None else pretty
+    if orjson is not None:
+        option = orjson.OPT_PASSTHROUGH_DATACLASS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=default, option=option)
+    return json.dumps(
+        obj,
+        ensure_ascii=False,
+        indent=2 if pretty else None,
+        separators=None if pretty else (",", ":"),
+        sort_keys=sort_keys,
+        default=default,
+    ).encode("utf-8")
+
+
+def loads(data: Any) -> Any:
+    """JSON byte'larını veya metnini çöz"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dump_file(path: str, obj: Any, pretty: Optional[bool] = None, sort_keys: bool = False) -> int:
+    """
+    Nesneyi geçici dosya + os.replace ile atomik olarak yaz
+
+    Returns:
+        int: Yazılan byte sayısı
+    """
+    payload = dumps(obj, pretty=pretty, sort_keys=sort_keys)
+    write_atomic(path, payload)
+    return len(payload)
+
+
+def write_atomic(path: str, payload: bytes) -> None:
+    """
+    Byte'ları geçici dosya + os.replace ile yaz (okuyucu yarım dosya görmez). Geçici dosya
+    adı süreç ve thread'e özeldir: aynı hedefe yazan iki yazıcı (ör. pipeline'ın kayıt
+    aşaması ve elle çalıştırılan scraper) birbirinin geçici dosyasını ezmez.
+    """
+    folder = os.path.dirname(path)
+    if folder and not os.path.exists(folder):
+        os.makedirs(folder, exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(payload)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def load_file(path: str) -> Any:
+    """JSON dosyasını oku ve çöz"""
+    with open(path, "rb") as f:
+        return loads(f.read())
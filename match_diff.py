@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import datetime
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+import json_codec
+from records import League, Match
+
+
+# Değişince maçın "tahmini değişti" sayıldığı alanlar
+PREDICTION_FIELDS = (
+    "prediction",
+    "tip_1x2",
+)
+# Oran ve form alanları sık oynar: değişimleri ayrı (odds_changed) sınıflanır
+ODDS_FIELDS = (
+    "odds_home",
+    "odds_draw",
+    "odds_away",
+    "home_form",
+    "away_form",
+)
+
+
+def _fingerprint(match: Match, fields) -> str:
+    payload = json.dumps([getattr(match, name) for name in fields], ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def prediction_fingerprint(match: Match) -> str:
+    """Maçın tahmin verisinin kısa özeti"""
+    return _fingerprint(match, PREDICTION_FIELDS)
+
+
+def snapshot_fingerprint(match: Match) -> str:
+    """Snapshot'ta tutulan özet: ``tahmin özeti:oran özeti``"""
+    return f"{prediction_fingerprint(match)}:{_fingerprint(match, ODDS_FIELDS)}"
+
+
+@dataclass
+class MatchDiff:
+    """Bir tarihin yeni çalışması ile son snapshot arasındaki fark"""
+    date_str: str
+    added: List[Match] = field(default_factory=list)
+    prediction_changed: List[Match] = field(default_factory=list)
+    odds_changed: List[Match] = field(default_factory=list)  # yalnızca oran/form alanları değişen maçlar
+    removed: List[str] = field(default_factory=list)  # artık sayfada olmayan match_id'ler
+    unchanged: List[str] = field(default_factory=list)
+
+    @property
+    def has_changes(self) -> bool:
+        """Yeni, tahmini değişen veya silinen maç var mı (yalnızca oran değişimi sayılmaz)"""
+        return bool(self.added or self.prediction_changed or self.removed)
+
+    @property
+    def changed_matches(self) -> List[Match]:
+        """Aşağı akışta işlenmesi gereken (yeni veya tahmini değişen) maçlar; oran değişimleri
+        isteyen çağıran tarafından ``odds_changed`` ile eklenir"""
+        return self.added + self.prediction_changed
+
+    def counts(self) -> Dict[str, int]:
+        return {
+            "added": len(self.added),
+            "removed": len(self.removed),
+            "prediction_changed": len(self.prediction_changed),
+            "odds_changed": len(self.odds_changed),
+            "unchanged": len(self.unchanged),
+        }
+
+
+class MatchSnapshot:
+    """
+    Tarih → {match_id: tahmin özeti} biçiminde son işlenen maç kümesi.
+
+    ContentManifest gibi yeni snapshot'lar önce bekleyen durumdadır ve ``commit()`` ile
+    kalıcı olur; upload başarısız olursa sonraki çalışma aynı farkı yeniden üretir.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self.dates: Dict[str, Dict[str, str]] = self._load()
+        self._pending: Dict[str, Dict[str, str]] = {}
+
+    def _load(self) -> Dict[str, Dict[str, str]]:
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            return json_codec.load_file(self.path)
+        except (OSError, ValueError) as e:
+            print(f"⚠️  Maç snapshot'ı okunamadı, tüm maçlar yeni sayılacak: {e}")
+            return {}
+
+    def diff(self, date_str: str, leagues_data: List[League]) -> MatchDiff:
+        """Tarihin yeni maçlarını son commit edilen snapshot ile karşılaştır"""
+        with self._lock:
+            previous = dict(self.dates.get(date_str, {}))
+
+        result = MatchDiff(date_str)
+        for league in leagues_data:
+            for match in league.matches:
+                old_fingerprint = previous.pop(match.match_id, None)
+                if old_fingerprint is None:
+                    result.added.append(match)
+                    continue
+                # Eski snapshot'larda (":" yok) tek özet tüm alanları kapsar: bir kez "değişen" sayılır
+                old_prediction, _, old_odds = old_fingerprint.partition(":")
+                prediction, _, odds = snapshot_fingerprint(match).partition(":")
+                if old_prediction != prediction or not old_odds:
+                    result.prediction_changed.append(match)
+                elif old_odds != odds:
+                    result.odds_changed.append(match)
+                else:
+                    result.unchanged.append(match.match_id)
+        result.removed = sorted(previous)
+        return result
+
+    def record(self, date_str: str, leagues_data: List[League]) -> None:
+        """Tarihin yeni maç kümesini bekleyen snapshot olarak ekle"""
+        snapshot = {
+            match.match_id: snapshot_fingerprint(match)
+            for league in leagues_data
+            for match in league.matches
+        }
+        with self._lock:
+            self._pending[date_str] = snapshot
+
+    def commit(self, keep_days: int = 30) -> None:
+        """Bekleyen snapshot'ları kalıcı yap; keep_days'den eski tarihleri at"""
+        cutoff = (datetime.datetime.now() - datetime.timedelta(days=keep_days)).strftime("%Y%m%d")
+        with self._lock:
+            self.dates.update(self._pending)
+            self._pending = {}
+            self.dates = {
+                date_str: matches for date_str, matches in self.dates.items()
+                if date_str >= cutoff
+            }
+
+            json_codec.dump_file(self.path, self.dates, sort_keys=True)
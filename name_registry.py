@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import hashlib
+import os
+import threading
+from typing import Dict, Any, List, Optional
+
+import json_codec
+from records import League
+
+
+NAME_KINDS = ("team", "league")
+
+
+def name_key(name: str) -> str:
+    """Eşleştirme anahtarı: boşluk ve büyük/küçük harf farkları aynı isim sayılır"""
+    return " ".join(name.split()).casefold()
+
+
+def make_match_id(match_date: str, league_name: str, home_team: str, away_team: str) -> str:
+    """
+    Maçın deterministik kimliği: tarih + lig + ev + deplasman (kanonik isimler, normalize).
+    Makineden ve ID atama sırasından bağımsızdır; aynı maç her çalışmada aynı ID'yi alır.
+    """
+    key = "|".join((match_date, name_key(league_name), name_key(home_team), name_key(away_team)))
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+class NameRegistry:
+    """
+    Takım ve lig adlarını kalıcı, değişmeyen tamsayı ID'lere eşleyen sözlük.
+
+    Her tür ("team", "league") için ``names`` listesi yalnızca eklenerek büyür; ID, ismin
+    listedeki sırasıdır (1'den başlar) ve bir kez verildikten sonra değişmez. ``keys``
+    normalize edilmiş isimden ID'ye eşlemedir ve yazım farkları için alias'ları da içerir.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._tables: Dict[str, Dict[str, Any]] = self._load()
+        self._dirty = False
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        tables = {kind: {"names": [], "keys": {}} for kind in NAME_KINDS}
+        if not os.path.exists(self.path):
+            return tables
+        try:
+            stored = json_codec.load_file(self.path)
+        except (OSError, ValueError) as e:
+            # ID'ler kalıcı kimliktir: bozuk dosyayı sessizce sıfırlamak yerine dur
+            raise RuntimeError(f"İsim sözlüğü okunamadı: {self.path} - {e}") from e
+        for kind in NAME_KINDS:
+            tables[kind].update(stored.get(kind, {}))
+        return tables
+
+    def intern(self, kind: str, name: str) -> int:
+        """İsmin (veya alias'ının) ID'sini döndür; ilk kez görülüyorsa yeni ID ver"""
+        key = name_key(name)
+        table = self._tables[kind]
+        with self._lock:
+            name_id = table["keys"].get(key)
+            if name_id is None:
+                table["names"].append(" ".join(name.split()))
+                name_id = len(table["names"])
+                table["keys"][key] = name_id
+                self._dirty = True
+        return name_id
+
+    def lookup(self, kind: str, name: str) -> Optional[int]:
+        """İsmin ID'si (kayıtlı değilse None, yeni ID verilmez)"""
+        with self._lock:
+            return self._tables[kind]["keys"].get(name_key(name))
+
+    def name(self, kind: str, name_id: int) -> str:
+        """ID'nin kanonik ismi"""
+        with self._lock:
+            return self._tables[kind]["names"][name_id - 1]
+
+    def names(self, kind: str) -> List[str]:
+        """Kanonik isimler (ID sırasıyla; ID = indeks + 1)"""
+        with self._lock:
+            return list(self._tables[kind]["names"])
+
+    def add_alias(self, kind: str, alias: str, canonical: str) -> int:
+        """
+        ``alias`` yazımını ``canonical`` ismin ID'sine bağla.
+
+        Alias daha önce ayrı bir ID almışsa o ID listede kalır (eski kayıtlar çözülebilsin)
+        ama bundan sonra alias kanonik ID'ye eşlenir.
+        """
+        canonical_id = self.intern(kind, canonical)
+        with self._lock:
+            self._tables[kind]["keys"][name_key(alias)] = canonical_id
+            self._dirty = True
+        return canonical_id
+
+    def aliases(self, kind: str) -> Dict[str, str]:
+        """Kanonik isimden farklı yazılan anahtarlar → kanonik isim"""
+        with self._lock:
+            table = self._tables[kind]
+            return {
+                key: table["names"][name_id - 1]
+                for key, name_id in table["keys"].items()
+                if key != name_key(table["names"][name_id - 1])
+            }
+
+    def annotate(self, leagues_data: List[League]) -> List[League]:
+        """Lig ve takım kayıtlarına ID'lerini, maçlara match_id'lerini yaz"""
+        for league in leagues_data:
+            league.league_id = self.intern("league", league.league_name)
+            league_name = self.name("league", league.league_id)
+            for match in league.matches:
+                match.home_id = self.intern("team", match.home_team)
+                match.away_id = self.intern("team", match.away_team)
+                match.match_id = make_match_id(
+                    match.match_date,
+                    league_name,
+                    self.name("team", match.home_id),
+                    self.name("team", match.away_id),
+                )
+        return leagues_data
+
+    def save(self) -> None:
+        """Değişiklik varsa sözlüğü atomik olarak yaz"""
+        with self._lock:
+            if not self._dirty:
+                return
+            json_codec.dump_file(self.path, self._tables)
+            self._dirty = False
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Takım/lig isim sözlüğü")
+    parser.add_argument("--path", default="data/name_registry.json", help="Sözlük dosyası")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = commands.add_parser("list", help="Kayıtlı isimleri ve ID'lerini listele")
+    list_parser.add_argument("kind", choices=NAME_KINDS)
+
+    alias_parser = commands.add_parser("alias", help="Yazım farkını kanonik isme bağla")
+    alias_parser.add_argument("kind", choices=NAME_KINDS)
+    alias_parser.add_argument("alias", help="Sayfada görülen farklı yazım")
+    alias_parser.add_argument("canonical", help="Kanonik isim")
+
+    args = parser.parse_args()
+    registry = NameRegistry(args.path)
+
+    if args.command == "list":
+        aliases_by_name: Dict[str, List[str]] = {}
+        for key, canonical in registry.aliases(args.kind).items():
+            aliases_by_name.setdefault(canonical, []).append(key)
+        for name_id, name in enumerate(registry.names(args.kind), 1):
+            extra = f"  (alias: {', '.join(aliases_by_name[name])})" if name in aliases_by_name else ""
+            print(f"{name_id:6d}  {name}{extra}")
+    else:
+        name_id = registry.add_alias(args.kind, args.alias, args.canonical)
+        registry.save()
+        print(f"✅ {args.alias} → {args.canonical} (ID {name_id})")
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import os
+import threading
+import time
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+import json_codec
+from records import League, Match
+
+
+# Satır türleri ("record" alanı)
+MATCH_RECORD = "match"        # tek maç: tarih + lig alanları + Match alanları
+DATE_END_RECORD = "date_end"  # tarihin tüm maçları yazıldı
+END_RECORD = "end"            # çalışma bitti, dosyaya başka satır eklenmeyecek
+
+
+class NdjsonWriter:
+    """
+    Maçları satır başına bir JSON kaydı (NDJSON) olarak, tarihler işlendikçe yazar.
+
+    Her tarihin maçlarından sonra ``date_end`` satırı gelir ve dosya flush edilir; böylece
+    dosyayı izleyen bir tüketici ilk tarihi, sonraki tarihler daha indirilirken işleyebilir.
+    ``close()`` dosyanın sonuna ``end`` satırını yazar (izleyen okuyucu orada durur).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        folder = os.path.dirname(path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        self._file = open(path, "wb")
+        self._lock = threading.Lock()
+        self.dates: List[str] = []
+        self.matches = 0
+
+    def write_date(self, date_key: str, leagues_data: List[League]) -> int:
+        """
+        Tarihin maçlarını yaz
+
+        Args:
+            date_key (str): YYYY-MM-DD tarih
+            leagues_data (List[League]): Tarihin ligleri
+
+        Returns:
+            int: Yazılan maç sayısı
+        """
+        lines = []
+        for league in leagues_data:
+            for match in league.matches:
+                record = {
+                    "record": MATCH_RECORD,
+                    "date": date_key,
+                    "league_name": league.league_name,
+                    "league_id": league.league_id,
+                }
+                record.update(match.to_dict())
+                lines.append(json_codec.dumps(record, pretty=False))
+        lines.append(json_codec.dumps({"record": DATE_END_RECORD, "date": date_key, "matches": len(lines)}, pretty=False))
+
+        with self._lock:
+            self._file.write(b"\n".join(lines) + b"\n")
+            self._file.flush()
+            self.dates.append(date_key)
+            self.matches += len(lines) - 1
+        return len(lines) - 1
+
+    def close(self, complete: bool = True) -> None:
+        """``end`` satırını yaz ve dosyayı kapat"""
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(json_codec.dumps({
+                "record": END_RECORD,
+                "dates": self.dates,
+                "matches": self.matches,
+                "complete": complete,
+            }, pretty=False) + b"\n")
+            self._file.close()
+
+
+def iter_records(path: str, follow: bool = False, poll_seconds: float = 0.2,
+                 timeout: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+    """
+    NDJSON dosyasındaki kayıtları sırayla üret (``end`` satırı dahil, orada durur).
+
+    Args:
+        path (str): NDJSON dosyası
+        follow (bool): Dosya sonunda durma; ``end`` satırı gelene kadar yeni satırları bekle
+        poll_seconds (float): İzleme modunda bekleme aralığı
+        timeout (Optional[float]): İzleme modunda yeni satır gelmeden beklenecek en uzun süre
+    """
+    while follow and not os.path.exists(path):
+        time.sleep(poll_seconds)
+
+    with open(path, "rb") as f:
+        waited = 0.0
+        pending = b""
+        while True:
+            line = f.readline()
+            if line.endswith(b"\n"):
+                waited = 0.0
+                line = pending + line
+                pending = b""
+                if not line.strip():
+                    continue
+                record = json_codec.loads(line)
+                yield record
+                if record.get("record") == END_RECORD:
+                    return
+                continue
+
+            # Yarım satır: yazan taraf henüz bitirmedi
+            pending += line
+            if not follow:
+                return
+            if timeout is not None and waited >= timeout:
+                raise TimeoutError(f"{path}: {timeout} saniyedir yeni satır yok")
+            time.sleep(poll_seconds)
+            waited += poll_seconds
+
+
+def iter_matches(path: str, follow: bool = False, **kwargs) -> Iterator[Tuple[str, str, Match]]:
+    """(tarih, lig adı, Match) üçlülerini tek tek üret; bellekte bir satırdan fazlası tutulmaz"""
+    for record in iter_records(path, follow, **kwargs):
+        if record.get("record") == MATCH_RECORD:
+            yield record["date"], record["league_name"], Match.from_dict(record)
+
+
+def iter_dates(path: str, follow: bool = False, **kwargs) -> Iterator[Tuple[str, List[League]]]:
+    """
+    Tarih tamamlandıkça (``date_end``) o tarihin lig listesini üret.
+    Bellekte yalnızca işlenen tarih tutulur; upload gibi tarih bazlı tüketiciler içindir.
+    """
+    leagues: Dict[str, League] = {}
+    for record in iter_records(path, follow, **kwargs):
+        kind = record.get("record")
+        if kind == MATCH_RECORD:
+            league = leagues.get(record["league_name"])
+            if league is None:
+                league = leagues[record["league_name"]] = League(record["league_name"], [], record.get("league_id"))
+            league.matches.append(Match.from_dict(record))
+        elif kind == DATE_END_RECORD:
+            yield record["date"], list(leagues.values())
+            leagues = {}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="NDJSON maç akışını oku")
+    parser.add_argument("path", help="predictz_stream_*.ndjson dosyası")
+    parser.add_argument("--follow", action="store_true", help="Yazılmakta olan dosyayı end satırına kadar izle")
+    args = parser.parse_args()
+
+    for date_key, leagues_data in iter_dates(args.path, follow=args.follow):
+        matches = sum(len(league.matches) for league in leagues_data)
+        print(f"✅ {date_key}: {matches} maç, {len(leagues_data)} lig")
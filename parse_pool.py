@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from html_parsers import DEFAULT_PARSER_BACKEND, parse_leagues, slice_prediction_table
+from records import League, Match, MATCH_FIELDS
+
+
+# Süreç sınırından geçen kompakt maç kaydının alan sırası: Match alanları, match_date hariç
+# (tarihin kendisidir, taşınmaz; geri çevirirken 4. sıraya eklenir)
+COMPACT_MATCH_FIELDS = tuple(name for name in MATCH_FIELDS if name != "match_date")
+
+CompactLeagues = Tuple[Tuple[str, Tuple[tuple, ...]], ...]
+
+
+def _parse_compact(date_str: str, html_content: str, backend: str, restricted: bool) -> Optional[CompactLeagues]:
+    """Worker süreci: sayfayı ayrıştır ve sonucu anahtarsız tuple'lar olarak döndür"""
+    leagues_data = parse_leagues(html_content, date_str, backend, restricted)
+    if leagues_data is None:
+        return None
+    return tuple(
+        (league.league_name, tuple(
+            tuple(getattr(match, name) for name in COMPACT_MATCH_FIELDS)
+            for match in league.matches
+        ))
+        for league in leagues_data
+    )
+
+
+def expand_compact(date_str: str, compact: CompactLeagues) -> List[League]:
+    """Kompakt sonucu parse_leagues çıktısıyla aynı League/Match kayıtlarına geri çevir"""
+    return [
+        League(league_name, [
+            Match(*values[:3], date_str, *values[3:])
+            for values in matches
+        ])
+        for league_name, matches in compact
+    ]
+
+
+class ParsePool:
+    """
+    Birden çok tarihin sayfasını süreç havuzunda (her çekirdekte bir worker) ayrıştırır.
+
+    Sayfalar mümkünse div.pttable bloğuna kesilerek gönderilir ve sonuçlar kompakt
+    tuple'lar olarak döner; böylece süreçler arası (pickle) trafik küçük kalır.
+    Havuz ilk çok sayfalı batch'te açılır ve close() çağrılana kadar yeniden kullanılır.
+    """
+
+    def __init__(self, backend: str = DEFAULT_PARSER_BACKEND, restricted: bool = True, workers: int = 0):
+        """
+        Args:
+            backend (str): html_parsers.PARSER_BACKENDS içinden ayrıştırıcı
+            restricted (bool): Yalnızca div.pttable bloğunu ayrıştır
+            workers (int): Worker sayısı (0: CPU sayısı)
+        """
+        self.backend = backend
+        self.restricted = restricted
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            return self._executor
+
+    def _prepare(self, html_content: str) -> Tuple[str, bool]:
+        """Gönderilecek HTML'i küçült: tablo kesilebildiyse worker tekrar kesmez"""
+        if self.restricted:
+            table_html = slice_prediction_table(html_content)
+            if table_html is not None:
+                return table_html, False
+        return html_content, self.restricted
+
+    def parse_batch(self, pages: List[Tuple[str, str]]) -> Dict[str, Optional[List[League]]]:
+        """
+        (tarih, HTML) çiftlerini paralel ayrıştır
+
+        Returns:
+            Dict[str, Optional[List[League]]]: Tarih → lig listesi (maç tablosu yoksa None)
+        """
+        if not pages:
+            return {}
+
+        date_list = [date_str for date_str, _ in pages]
+        prepared = [self._prepare(html_content) for _, html_content in pages]
+        html_list = [html_content for html_content, _ in prepared]
+        restricted_list = [restricted for _, restricted in prepared]
+        backend_list = [self.backend] * len(pages)
+
+        if self.workers == 1 or len(pages) == 1:
+            compact_results = map(_parse_compact, date_list, html_list, backend_list, restricted_list)
+        else:
+            chunksize = max(1, len(pages) // (self.workers * 4))
+            compact_results = self._get_executor().map(
+                _parse_compact, date_list, html_list, backend_list, restricted_list, chunksize=chunksize
+            )
+
+        return {
+            date_str: expand_compact(date_str, compact) if compact is not None else None
+            for date_str, compact in zip(date_list, compact_results)
+        }
+
+    def parse_one(self, date_str: str, html_content: str) -> Optional[List[League]]:
+        """
+        Tek sayfayı havuzda ayrıştır. Aşamalı hatta sayfalar geldikçe çağrılır; birden çok
+        thread aynı anda çağırabilir (her biri bir worker sürecini kullanır).
+
+        Returns:
+            Optional[List[League]]: Lig listesi (maç tablosu yoksa None)
+        """
+        html_content, restricted = self._prepare(html_content)
+        if self.workers == 1:
+            compact = _parse_compact(date_str, html_content, self.backend, restricted)
+        else:
+            compact = self._get_executor().submit(
+                _parse_compact, date_str, html_content, self.backend, restricted
+            ).result()
+        return expand_compact(date_str, compact) if compact is not None else None
+
+    def close(self) -> None:
+        """Worker süreçlerini kapat"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
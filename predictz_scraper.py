@@ -2,13 +2,32 @@
 # -*- coding: utf-8 -*-
 
 import requests
-from bs4 import BeautifulSoup
-import json
 import datetime
 import time
 import os
 import random
-from typing import List, Dict, Any, Optional
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, List, Dict, Any, Optional, Tuple
+
+from http_transport import HttpTransport
+from rate_limiter import AdaptiveRateLimiter
+from http_cache import HttpCache
+from content_manifest import ContentManifest, html_hash, data_hash
+from html_archive import HtmlArchive
+from html_parsers import PARSER_BACKENDS, DEFAULT_PARSER_BACKEND, parse_leagues, resolve_backend
+from parse_pool import ParsePool
+from records import League
+import json_codec
+from combined_store import write_combined_manifest, write_leagues
+from name_registry import NameRegistry
+from ndjson_stream import NdjsonWriter
+from history_store import HistoryStore
+from match_diff import MatchDiff, MatchSnapshot
+from stage_pipeline import Stage, StagePipeline
+
+
+FETCH_MODES = ("concurrent", "serial", "pipeline")
 
 
 class PredictzScraper:
@@ -17,17 +36,122 @@ class PredictzScraper:
     Yarından başlayarak 4 günlük veri çeker.
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        fetch_mode: str = "concurrent",
+        max_workers: int = 4,
+        transport: Optional[HttpTransport] = None,
+        use_http_cache: bool = True,
+        use_content_manifest: bool = True,
+        auto_commit: bool = True,
+        archive_pages: bool = True,
+        replay: bool = False,
+        replay_dates: Optional[List[str]] = None,
+        parser_backend: str = DEFAULT_PARSER_BACKEND,
+        restricted_parse: bool = True,
+        parse_workers: int = 1,
+        parse_pool: Optional[ParsePool] = None,
+        stream_output: bool = False,
+        use_history_store: bool = True,
+        pipeline_queue_size: int = 2,
+        inline_combined: bool = False,
+    ):
+        """
+        Args:
+            fetch_mode (str): "concurrent" (paralel indirme), "serial" (eski sıralı yol) veya
+                "pipeline" (paralel indirme; ayrıştırma, kayıt ve run(on_date=...) aşamaları
+                sınırlı kuyruklarla aynı anda çalışır, bkz. stage_pipeline)
+            max_workers (int): Paralel modda aynı anda açık olabilecek en fazla istek
+            transport (Optional[HttpTransport]): Paylaşılan HTTP katmanı (yoksa AdaptiveRateLimiter'lı
+                yenisi oluşturulur; istek hızı her iki modda da bu sınırlayıcıyla ayarlanır)
+            use_http_cache (bool): Koşullu GET (ETag / Last-Modified) önbelleğini kullan
+            use_content_manifest (bool): HTML / veri özeti aynı kalan tarihleri atla
+            auto_commit (bool): Çalışma sonunda önbellek ve manifest durumunu kalıcı yap. Upload'u
+                kendisi yöneten çağıranlar False verip commit_state()'i upload sonrası çağırır.
+            archive_pages (bool): İndirilen her sayfayı data/archive altındaki arşive ekle
+            replay (bool): Ağa çıkmadan sayfaları arşivden oku ve tüm hattı yeniden çalıştır
+            replay_dates (Optional[List[str]]): Replay'de işlenecek tarihler (yoksa arşivdeki tümü)
+            parser_backend (str): HTML ayrıştırıcı: "lxml" (hızlı, varsayılan), "selectolax" (kuruluysa)
+                veya "html5lib" (saf Python, uyumluluk yolu). Kurulu olmayan backend html5lib'e düşer.
+            restricted_parse (bool): Ağacı yalnızca div.pttable bloğu için kur (işaret bulunamazsa
+                uyarı verilip tam sayfa ayrıştırılır)
+            parse_workers (int): 1: sayfalar geldikçe bu süreçte ayrıştırılır; 0 (CPU sayısı) veya
+                daha fazlası: sayfalar toplanıp süreç havuzunda birlikte ayrıştırılır (replay/backfill)
+            parse_pool (Optional[ParsePool]): Paylaşılan süreç havuzu (verilirse parse_workers yok sayılır)
+            stream_output (bool): Her run() çağrısında maçları tarihler işlendikçe
+                data/predictz_stream_*.ndjson dosyasına satır satır da yaz (ndjson_stream ile okunur)
+            use_history_store (bool): Yeni verisi olan tarihleri her run() sonunda tek transaction'da
+                data/history.sqlite geçmiş deposuna da yaz
+            pipeline_queue_size (int): Pipeline modunda aşamalar arası kuyrukların kapasitesi
+            inline_combined (bool): Combined dosyayı manifest yerine eski biçimde (``data_by_date``
+                satır içinde) yaz; combined dosyayı doğrudan okuyan eski okuyucular için
+        """
+        if fetch_mode not in FETCH_MODES:
+            raise ValueError(f"Geçersiz fetch_mode: {fetch_mode} (seçenekler: {', '.join(FETCH_MODES)})")
+
+        self.fetch_mode = fetch_mode
+        self.max_workers = max(1, int(max_workers))
+        self.parser_backend = resolve_backend(parser_backend)
+        self.restricted_parse = restricted_parse
+        if parse_pool is None and parse_workers != 1:
+            parse_pool = ParsePool(self.parser_backend, restricted_parse, parse_workers)
+        self.parse_pool = parse_pool
+
         self.base_url = "https://www.predictz.com/predictions/"
-        self.headers = {
-            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        }
+        self.transport = transport or HttpTransport(
+            pool_size=self.max_workers,
+            rate_limiter=AdaptiveRateLimiter(),
+        )
         self.output_folder = "data"
         if not os.path.exists(self.output_folder):
             os.makedirs(self.output_folder)
         
-        # 4 günlük tarih listesi oluştur (yarın + sonraki 3 gün)
-        self.dates_to_scrape = self.generate_date_list()
+        self.replay = replay
+        self.auto_commit = auto_commit
+        self.archive = HtmlArchive(os.path.join(self.output_folder, "archive")) if (archive_pages or replay) else None
+        
+        # Replay tüm tarihleri yeniden ayrıştırmak içindir: önbellek ve manifest kısa devresi kapalı
+        self.http_cache = (
+            HttpCache(os.path.join(self.output_folder, "http_cache"))
+            if use_http_cache and not replay else None
+        )
+        self.content_manifest = (
+            ContentManifest(os.path.join(self.output_folder, "content_manifest.json"))
+            if use_content_manifest and not replay else None
+        )
+        # Son işlenen maç kümesine göre eklenen / silinen / tahmini değişen maçlar
+        self.match_snapshot = (
+            MatchSnapshot(os.path.join(self.output_folder, "match_snapshot.json"))
+            if not replay else None
+        )
+        # Lig/takım adı → kalıcı ID sözlüğü (ID'ler kimliktir, upload sonucundan bağımsız kaydedilir)
+        self.names = NameRegistry(os.path.join(self.output_folder, "name_registry.json"))
+        # Geçmiş sorguları için SQLite deposu (upload sonucundan bağımsız, çekilen veriyi tutar)
+        self.history = HistoryStore(os.path.join(self.output_folder, "history.sqlite")) if use_history_store else None
+        # Sunucunun 304 döndürdüğü (önbellekten sunulan) tarihler
+        self.not_modified_dates = set()
+        
+        # run() çağrıları arasında korunan sonuçlar (YYYY-MM-DD anahtarlı): tekrar denemede
+        # yalnızca eksik tarihler çekilir
+        self.completed_data: Dict[str, List[League]] = {}
+        self.match_diffs: Dict[str, MatchDiff] = {}
+        self.unchanged_dates = set()
+        self.combined_file: Optional[str] = None
+        self.stream_output = stream_output
+        self.stream: Optional[NdjsonWriter] = None
+        # Bu run() çağrısında geçmiş deposuna yazılacak tarihler
+        self.history_pending: Dict[str, List[League]] = {}
+        self.pipeline_queue_size = max(1, int(pipeline_queue_size))
+        self.inline_combined = inline_combined
+        self.pipeline_stats: Optional[Dict[str, Any]] = None
+        
+        if replay:
+            self.fetch_mode = "replay"
+            self.dates_to_scrape = sorted(replay_dates) if replay_dates else self.archive.dates()
+            print(f"Replay: arşivden işlenecek tarihler ({len(self.dates_to_scrape)}): {', '.join(self.dates_to_scrape)}")
+        else:
+            # 4 günlük tarih listesi oluştur (yarın + sonraki 3 gün)
+            self.dates_to_scrape = self.generate_date_list()
     
     def generate_date_list(self) -> List[str]:
         """
@@ -59,14 +183,30 @@ class PredictzScraper:
         
         try:
             print(f"Tarih {date_str} için veri çekiliyor: {url}")
-            response = requests.get(url, headers=self.headers)
+            conditional_headers = self.http_cache.validators(url) if self.http_cache else None
+            response = self.transport.get(url, headers=conditional_headers)
+            
+            if response.status_code == 304 and self.http_cache:
+                cached_body = self.http_cache.get_body(url)
+                if cached_body is not None:
+                    print(f"♻️  Tarih {date_str} sayfası değişmemiş (304), önbellekten kullanılıyor")
+                    self.not_modified_dates.add(date_str)
+                    return cached_body
+                # Önbellek gövdesi kayıp: kaydı unut ve koşulsuz tekrar iste
+                self.http_cache.invalidate(url)
+                response = self.transport.get(url)
+            
             response.raise_for_status()
+            if self.http_cache:
+                self.http_cache.store(url, response)
+            if self.archive:
+                self.archive.append(date_str, url, response.text)
             return response.text
         except requests.RequestException as e:
             print(f"Hata: {date_str} tarihli sayfa içeriği alınamadı - {e}")
             return None
     
-    def parse_page(self, html_content: str, date_str: str) -> List[Dict[str, Any]]:
+    def parse_page(self, html_content: str, date_str: str) -> List[League]:
         """
         HTML içeriğini ayrıştır ve maç tahminlerini çıkar
         
@@ -75,87 +215,93 @@ class PredictzScraper:
             date_str (str): YYYYMMDD formatında tarih
         
         Returns:
-            List[Dict[str, Any]]: Lig ve maç verilerini içeren liste
+            List[League]: Lig ve maç kayıtları (sözlük gibi de okunabilir)
         """
-        soup = BeautifulSoup(html_content, "html5lib")
-        leagues_data = []
-        
-        # Ana tabloyu bul
-        table_div = soup.select_one("div.pttable")
-        if not table_div:
+        leagues_data = parse_leagues(html_content, date_str, self.parser_backend, self.restricted_parse)
+        if leagues_data is None:
             print(f"Tarih {date_str} için maç tablosu bulunamadı!")
             return []
+        return leagues_data
+    
+    def date_file_path(self, date_str: str) -> str:
+        """YYYYMMDD tarihi için tarih bazlı JSON dosyasının yolu"""
+        formatted_date = f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:8]}"
+        return f"{self.output_folder}/predictz_data_{formatted_date}.json"
+    
+    def short_circuit_reason(self, date_str: str, page_digest: str) -> Optional[str]:
+        """
+        Tarih ayrıştırılmadan atlanabilir mi? Önceki çıktısı duruyorsa ve sayfa
+        304 ile geldiyse ya da normalize HTML özeti değişmediyse atlanır.
         
-        # Lig başlıkları ve maç satırlarını bul
-        rows = table_div.find_all(class_=["pttrnh ptttl", "pttr ptcnt"])
-        
-        current_league = None
-        current_league_data = None
-        
-        for row in rows:
-            # Lig başlığı satırı
-            if "pttrnh" in row.get("class", []) and "ptttl" in row.get("class", []):
-                league_header = row.select_one("h2")
-                if league_header:
-                    current_league = league_header.text.strip()
-                    current_league_data = {
-                        "league_name": current_league,
-                        "matches": []
-                    }
-                    leagues_data.append(current_league_data)
-            
-            # Maç satırı
-            elif "pttr" in row.get("class", []) and "ptcnt" in row.get("class", []) and current_league_data:
-                # Takımları içeren hücreyi bul
-                game_cell = row.select_one("div.pttd.ptgame")
-                if not game_cell or " v " not in game_cell.text:
-                    continue
-                
-                # Takımları ayır
-                teams_text = game_cell.text.strip()
-                home_team, away_team = teams_text.split(" v ")
-                
-                # Tahmin kutusunu bul
-                prediction_cell = row.select_one("div.pttd.ptprd div")
-                score_prediction = prediction_cell.text.strip() if prediction_cell else None
-                
-                match_data = {
-                    "home_team": home_team.strip(),
-                    "away_team": away_team.strip(),
-                    "prediction": score_prediction,
-                    "match_date": date_str
-                }
-                
-                current_league_data["matches"].append(match_data)
+        Returns:
+            Optional[str]: "http_304", "html_hash" veya None (işlenmeli)
+        """
+        if not os.path.exists(self.date_file_path(date_str)):
+            return None
+        if date_str in self.not_modified_dates:
+            return "http_304"
+        if self.content_manifest and self.content_manifest.html_unchanged(date_str, page_digest):
+            return "html_hash"
+        return None
+    
+    def check_page(self, date_str: str, html_content: Optional[str]) -> Tuple[str, Optional[str]]:
+        """
+        İndirilen sayfanın özeti ve (varsa) ayrıştırılmadan atlanma nedeni
         
+        Returns:
+            Tuple[str, Optional[str]]: (HTML özeti, short_circuit_reason sonucu)
+        """
+        if not html_content:
+            return "", None
+        page_digest = html_hash(html_content)
+        return page_digest, self.short_circuit_reason(date_str, page_digest)
+    
+    def skip_unchanged(self, date_str: str, reason: str, short_circuit: Dict[str, int]) -> None:
+        """Önceki çalışmada işlenmiş sayfa: ayrıştırma, kayıt ve upload gereksiz"""
+        print(f"⏭️  Tarih {date_str} değişmedi ({reason}), ayrıştırma ve kayıt atlanıyor.")
+        short_circuit[reason] += 1
+        self.unchanged_dates.add(f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:8]}")
+    
+    def pool_result(self, date_str: str, leagues_data: Optional[List[League]]) -> List[League]:
+        """Süreç havuzunun sonucu: maç tablosu bulunamadıysa (None) boş liste"""
+        if leagues_data is None:
+            print(f"Tarih {date_str} için maç tablosu bulunamadı!")
+            return []
         return leagues_data
     
-    def save_to_json(self, data: List[Dict[str, Any]], date_str: str) -> str:
+    def commit_state(self) -> None:
+        """Önbellek ve manifest durumunu kalıcı yap (upload başarılı olduktan sonra çağrılmalı)"""
+        if self.http_cache:
+            self.http_cache.commit()
+        if self.content_manifest:
+            self.content_manifest.commit()
+        if self.match_snapshot:
+            self.match_snapshot.commit()
+    
+    def save_to_json(self, data: List[League], date_str: str) -> str:
         """
-        Veriyi JSON formatında kaydet
+        Veriyi kompakt JSON olarak tek seferde kaydet. Bu dosya tarihin tek kopyasıdır;
+        combined dosya ve upload aynı dosyayı kullanır.
         
         Args:
-            data (List[Dict[str, Any]]): Kaydedilecek veri
+            data (List[League]): Kaydedilecek veri
             date_str (str): YYYYMMDD formatında tarih
         
         Returns:
             str: Kaydedilen dosya adı
         """
-        # YYYYMMDD formatını YYYY-MM-DD formatına çevir
-        formatted_date = f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:8]}"
-        filename = f"{self.output_folder}/predictz_data_{formatted_date}.json"
-        
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=4)
-        
+        filename = self.date_file_path(date_str)
+        write_leagues(filename, data)
         return filename
     
     def save_combined_data(self, all_data: Dict[str, Any]) -> str:
         """
-        Tüm günlerin verilerini tek bir dosyada birleştir
+        Tüm günlerin tarih dosyalarını gösteren combined manifest dosyasını yaz
+        (veri tekrar yazılmaz; okumak için combined_store.load_combined kullanılır).
+        inline_combined açıksa veri eski biçimdeki gibi combined dosyaya da yazılır.
         
         Args:
-            all_data (Dict[str, Any]): Tüm günlerin verileri
+            all_data (Dict[str, Any]): scrape_timestamp, dates_scraped ve data_by_date
         
         Returns:
             str: Kaydedilen dosya adı
@@ -172,91 +318,493 @@ class PredictzScraper:
         
         filename = f"{self.output_folder}/predictz_combined_{formatted_date}.json"
         
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(all_data, f, ensure_ascii=False, indent=4)
+        write_combined_manifest(
+            filename,
+            all_data.get("scrape_timestamp"),
+            dates_scraped,
+            {
+                date_key: self.date_file_path(date_key.replace("-", ""))
+                for date_key in all_data.get("data_by_date", {})
+            },
+            all_data.get("data_by_date") if self.inline_combined else None,
+        )
         
         return filename
     
-    def run(self) -> Dict[str, Any]:
-        """
-        Scraper'ı çalıştır - 4 günlük veri çeker ve çalışma özetini döndürür
+    def parse_pages(self, pages: List[Tuple[str, str]]) -> Dict[str, List[League]]:
         """
-        print("Predictz.com yarından başlayarak 4 günlük verilerini çekme işlemi başlatılıyor...")
+        Birden çok sayfayı süreç havuzunda ayrıştır (parse_page'in toplu karşılığı)
+        
+        Args:
+            pages (List[Tuple[str, str]]): (YYYYMMDD tarih, HTML içeriği) çiftleri
         
-        all_data = {
-            "scrape_timestamp": datetime.datetime.now().isoformat(),
-            "dates_scraped": self.dates_to_scrape,
-            "data_by_date": {}
+        Returns:
+            Dict[str, List[League]]: Tarih → lig ve maç kayıtları
+        """
+        print(f"🧩 {len(pages)} sayfa süreç havuzunda ayrıştırılıyor ({self.parse_pool.workers} worker)")
+        return {
+            date_str: self.pool_result(date_str, leagues_data)
+            for date_str, leagues_data in self.parse_pool.parse_batch(pages).items()
         }
+    
+    def parse_content(
+        self,
+        date_str: str,
+        html_content: Optional[str],
+        parsed_data: Optional[List[League]] = None,
+    ) -> Optional[List[League]]:
+        """
+        İndirilen sayfayı ayrıştır
+        
+        Args:
+            date_str (str): YYYYMMDD formatında tarih
+            html_content (Optional[str]): HTML içeriği
+            parsed_data (Optional[List[League]]): Süreç havuzunda önceden ayrıştırılmış veri
+        
+        Returns:
+            Optional[List[League]]: Ayrıştırılmış veri veya None
+        """
+        if not html_content:
+            print(f"Tarih {date_str} için veri çekilemedi, atlanıyor.")
+            return None
+        
+        if parsed_data is None:
+            parsed_data = self.parse_page(html_content, date_str)
+        
+        if not parsed_data:
+            print(f"Tarih {date_str} için ayrıştırılabilir veri bulunamadı.")
+            return None
+        
+        # Lig ve takım adlarına kalıcı ID'lerini ekle
+        return self.names.annotate(parsed_data)
+    
+    def accept_parsed(
+        self,
+        date_str: str,
+        page_digest: str,
+        parsed_data: Optional[List[League]],
+        short_circuit: Dict[str, int],
+    ) -> bool:
+        """
+        Ayrıştırılmış tarihi kaydet; verisi değişmemişse kaydı atla
+        
+        Returns:
+            bool: Tarih yeni veriyle kaydedildiyse True
+        """
+        if not parsed_data:
+            return False
+        
+        formatted_date_key = f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:8]}"
+        leagues_digest = data_hash(parsed_data)
+        if (self.content_manifest
+                and self.content_manifest.data_unchanged(date_str, leagues_digest)
+                and os.path.exists(self.date_file_path(date_str))):
+            # Sayfa değişti ama tahminler aynı: kayıt ve upload gereksiz
+            print(f"⏭️  Tarih {date_str} verisi değişmedi (data_hash), kayıt atlanıyor.")
+            self.content_manifest.record(date_str, page_digest, leagues_digest)
+            short_circuit["data_hash"] += 1
+            self.unchanged_dates.add(formatted_date_key)
+            return False
+        
+        if self.match_snapshot:
+            diff = self.match_snapshot.diff(date_str, parsed_data)
+            self.match_snapshot.record(date_str, parsed_data)
+            self.match_diffs[formatted_date_key] = diff
+            counts = diff.counts()
+            print(f"🔀 Tarih {date_str}: {counts['added']} yeni, {counts['prediction_changed']} değişen, "
+                  f"{counts['odds_changed']} oranı değişen, "
+                  f"{counts['removed']} silinen, {counts['unchanged']} aynı maç")
         
-        total_matches = 0
-        successful_dates = 0
-        total_leagues = 0
-        combined_file = None
+        self.store_date(date_str, parsed_data)
+        if self.stream:
+            self.stream.write_date(formatted_date_key, parsed_data)
+        if self.content_manifest:
+            self.content_manifest.record(date_str, page_digest, leagues_digest)
         
-        for date_str in self.dates_to_scrape:
+        # Toplam veriyi birleştir (tarihi YYYY-MM-DD formatına çevir)
+        self.completed_data[formatted_date_key] = parsed_data
+        if self.history:
+            self.history_pending[formatted_date_key] = parsed_data
+        return True
+    
+    def store_date(self, date_str: str, parsed_data: List[League]) -> str:
+        """Tarihin verisini ayrı dosyaya kaydet ve özet yazdır"""
+        saved_file = self.save_to_json(parsed_data, date_str)
+        
+        date_matches = sum(len(league['matches']) for league in parsed_data)
+        print(f"✅ Tarih {date_str}: {date_matches} maç, {len(parsed_data)} lig")
+        print(f"📁 Kaydedildi: {saved_file}")
+        
+        return saved_file
+    
+    def iter_pages_serial(self, dates: List[str]):
+        """
+        Tarihleri tek tek indir (eski yol) - istek aralığını transport'un hız sınırlayıcısı belirler
+        
+        Yields:
+            Tuple[str, Optional[str]]: (tarih, HTML içeriği)
+        """
+        for date_str in dates:
             print(f"\n{'='*50}")
             print(f"Tarih: {date_str} işleniyor...")
             print(f"{'='*50}")
             
-            html_content = self.get_page_content(date_str)
-            
-            if not html_content:
-                print(f"Tarih {date_str} için veri çekilemedi, atlanıyor.")
-                continue
-            
-            parsed_data = self.parse_page(html_content, date_str)
-            
-            if not parsed_data:
-                print(f"Tarih {date_str} için ayrıştırılabilir veri bulunamadı.")
+            yield date_str, self.get_page_content(date_str)
+    
+    def iter_pages_replay(self, dates: List[str]):
+        """
+        Sayfaları ağa çıkmadan arşivden oku (her tarihin en son kaydı)
+        
+        Yields:
+            Tuple[str, Optional[str]]: (tarih, HTML içeriği)
+        """
+        for date_str in dates:
+            entry = self.archive.latest(date_str)
+            if not entry:
+                print(f"Replay: {date_str} tarihi arşivde yok.")
+                yield date_str, None
                 continue
+            print(f"Replay: {date_str} ({entry['fetched_at']} tarihli kayıt)")
+            yield date_str, self.archive.read(entry)
+    
+    def iter_pages_concurrent(self, dates: List[str]):
+        """
+        Tarihleri paralel indir; her sayfa iner inmez (tamamlanma sırasıyla) döndürülür
+        
+        Yields:
+            Tuple[str, Optional[str]]: (tarih, HTML içeriği)
+        """
+        workers = min(self.max_workers, len(dates)) or 1
+        print(f"⚡ {len(dates)} tarih paralel indiriliyor ({workers} worker)")
+        
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="predictz-fetch") as executor:
+            futures = {
+                executor.submit(self.get_page_content, date_str): date_str
+                for date_str in dates
+            }
+            for future in as_completed(futures):
+                date_str = futures[future]
+                try:
+                    html_content = future.result()
+                except Exception as e:
+                    print(f"Hata: {date_str} tarihli sayfa indirilirken beklenmeyen hata - {e}")
+                    html_content = None
+                yield date_str, html_content
+    
+    def run_pipeline(
+        self,
+        dates: List[str],
+        short_circuit: Dict[str, int],
+        on_date: Optional[Callable[[str, List[League], str], Any]] = None,
+        sink_workers: int = 1,
+    ) -> int:
+        """
+        Tarihleri indirme → ayrıştırma → kayıt (→ on_date) aşamalarından geçir. Her tarih bir
+        aşamayı bitirir bitirmez sonrakine geçer: ilk sayfa kaydedilip upload edilirken diğerleri
+        hâlâ inebilir. Aşama gecikmeleri self.pipeline_stats'a yazılır.
+        
+        Returns:
+            int: Yeni veriyle kaydedilen tarih sayısı
+        """
+        saved = []
+        
+        def fetch_stage(date_str: str):
+            return date_str, self.get_page_content(date_str)
+        
+        def parse_stage(page: Tuple[str, Optional[str]]):
+            date_str, html_content = page
+            page_digest, reason = self.check_page(date_str, html_content)
+            if reason:
+                # Sayaçlar kayıt aşamasında (tek thread) güncellenir
+                return date_str, page_digest, None, reason
+            parsed_data = None
+            if self.parse_pool and html_content:
+                parsed_data = self.pool_result(date_str, self.parse_pool.parse_one(date_str, html_content))
+            return date_str, page_digest, self.parse_content(date_str, html_content, parsed_data), None
+        
+        def persist_stage(parsed: Tuple[str, str, Optional[List[League]], Optional[str]]):
+            date_str, page_digest, parsed_data, reason = parsed
+            if reason:
+                self.skip_unchanged(date_str, reason, short_circuit)
+                return None
+            if not self.accept_parsed(date_str, page_digest, parsed_data, short_circuit):
+                return None
+            saved.append(date_str)
+            return f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:8]}", parsed_data, self.date_file_path(date_str)
+        
+        fetch_workers = min(self.max_workers, len(dates)) or 1
+        stages = [
+            Stage("fetch", fetch_stage, fetch_workers, self.pipeline_queue_size),
+            Stage("parse", parse_stage, self.parse_pool.workers if self.parse_pool else 1, self.pipeline_queue_size),
+            Stage("persist", persist_stage, 1, self.pipeline_queue_size),
+        ]
+        if on_date:
+            stages.append(Stage("upload", lambda saved_date: on_date(*saved_date), sink_workers, self.pipeline_queue_size))
+        print(f"⛓️  {len(dates)} tarih aşamalı hatta işleniyor: "
+              + " → ".join(f"{stage.name} ({stage.workers})" for stage in stages))
+        
+        pipeline = StagePipeline(stages)
+        pipeline.run(dates)
+        self.pipeline_stats = pipeline.summary()
+        return len(saved)
+    
+    def missing_dates(self) -> List[str]:
+        """Henüz ne yeni verisi ne de "değişmedi" sonucu olan tarihler (YYYYMMDD)"""
+        done = set(self.completed_data) | self.unchanged_dates
+        return [
+            date_str for date_str in self.dates_to_scrape
+            if f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:8]}" not in done
+        ]
+    
+    def run(
+        self,
+        dates: Optional[List[str]] = None,
+        on_date: Optional[Callable[[str, List[League], str], Any]] = None,
+        sink_workers: int = 1,
+    ) -> Dict[str, Any]:
+        """
+        Scraper'ı çalıştır ve çalışma özetini döndür.
+        
+        Aynı nesne üzerinde tekrar çağrıldığında önceki çağrılarda başarılı olan tarihler
+        korunur; yalnızca verilen (varsayılan: eksik kalan) tarihler yeniden çekilir.
+        Özet ve birleştirilmiş dosya her zaman tüm başarılı tarihleri kapsar.
+        
+        Args:
+            dates (Optional[List[str]]): Çekilecek YYYYMMDD tarihleri (varsayılan: eksik tarihler)
+            on_date (Optional[Callable]): Yeni veriyle kaydedilen her tarih için
+                on_date(YYYY-MM-DD, ligler, tarih dosyası) çağrılır (ör. tarih bazında upload).
+                Pipeline modunda ayrı bir aşamadır ve sonraki tarihlerin indirilmesiyle çakışır;
+                diğer modlarda kayıttan hemen sonra sırayla çağrılır.
+            sink_workers (int): Pipeline modunda on_date aşamasının paralel thread sayısı
+        """
+        dates = sorted(dates) if dates is not None else self.missing_dates()
+        
+        if self.replay:
+            print(f"Predictz arşivinden {len(dates)} tarih ağa çıkmadan yeniden işleniyor...")
+        elif len(dates) == len(self.dates_to_scrape):
+            print("Predictz.com yarından başlayarak 4 günlük verilerini çekme işlemi başlatılıyor...")
+        else:
+            print(f"Predictz.com eksik kalan {len(dates)} tarih yeniden çekiliyor: {', '.join(dates)}")
+        print(f"İndirme modu: {self.fetch_mode}, parser: {self.parser_backend}")
+        
+        started = time.perf_counter()
+        self.transport.begin_run()
+        
+        new_dates = 0
+        short_circuit = {"http_304": 0, "html_hash": 0, "data_hash": 0}
+        parse_batch = []
+        self.pipeline_stats = None
+        
+        if self.replay:
+            pages = self.iter_pages_replay(dates)
+        elif self.fetch_mode == "concurrent":
+            pages = self.iter_pages_concurrent(dates)
+        elif self.fetch_mode == "serial":
+            pages = self.iter_pages_serial(dates)
+        else:
+            # Pipeline: indirme run_pipeline içindeki aşamada yapılır
+            pages = ()
+        
+        stream_file = None
+        if self.stream_output:
+            stream_file = f"{self.output_folder}/predictz_stream_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.ndjson"
+            self.stream = NdjsonWriter(stream_file)
+        
+        def accept(date_str: str, page_digest: str, parsed_data: Optional[List[League]]) -> bool:
+            if not self.accept_parsed(date_str, page_digest, parsed_data, short_circuit):
+                return False
+            if on_date:
+                formatted_date_key = f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:8]}"
+                try:
+                    on_date(formatted_date_key, parsed_data, self.date_file_path(date_str))
+                except Exception as e:
+                    print(f"⚠️  Tarih {date_str} sonrası işlem başarısız: {e}")
+            return True
+        
+        stream_complete = False
+        try:
+            if self.fetch_mode == "pipeline":
+                new_dates += self.run_pipeline(dates, short_circuit, on_date, sink_workers)
             
-            # Her tarihin verisini ayrı dosyaya kaydet
-            saved_file = self.save_to_json(parsed_data, date_str)
-            
-            # Toplam veriyi birleştir (tarihi YYYY-MM-DD formatına çevir)
-            formatted_date_key = f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:8]}"
-            all_data["data_by_date"][formatted_date_key] = parsed_data
-            
-            date_matches = sum(len(league['matches']) for league in parsed_data)
-            total_matches += date_matches
-            successful_dates += 1
-            total_leagues += len(parsed_data)
+            for date_str, html_content in pages:
+                page_digest, reason = self.check_page(date_str, html_content)
+                if reason:
+                    self.skip_unchanged(date_str, reason, short_circuit)
+                    continue
             
-            print(f"✅ Tarih {date_str}: {date_matches} maç, {len(parsed_data)} lig")
-            print(f"📁 Kaydedildi: {saved_file}")
+                if self.parse_pool and html_content:
+                    # Sayfalar toplanır, indirme bitince süreç havuzunda birlikte ayrıştırılır
+                    parse_batch.append((date_str, html_content, page_digest))
+                    continue
             
-            # Bir sonraki tarihe geçmeden önce sıradaki tarihle devam edip etmeyeceğini kontrol et
-            next_index = self.dates_to_scrape.index(date_str) + 1
-            if next_index < len(self.dates_to_scrape):
-                next_date = self.dates_to_scrape[next_index]
-                print(f"⏳ Sonraki tarih ({next_date}) için 10 saniye bekleniyor...")
-                for i in range(10, 0, -1):
-                    print(f"\r⏱️  {i} saniye kaldı...", end="", flush=True)
-                    time.sleep(1)
-                print("\r✅ Bekleme tamamlandı!     ")
+                parsed_data = self.parse_content(date_str, html_content)
+                if accept(date_str, page_digest, parsed_data):
+                    new_dates += 1
+        
+            if parse_batch:
+                parsed_pages = self.parse_pages([(date_str, html_content) for date_str, html_content, _ in parse_batch])
+                for date_str, html_content, page_digest in parse_batch:
+                    parsed_data = self.parse_content(date_str, html_content, parsed_pages[date_str])
+                    if accept(date_str, page_digest, parsed_data):
+                        new_dates += 1
+        
+            stream_complete = True
+        finally:
+            if self.stream:
+                self.stream.close(complete=stream_complete)
+                self.stream = None
+        
+        self.names.save()
+        
+        history_matches = 0
+        if self.history and self.history_pending:
+            history_matches = self.history.store_dates(self.history_pending)
+            self.history.close()
+            print(f"🗄️  Geçmiş deposu: {len(self.history_pending)} tarih, {history_matches} maç yazıldı")
+            self.history_pending = {}
+        
+        # Paralel modda tamamlanma sırası karışık olabilir; tarih sırasına diz
+        data_by_date = dict(sorted(self.completed_data.items()))
+        unchanged_dates = sorted(self.unchanged_dates)
+        successful_dates = len(data_by_date)
+        total_matches = sum(len(league['matches']) for leagues in data_by_date.values() for league in leagues)
+        total_leagues = sum(len(leagues) for leagues in data_by_date.values())
+        missing_dates = self.missing_dates()
+        match_changes = {"added": 0, "removed": 0, "prediction_changed": 0, "odds_changed": 0, "unchanged": 0}
+        for diff in self.match_diffs.values():
+            for key, count in diff.counts().items():
+                match_changes[key] += count
+        
+        if new_dates > 0:
+            # Birleştirilmiş veriyi (önceki çağrılardaki tarihlerle birlikte) kaydet
+            self.combined_file = self.save_combined_data({
+                "scrape_timestamp": datetime.datetime.now().isoformat(),
+                "dates_scraped": self.dates_to_scrape,
+                "data_by_date": data_by_date,
+            })
+        combined_file = self.combined_file
+        
+        if self.auto_commit:
+            self.commit_state()
+        
+        wall_clock_seconds = round(time.perf_counter() - started, 3)
+        http_stats = self.transport.stats()
         
         if successful_dates > 0:
-            # Birleştirilmiş veriyi kaydet
-            combined_file = self.save_combined_data(all_data)
-            
             print(f"\n🎉 İşlem tamamlandı!")
             print(f"📊 Özet:")
             print(f"   • Başarılı tarihler: {successful_dates}/{len(self.dates_to_scrape)}")
             print(f"   • Toplam maç sayısı: {total_matches}")
             print(f"   • Birleştirilmiş dosya: {combined_file}")
+            print(f"   • Süre ({self.fetch_mode}): {wall_clock_seconds:.1f} saniye")
+            print(f"   • HTTP: {http_stats['requests']} istek, {http_stats['bytes_on_wire'] / 1024:.1f} KB, "
+                  f"{http_stats['connections_reused']} bağlantı yeniden kullanıldı")
+            if "rate_limit" in http_stats:
+                print(f"   • İstek hızı: {http_stats['rate_limit']['current_rate']:.2f} istek/sn")
+            if self.pipeline_stats:
+                print(f"   • Aşamalar (darboğaz: {self.pipeline_stats['bottleneck']}): " + ", ".join(
+                    f"{name} {stage['mean_ms']:.0f} ms/tarih"
+                    for name, stage in self.pipeline_stats["stages"].items()
+                ))
+        elif unchanged_dates:
+            print(f"\n♻️  Tüm çekilen tarihler değişmemiş ({len(unchanged_dates)} tarih), yeni dosya yazılmadı.")
         else:
             print("❌ Hiçbir tarih için veri çekilemedi.")
 
+        if unchanged_dates:
+            print(f"   • Kısa devre yapılan tarihler: {len(unchanged_dates)} "
+                  f"(304: {short_circuit['http_304']}, HTML: {short_circuit['html_hash']}, veri: {short_circuit['data_hash']})")
+        if self.match_diffs:
+            print(f"   • Maç değişiklikleri: {match_changes['added']} yeni, "
+                  f"{match_changes['prediction_changed']} değişen, {match_changes['odds_changed']} oranı değişen, "
+                  f"{match_changes['removed']} silinen")
+        if missing_dates:
+            print(f"   • Eksik tarihler: {', '.join(missing_dates)}")
+
         return {
             "combined_file": combined_file,
+            "stream_file": stream_file,
+            "history_matches": history_matches,
             "total_matches": total_matches,
             "successful_dates": successful_dates,
             "total_leagues": total_leagues,
-            "dates_with_data": list(all_data["data_by_date"].keys()),
+            "dates_with_data": list(data_by_date.keys()),
+            "unchanged_dates": unchanged_dates,
+            "short_circuited_dates": len(unchanged_dates),
+            "short_circuit": short_circuit,
+            "attempted_dates": dates,
+            "missing_dates": missing_dates,
+            "match_changes": match_changes,
+            "changed_dates": sorted(date for date, diff in self.match_diffs.items() if diff.has_changes),
+            "fetch_mode": self.fetch_mode,
+            "parser_backend": self.parser_backend,
+            "wall_clock_seconds": wall_clock_seconds,
+            "http": http_stats,
+            "rate_limit": http_stats.get("rate_limit"),
+            "pipeline": self.pipeline_stats,
         }
 
 
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Komut satırı argümanlarını ayrıştır"""
+    parser = argparse.ArgumentParser(description="Predictz.com tahmin scraper'ı")
+    parser.add_argument("--mode", choices=FETCH_MODES, default="concurrent",
+                        help="İndirme modu (varsayılan: concurrent)")
+    parser.add_argument("--workers", type=int, default=4,
+                        help="Paralel modda en fazla eşzamanlı istek")
+    parser.add_argument("--rate", type=float, default=1.0,
+                        help="Başlangıç istek hızı (istek/sn); sunucu yanıtlarına göre uyarlanır")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Koşullu GET önbelleğini kullanma")
+    parser.add_argument("--no-manifest", action="store_true",
+                        help="HTML/veri özeti aynı olan tarihleri de yeniden işle")
+    parser.add_argument("--no-archive", action="store_true",
+                        help="İndirilen sayfaları arşive ekleme")
+    parser.add_argument("--replay", action="store_true",
+                        help="Ağa çıkmadan arşivdeki sayfalarla tüm hattı çalıştır")
+    parser.add_argument("--dates", help="Replay'de işlenecek tarihler (virgülle ayrılmış YYYYMMDD)")
+    parser.add_argument("--parser", choices=PARSER_BACKENDS, default=DEFAULT_PARSER_BACKEND,
+                        help="HTML ayrıştırıcı backend'i (varsayılan: lxml)")
+    parser.add_argument("--full-parse", action="store_true",
+                        help="Sadece div.pttable yerine tüm sayfanın ağacını kur")
+    parser.add_argument("--parse-workers", type=int, default=1,
+                        help="Ayrıştırma süreç sayısı (1: süreç havuzu yok, 0: CPU sayısı)")
+    parser.add_argument("--ndjson", action="store_true",
+                        help="Maçları işlendikçe data/predictz_stream_*.ndjson dosyasına satır satır da yaz")
+    parser.add_argument("--no-history", action="store_true",
+                        help="Geçmiş deposuna (data/history.sqlite) yazma")
+    parser.add_argument("--queue-size", type=int, default=2,
+                        help="Pipeline modunda aşamalar arası kuyruk kapasitesi")
+    parser.add_argument("--inline-combined", action="store_true",
+                        help="Combined dosyayı eski biçimde (data_by_date satır içinde) yaz")
+    parser.add_argument("--pretty-json", action="store_true",
+                        help="JSON çıktılarını girintili yaz (hata ayıklama için; varsayılan kompakt)")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
-    scraper = PredictzScraper()
-    scraper.run() 
+    args = parse_args()
+    if args.pretty_json:
+        json_codec.set_pretty(True)
+    scraper = PredictzScraper(
+        fetch_mode=args.mode,
+        max_workers=args.workers,
+        transport=HttpTransport(
+            pool_size=args.workers,
+            rate_limiter=AdaptiveRateLimiter(initial_rate=args.rate),
+        ),
+        use_http_cache=not args.no_cache,
+        use_content_manifest=not args.no_manifest,
+        archive_pages=not args.no_archive,
+        replay=args.replay,
+        replay_dates=args.dates.split(",") if args.dates else None,
+        parser_backend=args.parser,
+        restricted_parse=not args.full_parse,
+        parse_workers=args.parse_workers,
+        stream_output=args.ndjson,
+        use_history_store=not args.no_history,
+        pipeline_queue_size=args.queue_size,
+        inline_combined=args.inline_combined,
+    )
+    scraper.run()
+
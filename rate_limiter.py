@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import threading
+import time
+from typing import Dict, Any, Optional
+
+
+class AdaptiveRateLimiter:
+    """
+    Sunucu geri bildirimine göre hızını ayarlayan AIMD (additive increase,
+    multiplicative decrease) istek sınırlayıcı.
+
+    - Hızlı 200/304 yanıtlarında hız ``increase_step`` kadar artar
+    - 429/503, timeout/bağlantı hataları ve gecikme sıçramalarında hız
+      ``decrease_factor`` ile çarpılarak düşer
+    - ``Retry-After`` süresi boyunca yeni istek başlatılmaz
+
+    Thread-safe: paralel indirmede tüm worker'lar aynı sınırlayıcıyı paylaşır.
+    """
+
+    def __init__(
+        self,
+        initial_rate: float = 1.0,
+        min_rate: float = 0.1,
+        max_rate: float = 4.0,
+        increase_step: float = 0.25,
+        decrease_factor: float = 0.5,
+        latency_spike_factor: float = 3.0,
+        max_latency_seconds: float = 8.0,
+    ):
+        """
+        Args:
+            initial_rate (float): Başlangıç hızı (istek/saniye)
+            min_rate (float): Alt sınır (istek/saniye)
+            max_rate (float): Üst sınır (istek/saniye)
+            increase_step (float): Hızlı yanıt başına eklenecek hız
+            decrease_factor (float): Yavaşlama sinyalinde hızın çarpılacağı oran (0-1)
+            latency_spike_factor (float): Ortalama gecikmenin kaç katı "sıçrama" sayılır
+            max_latency_seconds (float): Bu süreyi aşan her yanıt sıçrama sayılır
+        """
+        self.min_rate = max(0.001, float(min_rate))
+        self.max_rate = max(self.min_rate, float(max_rate))
+        self.rate = min(self.max_rate, max(self.min_rate, float(initial_rate)))
+        self.increase_step = float(increase_step)
+        self.decrease_factor = min(0.99, max(0.01, float(decrease_factor)))
+        self.latency_spike_factor = float(latency_spike_factor)
+        self.max_latency_seconds = float(max_latency_seconds)
+
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+        self._blocked_until = 0.0
+        self._ewma_latency: Optional[float] = None
+        self._counters = {"increases": 0, "decreases": 0, "throttled": 0, "waited_seconds": 0.0}
+        self._lowest_rate = self.rate
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "AdaptiveRateLimiter":
+        """automation_config.json içindeki "rate_limit" bölümünden oluştur"""
+        return cls(
+            initial_rate=config.get("initial_rate", 1.0),
+            min_rate=config.get("min_rate", 0.1),
+            max_rate=config.get("max_rate", 4.0),
+            increase_step=config.get("increase_step", 0.25),
+            decrease_factor=config.get("decrease_factor", 0.5),
+            latency_spike_factor=config.get("latency_spike_factor", 3.0),
+            max_latency_seconds=config.get("max_latency_seconds", 8.0),
+        )
+
+    def acquire(self) -> float:
+        """
+        Sıradaki istek için izin al; gerekirse bekle.
+
+        Returns:
+            float: Beklenen süre (saniye)
+        """
+        with self._lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_slot, self._blocked_until)
+            self._next_slot = start_at + 1.0 / self.rate
+
+        delay = start_at - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+            with self._lock:
+                self._counters["waited_seconds"] += delay
+            return delay
+        return 0.0
+
+    def _decrease(self) -> None:
+        self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+        self._lowest_rate = min(self._lowest_rate, self.rate)
+        self._counters["decreases"] += 1
+        # Zaten planlanmış sıradaki slotu yeni (daha yavaş) hıza göre geciktir
+        self._next_slot = max(self._next_slot, time.monotonic() + 1.0 / self.rate)
+
+    def on_success(self, latency: float) -> None:
+        """Başarılı yanıt: gecikme normalse hızı artır, sıçramaysa düşür"""
+        with self._lock:
+            spike = latency > self.max_latency_seconds or (
+                self._ewma_latency is not None
+                and latency > self._ewma_latency * self.latency_spike_factor
+            )
+            self._ewma_latency = latency if self._ewma_latency is None else (
+                0.8 * self._ewma_latency + 0.2 * latency
+            )
+            if spike:
+                self._decrease()
+            else:
+                self.rate = min(self.max_rate, self.rate + self.increase_step)
+                self._counters["increases"] += 1
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> None:
+        """429/503 yanıtı: hızı düşür, Retry-After varsa o süre boyunca bekle"""
+        with self._lock:
+            self._counters["throttled"] += 1
+            self._decrease()
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+
+    def on_error(self) -> None:
+        """Timeout / bağlantı hatası veya diğer 5xx: hızı düşür"""
+        with self._lock:
+            self._decrease()
+
+    def reset_counters(self) -> None:
+        """Çalışma başına sayaçları sıfırla (öğrenilen hız korunur)"""
+        with self._lock:
+            self._counters = {"increases": 0, "decreases": 0, "throttled": 0, "waited_seconds": 0.0}
+            self._lowest_rate = self.rate
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Çalışma özeti için sınırlayıcının güncel durumu"""
+        with self._lock:
+            return {
+                "current_rate": round(self.rate, 3),
+                "lowest_rate": round(self._lowest_rate, 3),
+                "ewma_latency_seconds": round(self._ewma_latency, 3) if self._ewma_latency is not None else None,
+                "increases": self._counters["increases"],
+                "decreases": self._counters["decreases"],
+                "throttled": self._counters["throttled"],
+                "waited_seconds": round(self._counters["waited_seconds"], 3),
+            }
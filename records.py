@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import json
+import sys
+from dataclasses import dataclass, field, fields
+from typing import Dict, Any, List, Optional
+
+
+@dataclass(slots=True)
+class Match:
+    """
+    Tek maç tahmini. ``__slots__`` ile tutulur (örnek başına __dict__ yok); takım adları
+    ``sys.intern`` ile paylaşılır, böylece haftalarca geçmiş tutan süreçte aynı isim
+    tekrar tekrar bellekte yer kaplamaz.
+
+    Eski sözlük erişimi (``match["home_team"]``, ``match.get(...)``) desteklenir.
+    """
+
+    home_team: str
+    away_team: str
+    prediction: Optional[str]
+    match_date: str
+    tip_1x2: Optional[str] = None
+    odds_home: Optional[float] = None
+    odds_draw: Optional[float] = None
+    odds_away: Optional[float] = None
+    home_form: Optional[str] = None
+    away_form: Optional[str] = None
+    # NameRegistry'deki kalıcı takım ID'leri (ayrıştırma sonrası atanır)
+    home_id: Optional[int] = None
+    away_id: Optional[int] = None
+    # Tarih + kanonik lig/ev/deplasman isimlerinden türetilen, çalışmalar arası sabit kimlik
+    match_id: Optional[str] = None
+
+    def __post_init__(self):
+        self.home_team = sys.intern(self.home_team)
+        self.away_team = sys.intern(self.away_team)
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in MATCH_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in MATCH_FIELDS else default
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in MATCH_FIELDS}
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Match":
+        return cls(**{name: data[name] for name in MATCH_FIELDS if name in data})
+
+
+@dataclass(slots=True)
+class League:
+    """Bir ligin başlığı ve o tarihteki maçları (sözlük erişimi de desteklenir)"""
+
+    league_name: str
+    matches: List[Match] = field(default_factory=list)
+    league_id: Optional[int] = None
+
+    def __post_init__(self):
+        self.league_name = sys.intern(self.league_name)
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in LEAGUE_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in LEAGUE_FIELDS else default
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "league_name": self.league_name,
+            "league_id": self.league_id,
+            "matches": [match.to_dict() for match in self.matches],
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "League":
+        return cls(
+            data["league_name"],
+            [Match.from_dict(match) for match in data.get("matches", [])],
+            data.get("league_id"),
+        )
+
+
+MATCH_FIELDS = tuple(f.name for f in fields(Match))
+LEAGUE_FIELDS = tuple(f.name for f in fields(League))
+
+
+def json_default(obj: Any) -> Any:
+    """json.dump(..., default=json_default): Match/League kayıtlarını sözlük olarak yaz"""
+    if isinstance(obj, (Match, League)):
+        return obj.to_dict()
+    raise TypeError(f"{type(obj).__name__} JSON'a çevrilemez")
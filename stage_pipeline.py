@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+# Aşama kuyruğunda "girdi bitti" işareti
+_END = object()
+
+
+@dataclass
+class StageStats:
+    """Bir aşamanın gecikme ölçümleri"""
+    name: str
+    workers: int
+    items: int = 0
+    dropped: int = 0  # fonksiyonu None döndürdü (ör. değişmemiş tarih), sonraki aşamaya geçmedi
+    errors: int = 0
+    busy_seconds: float = 0.0  # fonksiyonun içinde geçen toplam süre
+    max_seconds: float = 0.0
+    queue_wait_seconds: float = 0.0  # kalemlerin bu aşamanın giriş kuyruğunda beklediği toplam süre
+    blocked_seconds: float = 0.0  # sonraki aşamanın kuyruğu dolu olduğu için bekleme (backpressure)
+
+    def to_dict(self) -> Dict[str, Any]:
+        mean = self.busy_seconds / self.items if self.items else 0.0
+        return {
+            "workers": self.workers,
+            "items": self.items,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "mean_ms": round(mean * 1000, 1),
+            "max_ms": round(self.max_seconds * 1000, 1),
+            "busy_ms": round(self.busy_seconds * 1000, 1),
+            "queue_wait_ms": round(self.queue_wait_seconds * 1000, 1),
+            "blocked_ms": round(self.blocked_seconds * 1000, 1),
+        }
+
+
+class Stage:
+    """
+    Hattın bir aşaması: ``func(kalem)`` sonucu sonraki aşamaya geçer, None dönerse kalem
+    burada biter. Hata veren kalem loglanıp atlanır, hat durmaz.
+    """
+
+    def __init__(self, name: str, func: Callable[[Any], Any], workers: int = 1, queue_size: int = 2):
+        """
+        Args:
+            name (str): Aşama adı (istatistiklerde)
+            func (Callable[[Any], Any]): Kalemi işleyen fonksiyon
+            workers (int): Aşamanın paralel thread sayısı
+            queue_size (int): Aşamanın giriş kuyruğunun kapasitesi (dolunca önceki aşama bekler)
+        """
+        self.name = name
+        self.func = func
+        self.workers = max(1, workers)
+        self.queue_size = max(1, queue_size)
+
+
+class StagePipeline:
+    """
+    Sınırlı kuyruklarla birbirine bağlanan aşamalar (ör. indirme → ayrıştırma → kayıt → upload).
+
+    Her kalem bir aşamayı bitirir bitirmez sonrakine geçer; yavaş bir aşamanın kuyruğu
+    dolunca önceki aşama bekler, böylece bellekte sınırlı sayıda kalem tutulur. Toplam süre
+    aşamaların toplamına değil en yavaş aşamaya yaklaşır. Her aşama kendi gecikmesini ölçer.
+    """
+
+    def __init__(self, stages: List[Stage], logger: Optional[Callable[[str], None]] = None):
+        self.stages = stages
+        self.stats = [StageStats(stage.name, stage.workers) for stage in stages]
+        self.wall_seconds = 0.0
+        self._log = logger or print
+        self._stats_lock = threading.Lock()
+
+    def _worker(self, index: int, inbox: "queue.Queue", outbox: Optional["queue.Queue"],
+                remaining: List[int], results: List[Any]) -> None:
+        stage = self.stages[index]
+        stats = self.stats[index]
+        while True:
+            entry = inbox.get()
+            if entry is _END:
+                with self._stats_lock:
+                    remaining[index] -= 1
+                    last = remaining[index] == 0
+                if last and outbox is not None:
+                    # Aşamanın son thread'i: sonraki aşamanın her thread'ine bitti işareti
+                    for _ in range(self.stages[index + 1].workers):
+                        outbox.put(_END)
+                return
+
+            queued_at, item = entry
+            started = time.perf_counter()
+            try:
+                result = stage.func(item)
+                error = False
+            except Exception as e:
+                self._log(f"⚠️  {stage.name} aşamasında hata: {e}")
+                result = None
+                error = True
+            finished = time.perf_counter()
+
+            blocked = 0.0
+            if result is not None:
+                if outbox is not None:
+                    outbox.put((time.perf_counter(), result))
+                    blocked = time.perf_counter() - finished
+                else:
+                    with self._stats_lock:
+                        results.append(result)
+
+            with self._stats_lock:
+                stats.items += 1
+                stats.errors += error
+                stats.dropped += result is None and not error
+                stats.busy_seconds += finished - started
+                stats.max_seconds = max(stats.max_seconds, finished - started)
+                stats.queue_wait_seconds += started - queued_at
+                stats.blocked_seconds += blocked
+
+    def run(self, items: Iterable[Any]) -> List[Any]:
+        """
+        Kalemleri hattan geçir ve son aşamanın (None olmayan) sonuçlarını döndür
+
+        Returns:
+            List[Any]: Son aşamanın sonuçları (tamamlanma sırasıyla)
+        """
+        started = time.perf_counter()
+        queues = [queue.Queue(maxsize=stage.queue_size) for stage in self.stages]
+        remaining = [stage.workers for stage in self.stages]
+        results: List[Any] = []
+
+        threads = []
+        for index, stage in enumerate(self.stages):
+            outbox = queues[index + 1] if index + 1 < len(queues) else None
+            for number in range(stage.workers):
+                thread = threading.Thread(
+                    target=self._worker,
+                    args=(index, queues[index], outbox, remaining, results),
+                    name=f"pipeline-{stage.name}-{number}",
+                    daemon=True,
+                )
+                thread.start()
+                threads.append(thread)
+
+        # Besleme de sınırlı kuyruğa yapılır: ilk aşama yetişemezse kaynak bekler
+        try:
+            for item in items:
+                queues[0].put((time.perf_counter(), item))
+        finally:
+            for _ in range(self.stages[0].workers):
+                queues[0].put(_END)
+            for thread in threads:
+                thread.join()
+            self.wall_seconds = time.perf_counter() - started
+        return results
+
+    def summary(self) -> Dict[str, Any]:
+        """Aşama bazında gecikmeler, toplam süre ve darboğaz aşaması"""
+        stages = {stats.name: stats.to_dict() for stats in self.stats}
+        # Darboğaz: thread başına en çok meşgul kalan aşama
+        bottleneck = max(self.stats, key=lambda stats: stats.busy_seconds / stats.workers, default=None)
+        return {
+            "wall_ms": round(self.wall_seconds * 1000, 1),
+            "stage_busy_sum_ms": round(sum(stats.busy_seconds for stats in self.stats) * 1000, 1),
+            "bottleneck": bottleneck.name if bottleneck else None,
+            "stages": stages,
+        }
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import datetime
+
+from match_diff import MatchSnapshot, prediction_fingerprint
+from records import League, Match
+
+
+DATE = datetime.date.today().strftime("%Y%m%d")
+
+
+def match(match_id: str, prediction: str = "2-1", tip_1x2: str = "1", odds_home: float = 1.8,
+          home_form: str = "WWDLW") -> Match:
+    return Match(f"H{match_id}", f"A{match_id}", prediction, DATE, tip_1x2=tip_1x2, odds_home=odds_home,
+                 home_form=home_form, match_id=match_id)
+
+
+def leagues(*matches: Match) -> list:
+    return [League("Test League", list(matches), 1)]
+
+
+def test_classification(tmp_path) -> None:
+    snapshot = MatchSnapshot(str(tmp_path / "upload_ack.json"))
+    snapshot.record(DATE, leagues(match("same"), match("pred"), match("tip"), match("odds"), match("form"), match("gone")))
+    snapshot.commit()
+
+    diff = snapshot.diff(DATE, leagues(
+        match("same"),
+        match("pred", prediction="1-1"),
+        match("tip", tip_1x2="X"),
+        match("odds", odds_home=2.05),
+        match("form", home_form="WWDLL"),
+        match("new"),
+    ))
+
+    assert [m.match_id for m in diff.added] == ["new"]
+    assert [m.match_id for m in diff.prediction_changed] == ["pred", "tip"]
+    assert [m.match_id for m in diff.odds_changed] == ["odds", "form"]
+    assert diff.removed == ["gone"]
+    assert diff.unchanged == ["same"]
+    assert diff.counts() == {"added": 1, "removed": 1, "prediction_changed": 2, "odds_changed": 2, "unchanged": 1}
+    assert [m.match_id for m in diff.changed_matches] == ["new", "pred", "tip"]
+    assert diff.has_changes
+
+
+def test_odds_only_change_is_not_a_change(tmp_path) -> None:
+    snapshot = MatchSnapshot(str(tmp_path / "upload_ack.json"))
+    snapshot.record(DATE, leagues(match("m1")))
+    snapshot.commit()
+
+    diff = snapshot.diff(DATE, leagues(match("m1", odds_home=3.0)))
+    assert not diff.has_changes
+    assert [m.match_id for m in diff.odds_changed] == ["m1"]
+
+
+def test_pending_snapshot_needs_commit(tmp_path) -> None:
+    path = str(tmp_path / "upload_ack.json")
+    snapshot = MatchSnapshot(path)
+    snapshot.record(DATE, leagues(match("m1")))
+    assert [m.match_id for m in snapshot.diff(DATE, leagues(match("m1"))).added] == ["m1"]
+
+    snapshot.commit()
+    assert MatchSnapshot(path).diff(DATE, leagues(match("m1"))).unchanged == ["m1"]
+
+
+def test_legacy_fingerprint_counts_as_prediction_change(tmp_path) -> None:
+    snapshot = MatchSnapshot(str(tmp_path / "upload_ack.json"))
+    # Oran özeti olmayan eski snapshot kaydı
+    snapshot.dates[DATE] = {"m1": prediction_fingerprint(match("m1"))}
+
+    diff = snapshot.diff(DATE, leagues(match("m1")))
+    assert [m.match_id for m in diff.prediction_changed] == ["m1"]
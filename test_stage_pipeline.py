@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import threading
+import time
+
+import pytest
+
+from stage_pipeline import Stage, StagePipeline
+
+
+def test_results_and_dropped_items() -> None:
+    pipeline = StagePipeline([
+        Stage("double", lambda item: item * 2, workers=3),
+        Stage("odd_only", lambda item: item if item % 4 else None),
+    ])
+    assert sorted(pipeline.run(range(10))) == [2, 6, 10, 14, 18]
+    summary = pipeline.summary()
+    assert summary["stages"]["double"]["items"] == 10
+    assert summary["stages"]["odd_only"]["dropped"] == 5
+
+
+def test_bounded_queues_apply_backpressure() -> None:
+    lock = threading.Lock()
+    counters = {"fed": 0, "done": 0, "in_flight": 0}
+
+    def source():
+        for item in range(20):
+            with lock:
+                counters["fed"] += 1
+            yield item
+
+    def slow_sink(item):
+        time.sleep(0.01)
+        with lock:
+            counters["done"] += 1
+            counters["in_flight"] = max(counters["in_flight"], counters["fed"] - counters["done"])
+        return item
+
+    pipeline = StagePipeline([Stage("fast", lambda item: item, queue_size=1), Stage("slow", slow_sink, queue_size=1)])
+    assert sorted(pipeline.run(source())) == list(range(20))
+
+    # Kaynak yavaş aşamanın önüne geçemez: iki kuyruk + iki thread + beslenmekte olan kalem kadar
+    assert counters["in_flight"] <= 5
+    assert pipeline.stats[0].blocked_seconds > 0
+    assert pipeline.summary()["bottleneck"] == "slow"
+
+
+def test_stage_error_drops_item_and_pipeline_continues() -> None:
+    messages = []
+
+    def parse(item):
+        if item == 3:
+            raise ValueError("bozuk sayfa")
+        return item
+
+    pipeline = StagePipeline([Stage("parse", parse, workers=2), Stage("persist", lambda item: item)], logger=messages.append)
+    assert sorted(pipeline.run(range(6))) == [0, 1, 2, 4, 5]
+
+    parse_stats, persist_stats = pipeline.stats
+    assert (parse_stats.items, parse_stats.errors, parse_stats.dropped) == (6, 1, 0)
+    assert persist_stats.items == 5
+    assert messages == ["⚠️  parse aşamasında hata: bozuk sayfa"]
+
+
+def test_source_error_propagates_after_threads_stop() -> None:
+    def source():
+        yield 1
+        raise RuntimeError("kaynak koptu")
+
+    pipeline = StagePipeline([Stage("fetch", lambda item: item, workers=2)])
+    with pytest.raises(RuntimeError, match="kaynak koptu"):
+        pipeline.run(source())
+    assert not [thread for thread in threading.enumerate() if thread.name.startswith("pipeline-fetch")]
+    assert pipeline.stats[0].items == 1
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import pytest
+
+from records import League, Match
+from upload_outbox import UploadOutbox, idempotency_key
+
+
+DATE = "2025-09-01"
+
+
+def match(match_id: str, prediction: str = "2-1", odds_home: float = 1.8) -> Match:
+    return Match(f"H{match_id}", f"A{match_id}", prediction, "20250901", odds_home=odds_home, match_id=match_id)
+
+
+def leagues(*matches: Match) -> list:
+    return [League("Test League", list(matches), 1)]
+
+
+@pytest.fixture
+def outbox(tmp_path):
+    outbox = UploadOutbox(str(tmp_path / "upload_outbox.sqlite"))
+    yield outbox
+    outbox.close()
+
+
+def pending_keys(outbox: UploadOutbox) -> list:
+    return [item["key"] for batch in outbox.pending_batches(DATE) for item in batch.upserts + batch.deletes]
+
+
+def test_second_enqueue_supersedes_pending_item(outbox) -> None:
+    outbox.enqueue(DATE, leagues(match("m1"), match("m2")), [])
+    outbox.enqueue(DATE, leagues(match("m1", prediction="1-1")), [])
+
+    keys = pending_keys(outbox)
+    assert idempotency_key(match("m1")) not in keys
+    assert idempotency_key(match("m1", prediction="1-1")) in keys
+    assert idempotency_key(match("m2")) in keys
+    stats = outbox.stats()
+    assert (stats["pending"], stats["superseded"]) == (2, 1)
+
+
+def test_same_state_enqueued_once(outbox) -> None:
+    outbox.enqueue(DATE, leagues(match("m1")), [])
+    outbox.enqueue(DATE, leagues(match("m1")), [])
+    assert pending_keys(outbox) == [idempotency_key(match("m1"))]
+
+
+def test_sent_item_is_never_resent(outbox) -> None:
+    outbox.enqueue(DATE, leagues(match("m1"), match("m2")), [{"match_id": "m3", "match_date": "20250901", "deleted": True}])
+    (batch,) = outbox.pending_batches(DATE)
+    assert outbox.complete(batch, {"m2": "DEADLINE_EXCEEDED"}) == 2
+
+    # Yalnızca yüklenemeyen maç bekler; gönderilenler sonraki drain'de yeniden gelmez
+    assert pending_keys(outbox) == [idempotency_key(match("m2"))]
+    (retry,) = outbox.pending_batches(DATE)
+    assert retry.complete_file is None
+    assert outbox.complete(retry, {}) == 1
+    assert outbox.pending_batches(DATE) == []
+
+    # Eski batch nesnesiyle tekrar complete çağrılsa da gönderilmiş kalemler beklemeye dönmez
+    outbox.complete(batch, {"m1": "geç gelen hata"})
+    assert outbox.pending_count() == 0
+    assert outbox.stats()["sent"] == 3
+
+
+def test_superseded_item_is_not_sent(outbox) -> None:
+    outbox.enqueue(DATE, leagues(match("m1")), [])
+    (stale,) = outbox.pending_batches(DATE)
+    outbox.enqueue(DATE, leagues(match("m1", odds_home=2.1)), [])
+
+    outbox.complete(stale, {})
+    assert pending_keys(outbox) == [idempotency_key(match("m1", odds_home=2.1))]
+    assert outbox.stats()["sent"] == 0
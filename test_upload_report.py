@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from upload_report import DateUploadReport, last_result_line, parse_legacy_output, parse_result_text
+
+
+RESULT_LINE = (
+    '{"type": "result", "protocol": 1, "dates": {"2025-09-01": {"uploaded": 57, "skipped": 1, '
+    '"batches": 2, "elapsed_ms": 812, "failed": [{"match_id": "m1", "error": "DEADLINE_EXCEEDED"}]}}}'
+)
+
+
+def test_parse_result_text() -> None:
+    data = parse_result_text(RESULT_LINE + "\n")
+    report = DateUploadReport.from_dict("2025-09-01", data, "fd")
+    assert (report.uploaded, report.skipped, report.batches) == (57, 1, 2)
+    assert report.failed == {"m1": "DEADLINE_EXCEEDED"}
+
+    assert parse_result_text("") is None
+    assert parse_result_text("bozuk {") is None
+    assert parse_result_text('{"type": "progress"}') is None
+
+
+def test_last_result_line() -> None:
+    stdout = "\n".join([
+        '{"type": "result", "dates": {}}',
+        "Başarılı: 3",
+        RESULT_LINE,
+        '{"type": "progress", "done": 10}',
+        "Bitti",
+    ])
+    assert last_result_line(stdout)["dates"]["2025-09-01"]["uploaded"] == 57
+    assert last_result_line("Başarılı: 3\nBitti") is None
+
+
+def test_parse_legacy_output() -> None:
+    report = parse_legacy_output("2025-09-01", "Başlıyor\n✅ Başarılı: 40\n⏭️ Atlanan: 2\n✅ Başarılı: 5\nAtlanan: ?")
+    assert (report.uploaded, report.skipped, report.source) == (45, 2, "legacy")
+    assert report.failed == {}
+
+
+def test_merge_keeps_only_failures_still_failing() -> None:
+    report = DateUploadReport("2025-09-01", uploaded=10, failed={"m1": "hata", "m2": "hata"}, documents=8)
+    retry = DateUploadReport("2025-09-01", uploaded=1, failed={"m2": "yine hata"}, documents=1, source="worker")
+    report.merge(retry, retried={"m1", "m2"})
+
+    assert report.uploaded == 11
+    assert report.failed == {"m2": "yine hata"}
+    assert report.documents == 9
+    assert report.source == "worker"
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import os
+import sys
+import threading
+
+import pytest
+
+import json_codec
+from upload_worker import UploadWorkerClient, UploadWorkerError
+
+
+FAKE_WORKER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_upload_worker.py")
+
+LEAGUES = [{"league_name": "Test League", "matches": [{"match_id": f"m{i}", "home_team": f"H{i}", "away_team": f"A{i}"}
+                                                      for i in range(3)]}]
+
+
+def fake_worker(*args: str) -> UploadWorkerClient:
+    return UploadWorkerClient([sys.executable, FAKE_WORKER, *args], request_timeout=30, start_timeout=30)
+
+
+def test_round_trip() -> None:
+    client = fake_worker("--fail-match", "m1")
+    try:
+        reply = client.upload("2025-09-01", LEAGUES)
+        assert reply["ok"] and reply["uploaded"] == 2
+        assert reply["failed"] == [{"match_id": "m1", "error": "DEADLINE_EXCEEDED (benzetim)"}]
+        assert reply["request_bytes"] > 0
+
+        reply = client.upload("2025-09-01", [{"match_id": "m0", "deleted": True}], delete=True)
+        assert (reply["uploaded"], reply["deleted"]) == (0, 1)
+        assert client.request("ping")["ok"]
+    finally:
+        client.close()
+    assert client.stats()["starts"] == 1
+    assert not client.running
+
+
+def test_upload_file(tmp_path) -> None:
+    upload_file = tmp_path / "predictz_data_2025-09-01.json"
+    json_codec.dump_file(str(upload_file), LEAGUES)
+    client = fake_worker()
+    try:
+        assert client.upload("2025-09-01", upload_file=str(upload_file))["uploaded"] == 3
+    finally:
+        client.close()
+
+
+def test_concurrent_requests_matched_by_id() -> None:
+    client = fake_worker("--batch-delay", "0.05")
+    replies = {}
+
+    def send(date_str: str, count: int) -> None:
+        leagues = [{"league_name": "L", "matches": [{"match_id": f"{date_str}-{i}"} for i in range(count)]}]
+        replies[date_str] = client.upload(date_str, leagues)["uploaded"]
+
+    try:
+        threads = [threading.Thread(target=send, args=(f"2025-09-{day:02d}", day)) for day in range(1, 7)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        client.close()
+    assert replies == {f"2025-09-{day:02d}": day for day in range(1, 7)}
+    assert client.stats()["starts"] == 1
+
+
+def test_restart_after_crash() -> None:
+    client = fake_worker("--crash-after", "2")
+    try:
+        uploaded = [client.upload(f"2025-09-0{day}", LEAGUES)["uploaded"] for day in range(1, 6)]
+    finally:
+        client.close()
+    # Üçüncü istekte worker çöker; istemci yeniden başlatıp isteği bir kez tekrar dener
+    assert uploaded == [3] * 5
+    assert client.stats()["starts"] == 3
+
+
+def test_error_reply() -> None:
+    client = fake_worker("--fail-date", "2025-09-02")
+    try:
+        with pytest.raises(UploadWorkerError):
+            client.upload("2025-09-02", LEAGUES)
+        assert client.upload("2025-09-03", LEAGUES)["uploaded"] == 3
+    finally:
+        client.close()
+
+
+def test_worker_exiting_before_ready() -> None:
+    client = UploadWorkerClient([sys.executable, "-c", "import sys; sys.exit(3)"], start_timeout=30)
+    with pytest.raises(UploadWorkerError, match="çıkış kodu 3"):
+        client.upload("2025-09-01", LEAGUES)
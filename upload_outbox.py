@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import datetime
+import hashlib
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Any, Iterable, List, Optional
+
+import json_codec
+from match_diff import snapshot_fingerprint
+from records import League, Match
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox_batches (
+    batch_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    date TEXT NOT NULL,
+    source_file TEXT,
+    documents INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT
+);
+CREATE TABLE IF NOT EXISTS outbox_items (
+    idempotency_key TEXT PRIMARY KEY,
+    batch_id INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    match_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    league_name TEXT,
+    league_id INTEGER,
+    payload BLOB NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_items_pending ON outbox_items (status, date, batch_id);
+CREATE INDEX IF NOT EXISTS idx_outbox_items_match ON outbox_items (match_id, status);
+"""
+
+# outbox_items.status
+PENDING = "pending"
+SENT = "sent"
+SUPERSEDED = "superseded"  # aynı maçın daha yeni bir hali kuyruğa girdi, bu hali gönderilmeyecek
+
+UPSERT = "upsert"
+DELETE = "delete"
+
+
+def idempotency_key(match: Match) -> str:
+    """
+    Maçın bu halinin anahtarı: match_id + tahmin ve oran özeti. Aynı hal kuyruğa iki kez girmez;
+    upload tarafı aynı anahtarı ikinci kez görürse yazmayı atlayabilir.
+    """
+    match_id = match.match_id
+    if not match_id:
+        # match_id'siz eski kayıtlar: maçın tüm alanlarından türetilir
+        match_id = hashlib.sha1(json_codec.dumps(match.to_dict(), pretty=False, sort_keys=True)).hexdigest()[:16]
+    return f"{match_id}:{snapshot_fingerprint(match)}"
+
+
+@dataclass
+class OutboxBatch:
+    """Kuyruktaki bir tarih batch'inin henüz gönderilmemiş kalemleri"""
+    batch_id: int
+    date: str
+    source_file: Optional[str]
+    documents: int
+    attempts: int
+    upserts: List[Dict[str, Any]] = field(default_factory=list)  # satır: match_id, key, league_name, league_id, match
+    deletes: List[Dict[str, Any]] = field(default_factory=list)  # satır: match_id, key, marker
+
+    @property
+    def complete_file(self) -> Optional[str]:
+        """Batch'in hiçbir kalemi gönderilmemişse ve tarih dosyası duruyorsa o dosya (olduğu gibi gönderilebilir)"""
+        if self.source_file and not self.deletes and len(self.upserts) == self.documents and os.path.exists(self.source_file):
+            return self.source_file
+        return None
+
+    def upsert_payload(self, only: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """Bekleyen maçlar lig listesi olarak (tarih dosyasıyla aynı biçim, maçlarda idempotency_key)"""
+        only = set(only) if only is not None else None
+        leagues: Dict[str, Dict[str, Any]] = {}
+        for item in self.upserts:
+            if only is not None and item["match_id"] not in only:
+                continue
+            league = leagues.get(item["league_name"])
+            if league is None:
+                league = leagues[item["league_name"]] = {
+                    "league_name": item["league_name"],
+                    "league_id": item["league_id"],
+                    "matches": [],
+                }
+            league["matches"].append({**item["match"], "idempotency_key": item["key"]})
+        return list(leagues.values())
+
+    def delete_payload(self, only: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """Bekleyen silme işaretleri"""
+        only = set(only) if only is not None else None
+        return [
+            {**item["marker"], "idempotency_key": item["key"]}
+            for item in self.deletes
+            if only is None or item["match_id"] in only
+        ]
+
+
+class UploadOutbox:
+    """
+    Gönderilmeyi bekleyen upload batch'lerinin kalıcı kuyruğu (SQLite, WAL).
+
+    Scrape edilen veri önce tek transaction'da kuyruğa yazılır, sonra kuyruk boşaltılır.
+    Bir kalem ancak upload tarafı onayladıktan sonra "sent" olur (en az bir kez teslim);
+    onay kaybolup kalem tekrar gönderilirse doküman ID'si match_id ve anahtar aynı
+    olduğundan sonuç değişmez (etkisi bir kez). Upload yarıda kalırsa sonraki çalışma
+    yeniden scrape etmeden yalnızca bekleyen kalemleri gönderir.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            folder = os.path.dirname(self.path)
+            if folder and not os.path.exists(folder):
+                os.makedirs(folder)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        """Bağlantıyı kapat (sonraki çağrıda yeniden açılır)"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def enqueue(self, date_str: str, leagues_data: List[League], delete_markers: List[Dict[str, Any]],
+                source_file: Optional[str] = None) -> Optional[int]:
+        """
+        Tarihin upload'ını tek transaction'da kuyruğa ekle.
+
+        Aynı maçın bekleyen eski hali varsa "superseded" olur. Aynı hal zaten bekliyorsa
+        tekrar eklenmez; daha önce gönderilmişse (ör. tam upload modunda) yeniden bekler.
+
+        Args:
+            date_str (str): YYYY-MM-DD tarih
+            leagues_data (List[League]): Gönderilecek (yeni/değişen veya tüm) maçlar
+            delete_markers (List[Dict[str, Any]]): {"match_id", "match_date", "deleted": True} işaretleri
+            source_file (Optional[str]): ``leagues_data`` tarihin tamamıysa scraper'ın yazdığı tarih dosyası
+
+        Returns:
+            Optional[int]: Batch ID'si (gönderilecek bir şey yoksa None)
+        """
+        now = datetime.datetime.now().isoformat()
+        rows = []
+        for league in leagues_data:
+            for match in league.matches:
+                key = idempotency_key(match)
+                rows.append((key, key.split(":")[0], UPSERT, league.league_name, league.league_id,
+                             json_codec.dumps(match.to_dict(), pretty=False)))
+        for marker in delete_markers:
+            rows.append((f"{marker['match_id']}:deleted", marker["match_id"], DELETE, None, None,
+                         json_codec.dumps(marker, pretty=False)))
+        if not rows:
+            return None
+
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                batch_id = conn.execute(
+                    "INSERT INTO outbox_batches (date, source_file, documents, created_at) VALUES (?, ?, ?, ?)",
+                    (date_str, source_file, len(rows), now),
+                ).lastrowid
+                conn.executemany(
+                    "UPDATE outbox_items SET status = ?, updated_at = ? "
+                    "WHERE match_id = ? AND status = ? AND idempotency_key != ?",
+                    [(SUPERSEDED, now, match_id, PENDING, key) for key, match_id, *_ in rows],
+                )
+                conn.executemany(
+                    "INSERT INTO outbox_items "
+                    "(idempotency_key, batch_id, date, match_id, kind, league_name, league_id, payload, status, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (idempotency_key) DO UPDATE SET "
+                    "batch_id = excluded.batch_id, payload = excluded.payload, status = excluded.status, "
+                    "attempts = 0, last_error = NULL, updated_at = excluded.updated_at "
+                    "WHERE outbox_items.status != 'pending'",
+                    [(key, batch_id, date_str, match_id, kind, league_name, league_id, payload, PENDING, now)
+                     for key, match_id, kind, league_name, league_id, payload in rows],
+                )
+        return batch_id
+
+    def pending_dates(self) -> List[str]:
+        """Bekleyen kalemi olan tarihler"""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT DISTINCT date FROM outbox_items WHERE status = ? ORDER BY date", (PENDING,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def pending_batches(self, date_str: str) -> List[OutboxBatch]:
+        """Tarihin bekleyen batch'leri, kuyruğa giriş sırasıyla (eski hal yeni halden önce gider)"""
+        with self._lock:
+            conn = self._connect()
+            items = conn.execute(
+                "SELECT i.idempotency_key, i.batch_id, i.match_id, i.kind, i.league_name, i.league_id, i.payload, "
+                "b.source_file, b.documents, b.attempts "
+                "FROM outbox_items i JOIN outbox_batches b ON b.batch_id = i.batch_id "
+                "WHERE i.status = ? AND i.date = ? ORDER BY i.batch_id, i.rowid",
+                (PENDING, date_str),
+            ).fetchall()
+
+        batches: Dict[int, OutboxBatch] = {}
+        for item in items:
+            batch = batches.get(item["batch_id"])
+            if batch is None:
+                batch = batches[item["batch_id"]] = OutboxBatch(
+                    item["batch_id"], date_str, item["source_file"], item["documents"], item["attempts"]
+                )
+            payload = json_codec.loads(item["payload"])
+            if item["kind"] == UPSERT:
+                batch.upserts.append({
+                    "match_id": item["match_id"],
+                    "key": item["idempotency_key"],
+                    "league_name": item["league_name"],
+                    "league_id": item["league_id"],
+                    "match": payload,
+                })
+            else:
+                batch.deletes.append({"match_id": item["match_id"], "key": item["idempotency_key"], "marker": payload})
+        return list(batches.values())
+
+    def complete(self, batch: OutboxBatch, failed: Dict[str, str]) -> int:
+        """
+        Upload onaylanan kalemleri "sent" yap; ``failed`` (match_id → hata) içindekiler
+        hata bilgisiyle beklemeye devam eder
+
+        Returns:
+            int: Gönderildi olarak işaretlenen kalem sayısı
+        """
+        now = datetime.datetime.now().isoformat()
+        keys = [item["key"] for item in batch.upserts + batch.deletes]
+        failed_keys = {item["key"] for item in batch.upserts + batch.deletes if item["match_id"] in failed}
+        error = "; ".join(f"{match_id}: {message}" for match_id, message in list(failed.items())[:5]) or None
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    "UPDATE outbox_items SET status = ?, updated_at = ? WHERE idempotency_key = ? AND status = ?",
+                    [(SENT, now, key, PENDING) for key in keys if key not in failed_keys],
+                )
+                conn.executemany(
+                    "UPDATE outbox_items SET attempts = attempts + 1, last_error = ?, updated_at = ? "
+                    "WHERE idempotency_key = ?",
+                    [(error, now, key) for key in failed_keys],
+                )
+                conn.execute(
+                    "UPDATE outbox_batches SET attempts = attempts + 1, last_error = ? WHERE batch_id = ?",
+                    (error, batch.batch_id),
+                )
+        return len(keys) - len(failed_keys)
+
+    def fail(self, batch: OutboxBatch, error: str) -> None:
+        """Batch hiç gönderilemedi: kalemler beklemeye devam eder, hata kaydedilir"""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "UPDATE outbox_batches SET attempts = attempts + 1, last_error = ? WHERE batch_id = ?",
+                    (error[:500], batch.batch_id),
+                )
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return self._connect().execute(
+                "SELECT COUNT(*) FROM outbox_items WHERE status = ?", (PENDING,)
+            ).fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        """Durum başına kalem sayıları, bekleyen batch sayısı ve en eski bekleyen kalem"""
+        with self._lock:
+            conn = self._connect()
+            counts = dict(conn.execute("SELECT status, COUNT(*) FROM outbox_items GROUP BY status").fetchall())
+            pending_batches, oldest = conn.execute(
+                "SELECT COUNT(DISTINCT batch_id), MIN(updated_at) FROM outbox_items WHERE status = ?", (PENDING,)
+            ).fetchone()
+        return {
+            "pending": counts.get(PENDING, 0),
+            "sent": counts.get(SENT, 0),
+            "superseded": counts.get(SUPERSEDED, 0),
+            "pending_batches": pending_batches,
+            "oldest_pending": oldest,
+        }
+
+    def prune(self, keep_days: int = 30) -> int:
+        """keep_days'den eski gönderilmiş/geçersiz kalemleri ve boşalan batch'leri sil"""
+        cutoff = (datetime.datetime.now() - datetime.timedelta(days=keep_days)).isoformat()
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                removed = conn.execute(
+                    "DELETE FROM outbox_items WHERE status != ? AND updated_at < ?", (PENDING, cutoff)
+                ).rowcount
+                conn.execute(
+                    "DELETE FROM outbox_batches WHERE created_at < ? "
+                    "AND batch_id NOT IN (SELECT DISTINCT batch_id FROM outbox_items)",
+                    (cutoff,),
+                )
+        return removed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Upload kuyruğu (outbox) durumu")
+    parser.add_argument("--db", default="data/upload_outbox.sqlite", help="Kuyruk dosyası")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("status", help="Durum başına kalem sayıları")
+    commands.add_parser("pending", help="Bekleyen batch'ler")
+    args = parser.parse_args()
+
+    outbox = UploadOutbox(args.db)
+    if args.command == "status":
+        for key, value in outbox.stats().items():
+            print(f"{key:<16} {value}")
+    else:
+        for date_str in outbox.pending_dates():
+            for batch in outbox.pending_batches(date_str):
+                print(f"{date_str}  batch {batch.batch_id}: {len(batch.upserts)} maç, {len(batch.deletes)} silme "
+                      f"({batch.attempts} deneme)")
+    outbox.close()
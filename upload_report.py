@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+from dataclasses import dataclass, field
+from typing import Dict, Any, Iterable, Optional
+
+import json_codec
+
+
+# Upload script'i sonucu bu ortam değişkenindeki dosya tanımlayıcısına tek bir JSON
+# nesnesi olarak yazar (fs.writeSync(Number(process.env.PREDICTZ_RESULT_FD), ...)).
+# Tanımlayıcı yoksa stdout'un son satırı olarak {"type": "result", ...} yazması yeterlidir.
+RESULT_FD_ENV = "PREDICTZ_RESULT_FD"
+RESULT_TYPE = "result"
+RESULT_PROTOCOL = 1
+
+
+@dataclass
+class DateUploadReport:
+    """
+    Bir tarihin upload sonucu. Sonuç nesnesi şu biçimdedir (tarih bazında veya düz):
+
+        {"type": "result", "protocol": 1,
+         "dates": {"2025-09-01": {"uploaded": 57, "skipped": 0, "deleted": 0, "batches": 2,
+                                  "elapsed_ms": 812,
+                                  "failed": [{"match_id": "9f2c...", "error": "DEADLINE_EXCEEDED"}]}}}
+    """
+    date: str
+    uploaded: int = 0
+    skipped: int = 0
+    deleted: int = 0
+    failed: Dict[str, str] = field(default_factory=dict)  # match_id → hata mesajı
+    batches: int = 0
+    elapsed_ms: float = 0.0  # script/worker'ın kendi ölçtüğü süre
+    wall_ms: float = 0.0  # süreç açılışı / istek dahil bu taraftan ölçülen süre
+    bytes_written: int = 0
+    documents: int = 0  # yazıldığı onaylanan maç + silme işareti sayısı (başarısızlar hariç)
+    source: str = "fd"  # "fd", "stdout", "worker" veya "legacy" (eski metin çıktısı)
+
+    @classmethod
+    def from_dict(cls, date_str: str, data: Dict[str, Any], source: str) -> "DateUploadReport":
+        """Sonuç nesnesinden (tarih bazında veya düz) tarihin raporunu oluştur"""
+        dates = data.get("dates")
+        if isinstance(dates, dict):
+            data = dates.get(date_str) or {}
+
+        failed: Dict[str, str] = {}
+        for item in data.get("failed") or []:
+            if isinstance(item, dict):
+                if item.get("match_id"):
+                    failed[str(item["match_id"])] = str(item.get("error") or "bilinmeyen hata")
+            else:
+                failed[str(item)] = "bilinmeyen hata"
+
+        return cls(
+            date=date_str,
+            uploaded=int(data.get("uploaded", 0)),
+            skipped=int(data.get("skipped", 0)),
+            deleted=int(data.get("deleted", 0)),
+            failed=failed,
+            batches=int(data.get("batches", 0)),
+            elapsed_ms=float(data.get("elapsed_ms", 0.0)),
+            source=source,
+        )
+
+    def merge(self, other: "DateUploadReport", retried: Iterable[str] = ()) -> None:
+        """
+        Aynı tarihin başka bir gönderiminin (silme batch'i, başarısız maçların tekrar denemesi)
+        sonucunu bu rapora ekle. ``retried`` verilirse bu maçlardan yalnızca yine başarısız
+        olanlar ``failed`` içinde kalır.
+        """
+        retried = set(retried)
+        self.uploaded += other.uploaded
+        self.skipped += other.skipped
+        self.deleted += other.deleted
+        self.failed = {match_id: error for match_id, error in self.failed.items() if match_id not in retried}
+        self.failed.update(other.failed)
+        self.batches += other.batches
+        self.elapsed_ms += other.elapsed_ms
+        self.wall_ms += other.wall_ms
+        self.bytes_written += other.bytes_written
+        self.documents += other.documents
+        self.source = other.source
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "uploaded": self.uploaded,
+            "skipped": self.skipped,
+            "deleted": self.deleted,
+            "failed": self.failed,
+            "batches": self.batches,
+            "elapsed_ms": round(self.elapsed_ms, 1),
+            "wall_ms": round(self.wall_ms, 1),
+            "bytes_written": self.bytes_written,
+            "documents": self.documents,
+            "source": self.source,
+        }
+
+
+def parse_result_text(text: str) -> Optional[Dict[str, Any]]:
+    """Sonuç kanalından okunan metni çöz (boşsa veya sonuç nesnesi değilse None)"""
+    text = text.strip()
+    if not text:
+        return None
+    try:
+        data = json_codec.loads(text)
+    except ValueError:
+        return None
+    if isinstance(data, dict) and data.get("type") == RESULT_TYPE:
+        return data
+    return None
+
+
+def last_result_line(stdout: str) -> Optional[Dict[str, Any]]:
+    """stdout'taki son {"type": "result"} satırını bul"""
+    for line in reversed(stdout.splitlines()):
+        if line.lstrip().startswith("{"):
+            data = parse_result_text(line)
+            if data is not None:
+                return data
+    return None
+
+
+def parse_legacy_output(date_str: str, stdout: str) -> DateUploadReport:
+    """
+    Sonuç kanalını desteklemeyen eski script'ler için: "Başarılı: N" / "Atlanan: N"
+    satırlarından sayıları çıkar. Maç bazında hata bilgisi yoktur.
+    """
+    report = DateUploadReport(date_str, source="legacy")
+    for line in stdout.splitlines():
+        for label, attribute in (("Başarılı:", "uploaded"), ("Atlanan:", "skipped")):
+            if label in line:
+                try:
+                    setattr(report, attribute, getattr(report, attribute) + int(line.split(label)[-1].strip()))
+                except ValueError:
+                    pass
+    return report
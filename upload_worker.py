@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import argparse
+import itertools
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, Any, List, Optional
+
+import json_codec
+
+
+PROTOCOL_VERSION = 1
+
+
+class UploadWorkerError(Exception):
+    """Worker isteği başarısız oldu (worker hata döndürdü, zaman aşımı veya süreç çöktü)"""
+
+
+class _Connection:
+    """Tek bir worker sürecine bağlantı: yanıt bekleyen istekler id → kuyruk olarak tutulur"""
+
+    def __init__(self, process: subprocess.Popen):
+        self.process = process
+        self.lock = threading.Lock()
+        self.waiters: Dict[int, "queue.Queue[Optional[Dict[str, Any]]]"] = {}
+        self.ready: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        self.closed = False
+
+    def register(self, request_id: int) -> "queue.Queue[Optional[Dict[str, Any]]]":
+        with self.lock:
+            if self.closed:
+                raise ConnectionError("Upload worker bağlantısı kapalı")
+            waiter = self.waiters[request_id] = queue.Queue(maxsize=1)
+            return waiter
+
+    def unregister(self, request_id: int) -> None:
+        with self.lock:
+            self.waiters.pop(request_id, None)
+
+    def dispatch(self, frame: Dict[str, Any]) -> bool:
+        """Yanıtı bekleyen isteğe ilet (bekleyen yoksa False)"""
+        with self.lock:
+            waiter = self.waiters.pop(frame.get("id"), None)
+        if waiter is None:
+            return False
+        waiter.put(frame)
+        return True
+
+    def close(self) -> None:
+        """Süreç kapandı: bekleyen tüm isteklere bağlantının koptuğunu bildir"""
+        with self.lock:
+            self.closed = True
+            waiters, self.waiters = self.waiters, {}
+        for waiter in waiters.values():
+            waiter.put(None)
+        self.ready.put(None)
+
+
+class UploadWorkerClient:
+    """
+    Uzun ömürlü upload worker sürecinin istemcisi.
+
+    Her tarih için yeni bir ``node`` süreci açmak yerine tek bir worker başlatılır ve
+    batch'ler ona stdin/stdout üzerinden JSON-lines protokolüyle gönderilir:
+
+    - Worker başlayınca ``{"type": "ready", "protocol": 1}`` satırını yazar.
+    - İstek: ``{"id": 7, "op": "upload" | "delete" | "ping" | "shutdown", "date": ..., "data": [...]}``
+      (``data`` yerine worker'ın kendisinin okuyacağı ``file`` yolu da verilebilir).
+    - Yanıt: ``{"id": 7, "ok": true, "uploaded": 58, "skipped": 0, "failed": [...], "batches": 1, "elapsed_ms": 640}``
+      (alanlar upload_report.DateUploadReport ile aynı) veya ``{"id": 7, "ok": false, "error": "..."}``.
+    - JSON olmayan ya da ``id``/``type`` taşımayan satırlar worker logu sayılır.
+
+    İstemci thread-safe'tir: birden fazla thread aynı anda istek gönderebilir, yanıtlar
+    ``id`` ile eşlenir (worker istekleri paralel işleyip sırasız yanıtlayabilir).
+    Worker ilk istekte başlatılır; çökerse veya bağlantı koparsa bir sonraki istekte
+    yeniden başlatılır ve istek bir kez tekrar denenir.
+    """
+
+    def __init__(self, command: List[str], cwd: Optional[str] = None, request_timeout: float = 300,
+                 start_timeout: float = 60, max_restarts: int = 3, logger=None):
+        """
+        Args:
+            command (List[str]): Worker komutu (ör. ["node", "scripts/upload-predictz-worker.js"])
+            cwd (Optional[str]): Çalışma dizini
+            request_timeout (float): Tek bir isteğin yanıtı için en uzun bekleme (saniye)
+            start_timeout (float): Worker'ın "ready" satırı için en uzun bekleme (saniye)
+            max_restarts (int): Bu istemcinin ömrü boyunca izin verilen yeniden başlatma sayısı
+        """
+        self.command = command
+        self.cwd = cwd
+        self.request_timeout = request_timeout
+        self.start_timeout = start_timeout
+        self.max_restarts = max_restarts
+        self.logger = logger
+        self._connection: Optional[_Connection] = None
+        self._ids = itertools.count(1)
+        # Süreç başlatma/kapatma ve istatistikler için; stdin yazımları ayrı kilitle sıralanır
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self.starts = 0
+        self.requests = 0
+        self.bytes_sent = 0
+        self.startup_seconds = 0.0
+
+    def _log(self, message: str) -> None:
+        if self.logger:
+            self.logger.info(message)
+
+    @property
+    def running(self) -> bool:
+        connection = self._connection
+        return connection is not None and not connection.closed and connection.process.poll() is None
+
+    def _read_frames(self, connection: _Connection) -> None:
+        """Worker stdout'unu okuyup yanıtları bekleyen isteklere dağıt (ayrı thread)"""
+        for line in connection.process.stdout:
+            text = line.strip()
+            if not text:
+                continue
+            frame = None
+            if text.startswith(b"{"):
+                try:
+                    frame = json_codec.loads(text)
+                except ValueError:
+                    frame = None
+            if isinstance(frame, dict) and frame.get("type") == "ready":
+                connection.ready.put(frame)
+            elif isinstance(frame, dict) and "id" in frame:
+                if not connection.dispatch(frame):
+                    self._log(f"upload worker: bekleyen isteği olmayan yanıt: {frame}")
+            else:
+                self._log(f"upload worker: {text.decode('utf-8', 'replace')}")
+        # EOF: süreç kapandı
+        connection.close()
+
+    def _drain_stderr(self, process: subprocess.Popen) -> None:
+        for line in process.stderr:
+            if line.strip():
+                self._log(f"upload worker stderr: {line.decode('utf-8', 'replace').rstrip()}")
+
+    def _start(self) -> _Connection:
+        if self.starts > self.max_restarts:
+            raise UploadWorkerError(f"Upload worker {self.max_restarts} kez yeniden başlatıldı, vazgeçiliyor")
+
+        started = time.perf_counter()
+        process = subprocess.Popen(
+            self.command,
+            cwd=self.cwd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+        connection = _Connection(process)
+        self.starts += 1
+        threading.Thread(target=self._read_frames, args=(connection,), daemon=True).start()
+        threading.Thread(target=self._drain_stderr, args=(process,), daemon=True).start()
+
+        try:
+            frame = connection.ready.get(timeout=self.start_timeout)
+        except queue.Empty:
+            self._kill(connection)
+            raise UploadWorkerError(f"Upload worker {self.start_timeout} saniye içinde hazır olmadı")
+        if frame is None:
+            code = process.wait()
+            raise UploadWorkerError(f"Upload worker açılırken kapandı (çıkış kodu {code})")
+        if frame.get("protocol") != PROTOCOL_VERSION:
+            self._kill(connection)
+            raise UploadWorkerError(f"Desteklenmeyen worker protokolü: {frame.get('protocol')}")
+
+        self.startup_seconds += time.perf_counter() - started
+        self._log(f"Upload worker başlatıldı (pid {process.pid}, {time.perf_counter() - started:.2f} sn)")
+        return connection
+
+    def _current(self) -> _Connection:
+        """Çalışan bağlantıyı döndür; yoksa (ilk istek veya çökme sonrası) worker'ı başlat"""
+        with self._lock:
+            if not self.running:
+                self._connection = self._start()
+            return self._connection
+
+    @staticmethod
+    def _kill(connection: _Connection) -> None:
+        if connection.process.poll() is None:
+            connection.process.kill()
+        connection.process.wait()
+
+    def _send(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        connection = self._current()
+        waiter = connection.register(message["id"])
+        payload = json_codec.dumps(message, pretty=False) + b"\n"
+        try:
+            with self._write_lock:
+                connection.process.stdin.write(payload)
+                connection.process.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            connection.unregister(message["id"])
+            self._kill(connection)
+            raise ConnectionError(f"Upload worker'a yazılamadı: {e}") from e
+        with self._lock:
+            self.bytes_sent += len(payload)
+        message_bytes = len(payload)
+
+        try:
+            frame = waiter.get(timeout=self.request_timeout)
+        except queue.Empty:
+            # Yanıt gelmedi: worker takılmış sayılır; diğer bekleyen istekler yeni süreçte tekrar denenir
+            connection.unregister(message["id"])
+            self._kill(connection)
+            raise UploadWorkerError(f"Upload worker {self.request_timeout} saniye içinde yanıt vermedi")
+        if frame is None:
+            code = connection.process.wait()
+            raise ConnectionError(f"Upload worker kapandı (çıkış kodu {code})")
+        frame["request_bytes"] = message_bytes
+        return frame
+
+    def request(self, op: str, **fields: Any) -> Dict[str, Any]:
+        """
+        İsteği gönder ve yanıtını döndür (yanıta isteğin byte boyutu ``request_bytes`` olarak
+        eklenir). Worker çökmüşse yeniden başlatılıp bir kez tekrar denenir.
+
+        Raises:
+            UploadWorkerError: Worker hata döndürdü, zaman aşımı veya yeniden başlatma bütçesi bitti
+        """
+        message = {"id": next(self._ids), "op": op, **fields}
+        with self._lock:
+            self.requests += 1
+        try:
+            reply = self._send(message)
+        except ConnectionError as e:
+            self._log(f"Upload worker bağlantısı koptu ({e}), yeniden başlatılıyor")
+            try:
+                reply = self._send(message)
+            except ConnectionError as retry_error:
+                raise UploadWorkerError(str(retry_error)) from retry_error
+        if not reply.get("ok"):
+            raise UploadWorkerError(reply.get("error") or f"Upload worker isteği başarısız: {reply}")
+        return reply
+
+    def upload(self, date_str: str, data: Any = None, upload_file: Optional[str] = None,
+               delete: bool = False) -> Dict[str, Any]:
+        """
+        Tarihin batch'ini gönder: ``data`` (lig listesi / silme işaretleri) satır içinde,
+        ya da worker'ın kendisinin okuyacağı ``upload_file`` olarak
+        """
+        fields: Dict[str, Any] = {"date": date_str}
+        if upload_file is not None:
+            fields["file"] = os.path.abspath(upload_file)
+        else:
+            fields["data"] = data
+        return self.request("delete" if delete else "upload", **fields)
+
+    def close(self) -> None:
+        """Worker'a kapanma isteği gönder; yanıt vermezse sonlandır"""
+        with self._lock:
+            connection, self._connection = self._connection, None
+        if connection is None or connection.process.poll() is not None:
+            return
+        process = connection.process
+        try:
+            with self._write_lock:
+                process.stdin.write(json_codec.dumps({"id": 0, "op": "shutdown"}, pretty=False) + b"\n")
+                process.stdin.flush()
+                process.stdin.close()
+            process.wait(timeout=10)
+        except (OSError, subprocess.TimeoutExpired):
+            process.kill()
+            process.wait()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "starts": self.starts,
+            "requests": self.requests,
+            "bytes_sent": self.bytes_sent,
+            "startup_seconds": round(self.startup_seconds, 3),
+        }
+
+
+def _bench(batches: int, startup_delay: float) -> None:
+    """Sahte worker ile: her batch için yeni süreç ↔ tek kalıcı worker"""
+    command = [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "fake_upload_worker.py"),
+               "--startup-delay", str(startup_delay)]
+    batch = [{"league_name": "Test League", "matches": [{"home_team": f"H{i}", "away_team": f"A{i}"} for i in range(60)]}]
+
+    started = time.perf_counter()
+    for index in range(batches):
+        client = UploadWorkerClient(command)
+        client.upload(f"2025-09-{index % 28 + 1:02d}", batch)
+        client.close()
+    per_process = time.perf_counter() - started
+
+    started = time.perf_counter()
+    client = UploadWorkerClient(command)
+    for index in range(batches):
+        client.upload(f"2025-09-{index % 28 + 1:02d}", batch)
+    client.close()
+    persistent = time.perf_counter() - started
+
+    print(f"{batches} batch, worker açılışı {startup_delay:.2f} sn:")
+    print(f"   • Batch başına yeni süreç: {per_process:6.2f} sn")
+    print(f"   • Kalıcı worker:           {persistent:6.2f} sn ({per_process / persistent:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Kalıcı upload worker protokol/verim testi (sahte worker ile, çevrimdışı)")
+    parser.add_argument("--batches", type=int, default=40, help="Gönderilecek batch sayısı")
+    parser.add_argument("--startup-delay", type=float, default=0.3,
+                        help="Sahte worker'ın açılış gecikmesi (node + Firebase client başlatma benzetimi)")
+    args = parser.parse_args()
+    _bench(max(1, args.batches), args.startup_delay)